@@ -4,10 +4,15 @@ from _asts.visitor_interface import VisitorInterface
 class Assignment(VisitorInterface):
     """Assignment node in the AST."""
 
+    __slots__ = ("name", "operator", "value", "depth", "slot")
+
     def __init__(self, name, operator, value):
-        self.name = name
-        self.operator = operator
-        self.value = value
+        self.name = name  # str
+        self.operator = operator  # Token
+        self.value = value  # expression
+        # set by the Resolver. depth is None for globals.
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing assignment expressions."""
@@ -4,9 +4,13 @@ from _asts.visitor_interface import VisitorInterface
 class Call(VisitorInterface):
     """Call node in the AST."""
 
+    __slots__ = ("callee", "arguments", "cached_callee")
+
     def __init__(self, callee, arguments):
         self.callee = callee
-        self.arguments = arguments
+        self.arguments = arguments  # list of expressions
+        # set by the Interpreter: the last object this call checked it could call.
+        self.cached_callee = None
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing call expressions."""
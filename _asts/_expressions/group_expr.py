@@ -4,6 +4,8 @@ from _asts.visitor_interface import VisitorInterface
 class Group(VisitorInterface):
     """Group node in the AST."""
 
+    __slots__ = ("expression",)
+
     def __init__(self, expression):
         self.expression = expression
 
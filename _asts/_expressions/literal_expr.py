@@ -4,8 +4,10 @@ from _asts.visitor_interface import VisitorInterface
 class Literal(VisitorInterface):
     """Literal node in the AST."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        self.value = value
+        self.value = value  # float, int, Bits, str, Rope, bool or None
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing literal expressions."""
@@ -4,10 +4,13 @@ from _asts.visitor_interface import VisitorInterface
 class Logical(VisitorInterface):
     """Logical node in the AST."""
 
+    __slots__ = ("left", "operator", "right", "handler")
+
     def __init__(self, left, operator, right):
         self.left = left
-        self.operator = operator
+        self.operator = operator  # Token
         self.right = right
+        self.handler = None  # operator implementation. set on first evaluation.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing logical expressions."""
@@ -4,6 +4,8 @@ from _asts.visitor_interface import VisitorInterface
 class Ternary(VisitorInterface):
     """Ternary node in the AST."""
 
+    __slots__ = ("first", "second", "third")
+
     def __init__(self, first, second, third):
         self.first = first
         self.second = second
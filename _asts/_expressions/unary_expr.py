@@ -4,9 +4,12 @@ from _asts.visitor_interface import VisitorInterface
 class Unary(VisitorInterface):
     """Unary node in the AST."""
 
+    __slots__ = ("operator", "right", "handler")
+
     def __init__(self, operator, right):
-        self.operator = operator
+        self.operator = operator  # Token
         self.right = right
+        self.handler = None  # operator implementation. set on first evaluation.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing unary expressions."""
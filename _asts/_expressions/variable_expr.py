@@ -4,8 +4,13 @@ from _asts.visitor_interface import VisitorInterface
 class Variable(VisitorInterface):
     """Variable node in the AST."""
 
+    __slots__ = ("name", "depth", "slot")
+
     def __init__(self, name):
-        self.name = name
+        self.name = name  # str
+        # set by the Resolver. depth is None for globals.
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing variable expressions."""
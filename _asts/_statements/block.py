@@ -4,8 +4,14 @@ from _asts.visitor_interface import VisitorInterface
 class Block(VisitorInterface):
     """BlockStatement node in the AST."""
 
+    __slots__ = ("statements", "num_slots", "captured_slots", "line_no")
+
     def __init__(self, statements):
-        self.statements = statements
+        self.statements = statements  # list of statements
+        # set by the Resolver.
+        self.num_slots = 0
+        self.captured_slots = {}  # slot -> name
+        self.line_no = None  # set by the Parser: the line the statement starts on.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing blocks."""
@@ -4,8 +4,11 @@ from _asts.visitor_interface import VisitorInterface
 class BreakStatement(VisitorInterface):
     """BreakStatement node in the AST."""
 
+    __slots__ = ("keyword", "line_no")
+
     def __init__(self, keyword):
-        self.keyword = keyword
+        self.keyword = keyword  # Token
+        self.line_no = None  # set by the Parser: the line the statement starts on.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing break statements."""
@@ -0,0 +1,32 @@
+from _asts.visitor_interface import VisitorInterface
+
+
+class ForStatement(VisitorInterface):
+    """ForStatement node in the AST."""
+
+    __slots__ = ("initializer", "condition", "update", "body", "line_no")
+
+    def __init__(self, initializer, condition, update, body):
+        # an omitted initializer or update is None, an omitted condition the Literal true.
+        self.initializer = initializer  # statement, or None
+        self.condition = condition
+        self.update = update  # expression, or None
+        self.body = body
+        self.line_no = None  # set by the Parser: the line the statement starts on.
+
+    def accept(self, visitor):
+        """Visitor implementation for nodes representing for statements."""
+        return visitor.visit_for_stmt(self)
+
+    def __str__(self):
+        for_stmt_ast = "".join(
+            [
+                "(for_stmt ",
+                str(self.initializer),
+                str(self.condition),
+                str(self.update),
+                str(self.body),
+                ")",
+            ]
+        )
+        return for_stmt_ast
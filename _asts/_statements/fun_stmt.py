@@ -4,16 +4,41 @@ from _asts.visitor_interface import VisitorInterface
 class FunctionStatement(VisitorInterface):
     """FunctionStatement node in the AST."""
 
-    def __init__(self, declaration):
-        # contains function name, params (if any), and body
-        self.declaration = declaration
+    __slots__ = (
+        "name",
+        "params",
+        "body",
+        "line_no",
+        "slot",
+        "param_slots",
+        "num_slots",
+        "captured_slots",
+        "is_pure",
+        "makes_tail_calls",
+        "free_names",
+    )
+
+    def __init__(self, name, params, body, line_no):
+        self.name = name  # str
+        self.params = params  # list of Variable expressions
+        self.body = body  # list of statements
+        self.line_no = line_no
+        # set by the Resolver. slot is None for globals.
+        self.slot = None
+        self.param_slots = []
+        self.num_slots = 0
+        self.captured_slots = {}  # slot -> name
+        # set by the PurityAnalyzer.
+        self.is_pure = False
+        self.makes_tail_calls = False
+        self.free_names = set()  # variables and functions it reads from outside it.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing function statements."""
         return visitor.visit_function_stmt(self)
 
-    # def __str__(self):
-    #     function_stmt_ast = "".join(
-    #         ["(", str(self.identifier), " ", str(self.initializer), ")"]
-    #     )
-    #     return function_stmt_ast
+    def __str__(self):
+        function_stmt_ast = "".join(
+            ["(fun ", str(self.name), " ", str(len(self.params)), ")"]
+        )
+        return function_stmt_ast
@@ -4,10 +4,13 @@ from _asts.visitor_interface import VisitorInterface
 class IfStatement(VisitorInterface):
     """IfStatement node in the AST."""
 
+    __slots__ = ("condition", "then_branch", "else_branch", "line_no")
+
     def __init__(self, condition, then_branch, else_branch):
         self.condition = condition
         self.then_branch = then_branch
-        self.else_branch = else_branch
+        self.else_branch = else_branch  # statement, or None
+        self.line_no = None  # set by the Parser: the line the statement starts on.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing if statements."""
@@ -4,8 +4,11 @@ from _asts.visitor_interface import VisitorInterface
 class PrintStatement(VisitorInterface):
     """PrintStatement node in the AST."""
 
+    __slots__ = ("expression", "line_no")
+
     def __init__(self, expression):
         self.expression = expression
+        self.line_no = None  # set by the Parser: the line the statement starts on.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing print statements."""
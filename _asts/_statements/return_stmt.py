@@ -4,8 +4,12 @@ from _asts.visitor_interface import VisitorInterface
 class ReturnStatement(VisitorInterface):
     """ReturnStatement node in the AST."""
 
+    __slots__ = ("expression", "line_no", "is_tail_call")
+
     def __init__(self, expression):
-        self.expression = expression
+        self.expression = expression  # expression, or None
+        self.line_no = None  # set by the Parser: the line the statement starts on.
+        self.is_tail_call = False  # set by the Resolver: the expression is a call.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing return statements."""
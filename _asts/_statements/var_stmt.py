@@ -4,9 +4,13 @@ from _asts.visitor_interface import VisitorInterface
 class VariableStatement(VisitorInterface):
     """VariableStatement node in the AST."""
 
+    __slots__ = ("identifier", "initializer", "slot", "line_no")
+
     def __init__(self, identifier, initializer):
-        self.identifier = identifier
-        self.initializer = initializer
+        self.identifier = identifier  # Token
+        self.initializer = initializer  # expression, or None
+        self.slot = None  # set by the Resolver. None for globals.
+        self.line_no = identifier.line_no
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing variable statements."""
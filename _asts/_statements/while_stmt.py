@@ -4,9 +4,12 @@ from _asts.visitor_interface import VisitorInterface
 class WhileStatement(VisitorInterface):
     """WhileStatement node in the AST."""
 
+    __slots__ = ("condition", "body", "line_no")
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
+        self.line_no = None  # set by the Parser: the line the statement starts on.
 
     def accept(self, visitor):
         """Visitor implementation for nodes representing while statements."""
@@ -3,6 +3,9 @@ from abc import abstractmethod
 
 
 class VisitorInterface(ABC):
+    # AST nodes are slotted. an empty __slots__ here keeps them free of a __dict__.
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor):
         NotImplementedError
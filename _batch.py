@@ -0,0 +1,137 @@
+import functools
+import io
+import multiprocessing
+import os
+import time
+
+from _budget import Budget
+from _cache import ProgramCache
+from _memo import Memoizer
+from _output import Output
+
+
+def find_scripts(paths):
+    """Expands directories into the .plox files anywhere under them, sorted by path.
+    Other paths are kept as given, so missing files are reported by the script that runs them.
+    """
+    scripts = []
+    for path in paths:
+        if not os.path.isdir(path):
+            scripts.append(path)
+            continue
+
+        found = []
+        for dir_path, _, file_names in os.walk(path):
+            found.extend(
+                os.path.join(dir_path, file_name)
+                for file_name in file_names
+                if file_name.endswith(".plox")
+            )
+        scripts.extend(sorted(found))
+
+    return scripts
+
+
+class ScriptResult:
+    """What running one script of a batch produced. status is 0 if it ran to the end, else 1."""
+
+    def __init__(self, path, status, output, error, seconds):
+        self.path = path
+        self.status = status
+        self.output = output
+        self.error = error
+        self.seconds = seconds
+
+
+def run_script(path, options):
+    """Runs the script at path on a new Plox, collecting what it prints.
+    Called in the pool's worker processes, each of which runs many scripts."""
+    from plox import Plox  # imported here since plox imports this module.
+
+    memo_size = options["memo_size"]
+    max_steps, time_limit = options["max_steps"], options["time_limit"]
+    is_budgeted = max_steps is not None or time_limit is not None
+    sink = io.StringIO()
+    plox = Plox(
+        engine=options["engine"],
+        opt_level=options["opt_level"],
+        fast_scan=options["fast_scan"],
+        memoizer=Memoizer(memo_size) if memo_size > 0 else None,
+        output=Output(sink, flush="full"),
+        budget=(
+            Budget(max_steps=max_steps, time_limit=time_limit) if is_budgeted else None
+        ),
+    )
+
+    start = time.perf_counter()
+    status, error = 0, None
+    try:
+        if options["clear_cache"]:
+            ProgramCache(path).clear()
+
+        plox.run_file(path, stream=options["stream"], use_cache=options["use_cache"])
+    except Exception as e:
+        status, error = 1, "{}: {}".format(type(e).__name__, e)
+
+    seconds = time.perf_counter() - start
+    return ScriptResult(path, status, sink.getvalue(), error, seconds)
+
+
+class BatchRunner:
+    """Runs many independent plox scripts on a pool of jobs worker processes, reusing each
+    process for many scripts so interpreter startup is paid once per worker.
+    options are the run settings every script gets: engine, opt_level, fast_scan, stream,
+    use_cache, clear_cache, memo_size, max_steps and time_limit."""
+
+    def __init__(self, jobs=None, **options):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.options = options
+
+    def run(self, paths, stream, summary_stream):
+        """Runs every script under paths. Writes each script's status and output to stream,
+        in the order of paths, and a summary to summary_stream.
+        Returns the results of all scripts."""
+        scripts = find_scripts(paths)
+        run = functools.partial(run_script, options=self.options)
+        results = []
+        start = time.perf_counter()
+        if self.jobs == 1 or len(scripts) <= 1:
+            for result in map(run, scripts):
+                self.write_result(result, stream)
+                results.append(result)
+        else:
+            with multiprocessing.Pool(self.jobs) as pool:
+                for result in pool.imap(run, scripts):
+                    self.write_result(result, stream)
+                    results.append(result)
+
+        seconds = time.perf_counter() - start
+        stream.flush()
+        self.write_summary(results, seconds, summary_stream)
+        return results
+
+    def write_result(self, result, stream):
+        stream.write(
+            "==> {} [exit {}, {:.3f}s]\n".format(
+                result.path, result.status, result.seconds
+            )
+        )
+        stream.write(result.output)
+        if result.error is not None:
+            stream.write(result.error + "\n")
+
+    def write_summary(self, results, seconds, stream):
+        failed = [result for result in results if result.status != 0]
+        rate = len(results) / seconds if seconds > 0 else 0.0
+        stream.write(
+            "{} scripts: {} ok, {} failed in {:.3f}s with {} jobs ({:.1f} scripts/s)\n".format(
+                len(results),
+                len(results) - len(failed),
+                len(failed),
+                seconds,
+                self.jobs,
+                rate,
+            )
+        )
+        for result in failed:
+            stream.write("failed: {} [exit {}]\n".format(result.path, result.status))
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+
+from _completion import Completion
+from _function import Function
+from _interpreter import Interpreter
+from _operators import is_truthy
+
+
+class Budget:
+    """Limits a program's run and splits it into slices of slice_steps steps, a step being
+    a loop iteration or a function call: everything that can run unboundedly does one per pass.
+    Between slices the limits are enforced: max_steps steps, time_limit seconds spent running
+    (time paused between slices doesn't count) and cancel, which may be called from any thread.
+    start resets the budget for a new run. Plox calls it before running anything."""
+
+    def __init__(self, slice_steps=1000, max_steps=None, time_limit=None):
+        if slice_steps <= 0:
+            raise ValueError("slice_steps must be positive.")
+
+        self.slice_steps = slice_steps
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        # called at the end of every slice. run_cooperatively sets it to hand the event loop
+        # its turn.
+        self.pause = None
+        self.start()
+
+    def start(self):
+        self.steps = 0
+        self.cancelled = False
+        self.deadline = (
+            None if self.time_limit is None else time.monotonic() + self.time_limit
+        )
+        self.slice_end = self.next_slice_end()
+
+    def next_slice_end(self):
+        slice_end = self.steps + self.slice_steps
+        if self.max_steps is not None:
+            slice_end = min(slice_end, self.max_steps + 1)
+
+        return slice_end
+
+    def cancel(self):
+        """Stops the program at its next step."""
+        self.cancelled = True
+        self.slice_end = 0
+
+    def step(self):
+        """Counts a step. Enforces the limits, and pauses, once the slice is used up."""
+        self.steps += 1
+        if self.steps >= self.slice_end:
+            self.end_slice()
+
+    def end_slice(self):
+        if self.pause is not None and not self.cancelled:
+            paused_at = time.monotonic()
+            self.pause()
+            if self.deadline is not None:
+                self.deadline += time.monotonic() - paused_at
+
+        if self.cancelled:
+            raise asyncio.CancelledError("Cancelled after {} steps.".format(self.steps))
+
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise RuntimeError("Exceeded the limit of {} steps.".format(self.max_steps))
+
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise TimeoutError(
+                "Exceeded the time limit of {}s.".format(self.time_limit)
+            )
+
+        self.slice_end = self.next_slice_end()
+
+
+class BudgetedFunction(Function):
+    """Plox function that counts a step on every call."""
+
+    def call(self, arguments, interpreter):
+        interpreter.budget.step()
+        return Function.call(self, arguments, interpreter)
+
+
+class BudgetedInterpreter(Interpreter):
+    """Interpreter that counts a step on every loop iteration and, through BudgetedFunctions,
+    on every call. Plain Interpreter and Function count nothing, so running without a budget
+    costs nothing. Calls in tail position are nested, so they are counted too."""
+
+    function_class = BudgetedFunction
+    eliminates_tail_calls = False
+
+    def __init__(self, budget, output=None):
+        super().__init__(output=output)
+        self.budget = budget
+
+    def visit_while_stmt(self, while_stmt):
+        step = self.budget.step
+        while is_truthy(self.evaluate(while_stmt.condition)):
+            completion = self.execute(while_stmt.body)
+            if completion is not None:
+                return None if completion is Completion.BREAK else completion
+
+            step()
+
+        return None
+
+    def visit_for_stmt(self, for_stmt):
+        if for_stmt.initializer is not None:
+            self.execute(for_stmt.initializer)
+
+        step = self.budget.step
+        update = for_stmt.update
+        while is_truthy(self.evaluate(for_stmt.condition)):
+            completion = self.execute(for_stmt.body)
+            if completion is not None:
+                return None if completion is Completion.BREAK else completion
+
+            if update is not None:
+                self.evaluate(update)
+            step()
+
+        return None
+
+
+async def run_cooperatively(run, budget):
+    """Calls run, which runs a program under budget, on a new thread that takes turns with the
+    event loop: the loop waits while the program runs a slice, then runs every other task
+    that is ready before the next one. Returns what run returns, or raises what it raises.
+    Cancelling the awaiting task stops the program at its next step."""
+    loop_turn = threading.Event()
+    program_turn = threading.Event()
+    outcome = []
+
+    def pause():
+        loop_turn.set()
+        program_turn.wait()
+        program_turn.clear()
+
+    def work():
+        program_turn.wait()
+        program_turn.clear()
+        try:
+            outcome.append((run(), None))
+        except BaseException as e:
+            outcome.append((None, e))
+        finally:
+            loop_turn.set()
+
+    budget.pause = pause
+    threading.Thread(target=work, daemon=True).start()
+    try:
+        while True:
+            program_turn.set()
+            loop_turn.wait()
+            loop_turn.clear()
+            if outcome:
+                break
+
+            await asyncio.sleep(0)
+    except asyncio.CancelledError:
+        budget.cancel()
+        program_turn.set()
+        loop_turn.wait()
+        raise
+    finally:
+        budget.pause = None
+
+    value, error = outcome[0]
+    if error is not None:
+        raise error
+
+    return value
@@ -0,0 +1,92 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+
+CACHE_DIR = "__ploxcache__"
+CACHE_EXT = ".ploxc"
+
+MAGIC = b"PLOX"
+# bump whenever the AST node classes change. files written with another version are ignored.
+FORMAT_VERSION = 9
+HEADER = struct.Struct("<4sH")  # magic, format version
+
+
+class ProgramCache:
+    """Stores the resolved (and optionally optimized) ASTs of a plox file on disk, in a
+    __ploxcache__ directory next to it. A file is cached as <name>.<hash>.ploxc, where hash
+    covers its source and the optimization level, so rerunning an unchanged file skips
+    scanning, parsing, optimizing and resolving.
+    A .ploxc file is a fixed header (magic, format version) followed by the pickled ASTs.
+    """
+
+    def __init__(self, src_fp, opt_level=0):
+        self.dir = os.path.join(os.path.dirname(os.path.abspath(src_fp)), CACHE_DIR)
+        self.name = os.path.basename(src_fp)
+        self.opt_level = opt_level
+
+    def path(self, src):
+        """Returns the path of the cached program for a given source."""
+        digest = hashlib.sha256(
+            "{}:{}".format(self.opt_level, src).encode()
+        ).hexdigest()
+        return os.path.join(
+            self.dir, "{}.{}{}".format(self.name, digest[:16], CACHE_EXT)
+        )
+
+    def load(self, src):
+        """Returns the cached ASTs of src, or None if there are none (or they're unusable)."""
+        try:
+            with open(self.path(src), "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as m:
+                if len(m) < HEADER.size:
+                    return None
+
+                magic, version = HEADER.unpack_from(m)
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    return None
+
+                # unpickled straight from the mapped file, without copying it first.
+                with memoryview(m) as view, view[HEADER.size :] as payload:
+                    return pickle.loads(payload)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def store(self, src, asts):
+        """Writes the ASTs of src to the cache, replacing those of older versions of the file."""
+        try:
+            payload = pickle.dumps(asts, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError):
+            return  # very deeply nested programs just aren't cached.
+
+        try:
+            self.clear()
+            os.makedirs(self.dir, exist_ok=True)
+            path = self.path(src)
+            # written under a temporary name so other processes never load a partial file.
+            tmp_path = "{}.{}.tmp".format(path, os.getpid())
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+                f.write(payload)
+
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # a read-only directory only means no caching.
+
+    def clear(self):
+        """Removes every cached version of the file."""
+        if not os.path.isdir(self.dir):
+            return
+
+        prefix = self.name + "."
+        entry_len = len(prefix) + 16 + len(CACHE_EXT)  # 16 hex digits of the hash.
+        for entry in os.listdir(self.dir):
+            is_cached_version = (
+                len(entry) == entry_len
+                and entry.startswith(prefix)
+                and entry.endswith(CACHE_EXT)
+            )
+            if is_cached_version:
+                os.remove(os.path.join(self.dir, entry))
@@ -0,0 +1,47 @@
+import math
+
+
+class Chunk:
+    """Bytecode emitted by the Compiler: a flat list of opcodes and their operands,
+    plus the pool of constants the opcodes refer to by index."""
+
+    def __init__(self):
+        self.code = []
+        self.constants = []
+        self.constant_idxs = {}
+
+    def emit(self, *values):
+        """Appends an opcode and its operands. Returns the index of the last value emitted."""
+        self.code.extend(values)
+        return len(self.code) - 1
+
+    def add_constant(self, value):
+        """Adds value to the constant pool (once) and returns its index."""
+        # keyed by type as well: 1.0 == True in python but they are different plox values.
+        key = (type(value), value)
+        if type(value) is float:
+            # and by sign: 0.0 == -0.0 too.
+            key += (math.copysign(1.0, value),)
+        if key not in self.constant_idxs:
+            self.constant_idxs[key] = len(self.constants)
+            self.constants.append(value)
+
+        return self.constant_idxs[key]
+
+    def patch(self, idx, value):
+        """Overwrites a previously emitted operand e.g. the target of a forward jump."""
+        self.code[idx] = value
+
+
+class FunctionPrototype:
+    """Compiled plox function. The VM pairs it with a closure to create a VMFunction."""
+
+    def __init__(self, name, param_slots, num_slots, chunk, line_no):
+        self.name = name
+        self.param_slots = param_slots
+        self.num_slots = num_slots
+        self.chunk = chunk
+        self.line_no = line_no
+
+    def __str__(self):
+        return "<fn {} declared on {}>".format(self.name, self.line_no)
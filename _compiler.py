@@ -0,0 +1,281 @@
+from _chunk import Chunk
+from _chunk import FunctionPrototype
+from _function import Function
+from _opcodes import OpCode
+from _tokens._token_type import TokenType
+from _visitors._expressions.expr_visitor import ExpressionVisitor
+from _visitors._statements.stmt_visitor import StatementVisitor
+
+BINARY_OPCODES = {
+    TokenType.PIPE: OpCode.BITWISE_OR,
+    TokenType.AMPERSAND: OpCode.BITWISE_AND,
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.PERCENT: OpCode.MODULO,
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.GREATER_THAN: OpCode.GREATER_THAN,
+    TokenType.GREATER_THAN_EQUAL: OpCode.GREATER_THAN_EQUAL,
+    TokenType.LESS_THAN: OpCode.LESS_THAN,
+    TokenType.LESS_THAN_EQUAL: OpCode.LESS_THAN_EQUAL,
+    TokenType.CARET: OpCode.POWER,
+}
+
+UNARY_OPCODES = {
+    TokenType.BANG: OpCode.NOT,
+    TokenType.MINUS: OpCode.NEGATE,
+}
+
+
+class Compiler(ExpressionVisitor, StatementVisitor):
+    """Compiles resolved AST nodes into bytecode for the VM."""
+
+    def __init__(self):
+        self.chunk = Chunk()
+        # one entry per scope tracked by the Resolver: True if the scope gets an environment at runtime.
+        # scopes without locals don't, so the Resolver's depths are translated into actual hops.
+        self.scopes = []
+        # per enclosing loop: scope count at loop entry and jumps to patch on exit.
+        self.loops = []
+        self.in_function = False
+
+    def compile(self, stmts):
+        """Compiles every AST node representing a statement into a single chunk."""
+        for stmt in stmts:
+            self.compile_stmt(stmt)
+
+        # returning from the outermost frame halts the VM.
+        self.emit(OpCode.CONSTANT, self.chunk.add_constant(None))
+        self.emit(OpCode.RETURN)
+        return self.chunk
+
+    def compile_stmt(self, stmt):
+        if stmt is None:
+            # the parser emits None for statements it failed to parse.
+            raise SyntaxError("Can't compile a statement that failed to parse.")
+
+        stmt.accept(self)
+
+    def compile_expr(self, expr):
+        expr.accept(self)
+
+    def emit(self, opcode, *operands):
+        return self.chunk.emit(opcode.value, *operands)
+
+    def emit_jump(self, opcode):
+        """Emits a jump with a placeholder target. Returns the index of the target to patch."""
+        return self.emit(opcode, None)
+
+    def patch_jump(self, idx):
+        """Points a previously emitted jump at the next instruction."""
+        self.chunk.patch(idx, len(self.chunk.code))
+
+    def hops(self, depth):
+        """Translates the Resolver's depth into the number of runtime environments to walk."""
+        return sum(self.scopes[len(self.scopes) - depth :]) if depth else 0
+
+    def visit_while_stmt(self, while_stmt):
+        self.compile_loop(while_stmt.condition, while_stmt.body)
+
+    def visit_for_stmt(self, for_stmt):
+        if for_stmt.initializer is not None:
+            self.compile_stmt(for_stmt.initializer)
+
+        self.compile_loop(for_stmt.condition, for_stmt.body, for_stmt.update)
+
+    def compile_loop(self, condition, body, update=None):
+        """Compiles a loop. Every iteration checks condition, runs body and then evaluates update."""
+        loop_start = len(self.chunk.code)
+        self.compile_expr(condition)
+        exit_jump = self.emit_jump(OpCode.JUMP_IF_FALSE)
+
+        self.loops.append((len(self.scopes), []))
+        self.compile_stmt(body)
+        if update is not None:
+            self.compile_expr(update)
+            self.emit(OpCode.POP)
+
+        self.emit(OpCode.JUMP, loop_start)
+        self.patch_jump(exit_jump)
+        _, break_jumps = self.loops.pop()
+        for break_jump in break_jumps:
+            self.patch_jump(break_jump)
+
+    def visit_if_stmt(self, if_stmt):
+        self.compile_expr(if_stmt.condition)
+        else_jump = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        self.compile_stmt(if_stmt.then_branch)
+
+        if if_stmt.else_branch is None:
+            self.patch_jump(else_jump)
+            return
+
+        end_jump = self.emit_jump(OpCode.JUMP)
+        self.patch_jump(else_jump)
+        self.compile_stmt(if_stmt.else_branch)
+        self.patch_jump(end_jump)
+
+    def visit_print_stmt(self, print_stmt):
+        self.compile_expr(print_stmt.expression)
+        self.emit(OpCode.PRINT)
+
+    def visit_return_stmt(self, return_stmt):
+        if not self.in_function:
+            raise SyntaxError("Can't use return outside function.")
+
+        if return_stmt.expression is None:
+            self.emit(OpCode.CONSTANT, self.chunk.add_constant(None))
+        else:
+            self.compile_expr(return_stmt.expression)
+
+        self.emit(OpCode.RETURN)
+
+    def visit_break_stmt(self, break_stmt):
+        if not self.loops:
+            raise SyntaxError(
+                "[Error on L{}]: Can't use break outside loop.".format(
+                    break_stmt.keyword.line_no
+                )
+            )
+
+        # leave the environments of every block between the loop and the break.
+        num_scopes, break_jumps = self.loops[-1]
+        for _ in range(sum(self.scopes[num_scopes:])):
+            self.emit(OpCode.POP_ENV)
+
+        break_jumps.append(self.emit_jump(OpCode.JUMP))
+
+    def visit_block(self, block):
+        has_environment = block.num_slots > 0
+        if has_environment:
+            self.emit(OpCode.PUSH_ENV, block.num_slots)
+
+        self.scopes.append(has_environment)
+        for stmt in block.statements:
+            self.compile_stmt(stmt)
+        self.scopes.pop()
+
+        if has_environment:
+            self.emit(OpCode.POP_ENV)
+
+    def visit_variable_stmt(self, variable_stmt):
+        if variable_stmt.initializer is None:
+            self.emit(OpCode.CONSTANT, self.chunk.add_constant(None))
+        else:
+            self.compile_expr(variable_stmt.initializer)
+
+        self.define(variable_stmt.identifier.lexeme, variable_stmt.slot)
+
+    def visit_function_stmt(self, function_stmt):
+        name = function_stmt.name
+        max_params = Function.MAX_PARAMS
+        if len(function_stmt.params) > max_params:
+            raise ValueError(
+                "Too many params in the {} function. Max params: {}.".format(
+                    name, max_params
+                )
+            )
+
+        # compile the body into its own chunk. loops don't extend into nested functions.
+        enclosing_chunk, enclosing_loops = self.chunk, self.loops
+        enclosing_in_function = self.in_function
+        self.chunk, self.loops, self.in_function = Chunk(), [], True
+        self.scopes.append(function_stmt.num_slots > 0)
+
+        for stmt in function_stmt.body:
+            self.compile_stmt(stmt)
+        self.emit(OpCode.CONSTANT, self.chunk.add_constant(None))
+        self.emit(OpCode.RETURN)  # default return for functions w/o a return statement
+
+        self.scopes.pop()
+        prototype = FunctionPrototype(
+            name,
+            function_stmt.param_slots,
+            function_stmt.num_slots,
+            self.chunk,
+            function_stmt.line_no,
+        )
+        self.chunk, self.loops = enclosing_chunk, enclosing_loops
+        self.in_function = enclosing_in_function
+
+        self.emit(OpCode.MAKE_FUNCTION, self.chunk.add_constant(prototype))
+        self.define(name, function_stmt.slot)
+
+    def define(self, name, slot):
+        if slot is None:
+            self.emit(OpCode.DEFINE_GLOBAL, self.chunk.add_constant(name))
+        else:
+            self.emit(OpCode.DEFINE_LOCAL, slot)
+
+    def visit_expression_stmt(self, expression_stmt):
+        self.compile_expr(expression_stmt.expression)
+        self.emit(OpCode.POP)
+
+    def visit_ternary_expr(self, ternary_expr):
+        self.compile_expr(ternary_expr.first)
+        third_jump = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        self.compile_expr(ternary_expr.second)
+        end_jump = self.emit_jump(OpCode.JUMP)
+        self.patch_jump(third_jump)
+        self.compile_expr(ternary_expr.third)
+        self.patch_jump(end_jump)
+
+    def visit_assignment_expr(self, assignment_expr):
+        self.compile_expr(assignment_expr.value)
+        if assignment_expr.depth is None:
+            name_idx = self.chunk.add_constant(assignment_expr.name)
+            self.emit(OpCode.SET_GLOBAL, name_idx)
+        else:
+            hops = self.hops(assignment_expr.depth)
+            self.emit(OpCode.SET_LOCAL, hops, assignment_expr.slot)
+
+    def visit_variable_expr(self, variable_expr):
+        name_idx = self.chunk.add_constant(variable_expr.name)
+        if variable_expr.depth is None:
+            self.emit(OpCode.GET_GLOBAL, name_idx)
+        else:
+            hops = self.hops(variable_expr.depth)
+            self.emit(OpCode.GET_LOCAL, hops, variable_expr.slot, name_idx)
+
+    def visit_logical_expr(self, logical_expr):
+        self.compile_expr(logical_expr.left)
+        if logical_expr.operator.type == TokenType.OR:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_TRUE_OR_POP)
+            self.compile_expr(logical_expr.right)
+            self.emit(OpCode.FALSE_IF_FALSY)
+        else:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_FALSE_OR_FALSE)
+            self.compile_expr(logical_expr.right)
+            self.emit(OpCode.AND_RESULT)
+
+        self.patch_jump(end_jump)
+
+    def visit_binary_expr(self, binary_expr):
+        self.compile_expr(binary_expr.left)
+        self.compile_expr(binary_expr.right)
+        operator = binary_expr.operator
+        self.emit(BINARY_OPCODES[operator.type], operator.line_no)
+
+    def visit_group_expr(self, group_expr):
+        self.compile_expr(group_expr.expression)
+
+    def visit_literal_expr(self, literal_expr):
+        value = literal_expr.value
+        if type(value) is int:
+            value = float(value)  # the VM's fast paths are for float numbers.
+
+        self.emit(OpCode.CONSTANT, self.chunk.add_constant(value))
+
+    def visit_unary_expr(self, unary_expr):
+        self.compile_expr(unary_expr.right)
+        operator = unary_expr.operator
+        self.emit(UNARY_OPCODES[operator.type], operator.line_no)
+
+    def visit_call_expr(self, call_expr):
+        self.compile_expr(call_expr.callee)
+        for argument in call_expr.arguments:
+            self.compile_expr(argument)
+
+        self.emit(OpCode.CALL, len(call_expr.arguments))
@@ -0,0 +1,13 @@
+from enum import Enum
+from enum import unique
+
+
+@unique
+class Completion(Enum):
+    """Signals that a statement transferred control instead of completing normally.
+    Executing a statement returns one of these, or None if execution should carry on
+    with the next statement."""
+
+    BREAK = 0
+    RETURN = 1  # the returned value is held by the interpreter.
+    TAIL_CALL = 2  # the callee and arguments to call next are held by the interpreter.
@@ -1,11 +1,47 @@
+import threading
+
+from _output import running_output
+
+# number of warnings printed so far, per thread. memoized functions don't cache calls that print one.
+_reported = threading.local()
+
+
+def warnings_reported():
+    """Returns the number of warnings printed so far by programs running on this thread."""
+    return getattr(_reported, "count", 0)
+
+
+def report(warning):
+    """Prints a warning about a variable that couldn't be read or assigned."""
+    _reported.count = warnings_reported() + 1
+    # written through the running program's Output so it stays in order with what it printed.
+    output = running_output()
+    if output is None:
+        print(warning)
+    else:
+        output.write_line(warning)
+
+
+def report_uninitialized(name):
+    """Warns about reading a variable that has neither been initialized nor assigned."""
+    report(
+        "Can't access uninitialized/unassigned variable {}. Initialize thus: {} = <value>".format(
+            name, name
+        )
+    )
+
+
 class Environment:
     """Stores all name-value bindings: variables, functions, classes."""
 
-    def __init__(self, enclosing=None):
+    def __init__(self, enclosing=None, num_slots=0):
         """The global environment has no enclosing environment, thus its enclosing is None.
-        Otherwise, enclosing is the environment enclosing the current environment"""
+        Otherwise, enclosing is the environment enclosing the current environment.
+        Globals are stored by name in bindings. Locals are stored in slots, at the index
+        assigned to them by the Resolver."""
         self.enclosing = enclosing
         self.bindings = {}
+        self.slots = [None] * num_slots
 
     def define(self, name, value):
         """Adds new identifier/name to environment."""
@@ -23,7 +59,7 @@ class Environment:
             self.enclosing.assign(name, value)
             return
 
-        print(
+        report(
             "Can't (re-)assign undefined variable {}. Define thus: var {}; or var {} = <value>;".format(
                 name, name, name
             )
@@ -37,11 +73,7 @@ class Environment:
             value_not_set = value is None
             if value_not_set:
                 # can only get values that have been assigned or initialized.
-                print(
-                    "Can't access uninitialized/unassigned variable {}. Initialize thus: {} = <value>".format(
-                        name, name
-                    )
-                )
+                report_uninitialized(name)
 
             return value
 
@@ -49,8 +81,33 @@ class Environment:
         if non_global_env:
             return self.enclosing.get(name)
 
-        print(
+        report(
             "Can't get undefined variable {}. Define thus: var {}; or var {} = <value>;".format(
                 name, name, name
             )
         )
+
+    def define_at(self, slot, value):
+        """Adds new local identifier/name to its resolved slot."""
+        self.slots[slot] = value
+
+    def ancestor(self, depth):
+        """Returns the environment depth hops up the enclosing chain."""
+        environment = self
+        for _ in range(depth):
+            environment = environment.enclosing
+
+        return environment
+
+    def assign_at(self, depth, slot, value):
+        """Updates existing local identifier/name at its resolved (depth, slot)."""
+        self.ancestor(depth).slots[slot] = value
+
+    def get_at(self, depth, slot, name):
+        """Retrieves existing local identifier/name from its resolved (depth, slot)."""
+        value = self.ancestor(depth).slots[slot]
+        if value is None:
+            # can only get values that have been assigned or initialized.
+            report_uninitialized(name)
+
+        return value
@@ -0,0 +1,151 @@
+import re
+import sys
+
+from _keywords import KEYWORDS
+from _numbers import number_literal
+from _tokens._token import Token
+from _tokens._token_type import TokenType
+
+# single and double character lexemes that map straight to a token type.
+OPERATORS = {
+    "+": TokenType.PLUS,
+    "-": TokenType.MINUS,
+    "/": TokenType.SLASH,
+    "*": TokenType.STAR,
+    "%": TokenType.PERCENT,
+    "^": TokenType.CARET,
+    ">": TokenType.GREATER_THAN,
+    ">=": TokenType.GREATER_THAN_EQUAL,
+    "<": TokenType.LESS_THAN,
+    "<=": TokenType.LESS_THAN_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ";": TokenType.SEMI_COLON,
+    ",": TokenType.COMMA,
+    "?": TokenType.QUESTION,
+    ":": TokenType.COLON,
+    "&": TokenType.AMPERSAND,
+    "|": TokenType.PIPE,
+}
+
+# one alternative per kind of lexeme. the first one that matches at the current position wins.
+LEXEME = re.compile(
+    r"""
+    (?P<WHITESPACE>[ \t\r\n]+)
+    | (?P<IDENTIFIER>[A-Za-z_]+)
+    | (?P<NUMBER>[0-9][0-9.]*)
+    | (?P<STRING>["'][^"']*["']?)
+    | (?P<COMMENT>`[^\n]*)
+    | (?P<OPERATOR>[<>=!]=?|[-+/*%^(){};,?:&|])
+    | (?P<UNEXPECTED>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+CHUNK_SIZE = 1 << 16  # characters read at a time when scanning a file.
+
+
+class FastScanner:
+    """Creates the same tokens (and comments) as Scanner, with a single compiled regex
+    matching a whole lexeme at a time instead of a branch per character."""
+
+    def __init__(self, src):
+        self.src = src
+        self.chunks = [src]  # the source, in the order it is scanned.
+        self.line_no = 1
+        self.tokens = []
+        self.comments = []
+
+    @classmethod
+    def from_file(cls, f, chunk_size=CHUNK_SIZE):
+        """Creates a scanner that reads the source from an open file as it goes,
+        so the whole file is never held in memory."""
+        scanner = cls("")
+        scanner.chunks = iter(lambda: f.read(chunk_size), "")
+        return scanner
+
+    def scan(self):
+        """Creates tokens by matching lexemes, left to right."""
+        self.tokens.extend(self.scan_iter())
+        return self.tokens
+
+    def scan_iter(self):
+        """Creates tokens lazily: each one is yielded as soon as its lexeme is matched."""
+        identifier = TokenType.IDENTIFIER
+        number = TokenType.NUMBER
+        line_no = 1
+
+        for match in self.matches():
+            kind = match.lastgroup
+            lexeme = match.group()
+
+            if kind == "WHITESPACE":
+                line_no += lexeme.count("\n")
+
+            elif kind == "IDENTIFIER":
+                # names repeat a lot. tokens of the same name share one string.
+                lexeme = sys.intern(lexeme)
+                yield Token(KEYWORDS.get(lexeme, identifier), lexeme, None, line_no)
+
+            elif kind == "OPERATOR":
+                yield Token(OPERATORS[lexeme], sys.intern(lexeme), None, line_no)
+
+            elif kind == "NUMBER":
+                yield Token(number, lexeme, number_literal(lexeme), line_no)
+
+            elif kind == "STRING":
+                yield self.string_token(lexeme, line_no)
+
+            elif kind == "COMMENT":
+                self.comments.append(Token(TokenType.BACKTICK, lexeme, lexeme, line_no))
+
+            else:
+                self.line_no = line_no
+                raise TypeError(
+                    "[Error on L{}]: Unexpected character {}".format(line_no, lexeme),
+                )
+
+        self.line_no = line_no
+        yield Token(TokenType.EOF, "", None, line_no)
+
+    def matches(self):
+        """Yields the match of every lexeme in the source, one chunk at a time.
+        Every character belongs to some lexeme, so a chunk's last match always ends the chunk.
+        That lexeme may continue in the next chunk, so it is matched again along with it.
+        """
+        pending = ""
+        for chunk in self.chunks:
+            buffer = pending + chunk
+            pending = ""
+            for match in LEXEME.finditer(buffer):
+                if match.end() == len(buffer):
+                    pending = match.group()
+                    break
+
+                yield match
+
+        yield from LEXEME.finditer(pending)
+
+    def string_token(self, lexeme, line_no):
+        """Validates a quoted lexeme exactly like Scanner.extract_string does.
+        Like Scanner, newlines inside strings don't advance the line number."""
+        empty_string = len(lexeme) > 1 and lexeme[1] in "'\""
+        if empty_string:
+            raise ValueError(
+                "[Error on L{}]: Can not use empty string".format(line_no),
+            )
+
+        matching_quotes = lexeme[0] == lexeme[-1]
+        if not matching_quotes:
+            raise SyntaxError(
+                "[Error on L{}]: Quotes do not match in {}".format(line_no, lexeme),
+            )
+
+        # dropping quotes so they don't show up when concating strings with +
+        return Token(TokenType.STRING, lexeme, lexeme[1 : len(lexeme) - 1], line_no)
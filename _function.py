@@ -1,4 +1,5 @@
 from _callable import Callable
+from _completion import Completion
 from _environment import Environment
 
 
@@ -8,11 +9,14 @@ class Function(Callable):
     MAX_PARAMS = 255
 
     def __init__(self, declaration, closure):
-        self.declaration = declaration
-        self.name = self.declaration.get("name")
-        self.params = self.declaration.get("params")
-        self.body = self.declaration.get("body")
-        self.line_no = self.declaration.get("line_no")
+        self.declaration = declaration  # the FunctionStatement
+        self.name = self.declaration.name
+        self.params = self.declaration.params
+        self.body = self.declaration.body
+        self.line_no = self.declaration.line_no
+        # set by the Resolver.
+        self.param_slots = self.declaration.param_slots
+        self.num_slots = self.declaration.num_slots
         self.closure = closure
 
     def arity(self):
@@ -21,28 +25,28 @@ class Function(Callable):
 
     def call(self, arguments, interpreter):
         """Calls a previously declared function. Every function call
-        creates a new environment."""
-        environment = Environment(self.closure)  # captures function's closure
+        creates a new environment.
+        Calls in tail position (return f(...);) end the body with a TAIL_CALL completion
+        and are run by this loop, so tail recursion doesn't grow the python stack."""
+        function = self
+        while True:
+            # captures function's closure
+            environment = Environment(function.closure, function.num_slots)
 
-        try:
-            for param, arg in zip(self.params, arguments):
-                environment.define(param.name, arg)
+            for slot, arg in zip(function.param_slots, arguments):
+                environment.define_at(slot, arg)
 
-            interpreter.execute_block(self.body, environment)
-        except Exception as e:
-            # using exceptions to catch function call's return value.
-            return e.value
+            completion = interpreter.execute_block(function.body, environment)
+            if completion is not Completion.TAIL_CALL:
+                break
+
+            function, arguments = interpreter.tail_call
+
+        if completion is Completion.RETURN:
+            return interpreter.return_value
 
         return None  # default return for functions w/o a return statement
 
     def __str__(self):
         """String representation of a plox function."""
         return "<fn {} declared on {}>".format(self.name, self.line_no)
-
-
-class Return(Exception):
-    """Captures function's return value."""
-
-    def __init__(self, value):
-        self.value = value
-        super().__init__(self.value)
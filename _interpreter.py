@@ -1,9 +1,14 @@
-from _asts._statements.while_stmt import WhileStatement
 from _callable import Callable
+from _completion import Completion
 from _environment import Environment
 from _function import Function
-from _function import Return
-from _break import Break
+from _memo import MemoizedFunction
+from _operators import BINARY_OPERATORS
+from _operators import UNARY_OPERATORS
+from _operators import is_truthy
+from _operators import plox_type
+from _operators import to_printable
+from _output import Output
 from _tokens._token_type import TokenType
 from _visitors._expressions.expr_visitor import ExpressionVisitor
 from _visitors._statements.stmt_visitor import StatementVisitor
@@ -12,25 +17,47 @@ from _visitors._statements.stmt_visitor import StatementVisitor
 class Interpreter(ExpressionVisitor, StatementVisitor):
     """Interprets all AST nodes."""
 
-    # ensures the environment persists across all instances of Interpreter
-    environment = Environment()
-
-    def __init__(self):
-        pass
-
-    def interpret(self, stmts):
+    # runtime object created for function declarations. the profiler swaps in a timed one.
+    function_class = Function
+    # run calls in tail position in the caller's Function.call loop. see visit_return_stmt.
+    eliminates_tail_calls = True
+
+    def __init__(self, memoizer=None, output=None):
+        # globals persist across every program the instance runs, in batch or interactive mode.
+        # nothing is shared between instances, so each can run on its own thread.
+        self.globals = Environment()
+        # environment of the innermost block being executed.
+        self.environment = self.globals
+        # where print statements write to.
+        self.output = Output() if output is None else output
+        # caches the results of pure functions when set.
+        self.memoizer = memoizer
+        # value of the last executed return statement. read by the function being returned from.
+        self.return_value = None
+        # (function, arguments) of the last call in tail position. read by the function making it.
+        self.tail_call = None
+
+    def interpret(self, stmts, globals_env=None):
         """Executes every AST node representing a statement.
-        During execution, expressions contained in statements are evaluated."""
-        try:
+        During execution, expressions contained in statements are evaluated.
+        If globals_env is given, it holds the globals instead of the instance's own."""
+        if globals_env is not None:
+            own_globals = self.globals
+            self.globals = self.environment = globals_env
+            try:
+                return self.interpret(stmts)
+            finally:
+                self.globals = self.environment = own_globals
+
+        with self.output:
             for stmt in stmts:
                 self.execute(stmt)
-        except Exception as e:
-            self.validate_keyword_location(stmt, e)
 
     def execute(self, stmt):
         """Executes statements. Statements could include expressions. As a result,
         the visitors could themselves call self.evaluate() to evaluate expressions
-        contained in the statements."""
+        contained in the statements.
+        Returns a Completion if the statement breaks or returns, None otherwise."""
         return stmt.accept(self)
 
     def evaluate(self, expr):
@@ -38,26 +65,28 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
         return expr.accept(self)
 
     def visit_while_stmt(self, while_stmt):
-        """Executes AST nodes for while statements. Also handles desugared for statements (if any)."""
-        try:
-            is_for_stmt = isinstance(while_stmt.condition, list) and isinstance(
-                while_stmt.body, list
-            )
-            if is_for_stmt:
-                # for statements are syntactic sugar for while statements.
-                # so the while_stmt visitor can handle both for and while loops.
-                # this branch desugars for statements.
-                self.execute(while_stmt.condition[0])
-                while self.is_truthy(self.evaluate(while_stmt.condition[1])):
-                    for stmt in while_stmt.body:
-                        self.execute(stmt)
-
-            else:
-                while self.is_truthy(self.evaluate(while_stmt.condition)):
-                    self.execute(while_stmt.body)
-        except Exception:
-            # using exceptions to catch breaks
-            pass  # what happens if i use raise?
+        """Executes AST nodes for while statements."""
+        while is_truthy(self.evaluate(while_stmt.condition)):
+            completion = self.execute(while_stmt.body)
+            if completion is not None:
+                # a break ends the loop. a return also ends the function running it.
+                return None if completion is Completion.BREAK else completion
+
+        return None
+
+    def visit_for_stmt(self, for_stmt):
+        """Executes AST nodes for for statements."""
+        if for_stmt.initializer is not None:
+            self.execute(for_stmt.initializer)
+
+        update = for_stmt.update
+        while is_truthy(self.evaluate(for_stmt.condition)):
+            completion = self.execute(for_stmt.body)
+            if completion is not None:
+                return None if completion is Completion.BREAK else completion
+
+            if update is not None:
+                self.evaluate(update)
 
         return None
 
@@ -67,56 +96,70 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
         then_branch = if_stmt.then_branch
         else_branch = if_stmt.else_branch
 
-        if self.is_truthy(condition):
-            self.execute(then_branch)
+        if is_truthy(condition):
+            return self.execute(then_branch)
 
         else:
             else_branch_exists = else_branch is not None
             if else_branch_exists:
-                self.execute(else_branch)
+                return self.execute(else_branch)
 
         return None
 
     def visit_print_stmt(self, print_stmt):
         """Executes AST nodes for print statements."""
         value = self.evaluate(print_stmt.expression)
-        print(value)
+        self.output.write_line(to_printable(value))
         return None
 
     def visit_return_stmt(self, return_stmt):
         """Executes AST nodes for return statements."""
         value = return_stmt.expression
-        if value is not None:
+        if return_stmt.is_tail_call and self.eliminates_tail_calls:
+            callee, arguments = self.evaluate_call(value)
+            if type(callee) is Function:
+                # the calling Function.call makes the call once this one's frames are gone.
+                self.tail_call = (callee, arguments)
+                return Completion.TAIL_CALL
+
+            value = callee.call(arguments, self)
+        elif value is not None:
             value = self.evaluate(return_stmt.expression)
 
-        # caught during function call wherein we grab the value and return that.
-        raise Return(value)
+        # read by the function call, once the completion reaches it.
+        self.return_value = value
+        return Completion.RETURN
 
     def visit_break_stmt(self, break_stmt):
-        raise Break(break_stmt.keyword)
+        return Completion.BREAK
 
     def visit_block(self, block):
         """Executes AST nodes for statements contained within blocks."""
-        self.execute_block(block.statements, Environment(Interpreter.environment))
-        return None
+        return self.execute_block(
+            block.statements, Environment(self.environment, block.num_slots)
+        )
 
     def execute_block(self, statements, enclosing):
         """Executes all statements that are within a block.
-        Each new block has its own environment which itself has its own enclosing."""
-        preceding_environment = enclosing  # Save environment containing the block. Will be restored after the block
+        Each new block has its own environment which itself has its own enclosing.
+        Stops at the first statement that breaks or returns and passes its Completion on.
+        """
+        # Save environment containing the block. Will be restored after the block
+        preceding_environment = self.environment
 
         try:
             # statements in a block are executed in a new environment which itself has an enclosing environment.
-            Interpreter.environment = enclosing
+            self.environment = enclosing
             for stmt in statements:
-                self.execute(stmt)
+                completion = self.execute(stmt)
+                if completion is not None:
+                    return completion
 
-        except Exception:
-            raise
+            return None
 
         finally:
             # discard environment upon exiting the owning block.
-            Interpreter.environment = preceding_environment
+            self.environment = preceding_environment
 
     def visit_variable_stmt(self, variable_stmt):
         """Executes AST nodes for variable statements/declarations."""
@@ -128,13 +171,19 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
             else variable_stmt.initializer
         )
 
-        Interpreter.environment.define(identifier, initializer)
+        if variable_stmt.slot is None:
+            self.globals.define(identifier, initializer)
+            if self.memoizer is not None:
+                self.memoizer.global_changed(identifier)
+        else:
+            self.environment.define_at(variable_stmt.slot, initializer)
+
         return None
 
     def visit_function_stmt(self, function_stmt):
         """Executes AST nodes for function statements i.e. declarations."""
-        name = function_stmt.declaration.get("name")
-        num_params = len(function_stmt.declaration.get("params"))
+        name = function_stmt.name
+        num_params = len(function_stmt.params)
         max_params = Function.MAX_PARAMS
         if num_params > max_params:
             raise ValueError(
@@ -143,8 +192,24 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
                 )
             )
 
-        function = Function(function_stmt.declaration, Interpreter.environment)
-        Interpreter.environment.define(name, function)
+        # memoizing a function would turn its tail calls into nested ones.
+        is_memoized = (
+            self.memoizer is not None
+            and function_stmt.is_pure
+            and not function_stmt.makes_tail_calls
+        )
+        if is_memoized:
+            function = MemoizedFunction(function_stmt, self.environment, self.memoizer)
+        else:
+            function = self.function_class(function_stmt, self.environment)
+
+        if function_stmt.slot is None:
+            self.globals.define(name, function)
+            if self.memoizer is not None:
+                self.memoizer.global_changed(name)
+        else:
+            self.environment.define_at(function_stmt.slot, function)
+
         return None
 
     def visit_expression_stmt(self, expression_stmt):
@@ -156,14 +221,21 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
         """Executes AST nodes for ternary expressions."""
         first = self.evaluate(ternary_expr.first)
 
-        if self.is_truthy(first):
+        if is_truthy(first):
             return self.evaluate(ternary_expr.second)
 
         return self.evaluate(ternary_expr.third)
 
     def visit_assignment_expr(self, assignment_expr):
         name, value = assignment_expr.name, self.evaluate(assignment_expr.value)
-        Interpreter.environment.assign(name, value)
+        if assignment_expr.depth is None:
+            self.globals.assign(name, value)
+            if self.memoizer is not None:
+                self.memoizer.global_changed(name)
+        else:
+            self.environment.assign_at(
+                assignment_expr.depth, assignment_expr.slot, value
+            )
 
         # return value instead of None.
         # This guarantees that for multiple assignment: a = b = 1, all identifiers get value rather than None.
@@ -174,101 +246,58 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
         """Evaluates AST nodes for variable expressions.
         Applies to declared identifiers/names used in expressions: variable names, function names
         """
-        return Interpreter.environment.get(variable_expr.name)
+        if variable_expr.depth is None:
+            return self.globals.get(variable_expr.name)
+
+        return self.environment.get_at(
+            variable_expr.depth, variable_expr.slot, variable_expr.name
+        )
 
     def visit_logical_expr(self, logical_expr):
         """Evaluates AST nodes for logical expressions."""
-        left = self.evaluate(logical_expr.left)
-        right = logical_expr.right
-        operator = logical_expr.operator.type
+        handler = logical_expr.handler
+        if handler is None:
+            # resolved once per node, on its first evaluation.
+            handler = logical_expr.handler = LOGICAL_OPERATORS[
+                logical_expr.operator.type
+            ]
 
-        if operator == TokenType.OR.name:
-            if self.is_truthy(left):
-                return left
-            else:
-                right = self.evaluate(right)
-                if self.is_truthy(right):
-                    return right
+        return handler(self, logical_expr)
 
-            return False
+    def evaluate_or(self, logical_expr):
+        left = self.evaluate(logical_expr.left)
+        if is_truthy(left):
+            return left
 
-        if operator == TokenType.AND.name:
-            if not self.is_truthy(left):
-                return False
+        right = self.evaluate(logical_expr.right)
+        if is_truthy(right):
+            return right
 
-            right = self.evaluate(right)
-            if self.is_truthy(right):
-                return left
+        return False
 
+    def evaluate_and(self, logical_expr):
+        left = self.evaluate(logical_expr.left)
+        if not is_truthy(left):
             return False
 
-    def visit_binary_expr(self, binary_expr):
-        """Evaluates AST nodes for binary expressions."""
-        left = self.evaluate(binary_expr.left)
-        right = self.evaluate(binary_expr.right)
-        operator = binary_expr.operator.type
-        line_no = binary_expr.operator.line_no
-
-        if operator == TokenType.PIPE.name:
-            self.check_operands(line_no, left, right)
-            return int(left) | int(right)  # bitwise operators work on integers only.
-
-        if operator == TokenType.AMPERSAND.name:
-            self.check_operands(line_no, left, right)
-            return int(left) & int(right)  # bitwise operators work on integers only.
-
-        if operator == TokenType.PLUS.name:
-            if self.either_float_or_str(left, right):
-                left, right = self.cast_to_int(left), self.cast_to_int(right)
-                return str(left) + str(right)
-
-            else:
-                if self.both_float_or_str(line_no, left, right):
-                    return left + right
-
-        if operator == TokenType.MINUS.name:
-            self.check_operands(line_no, left, right)
-            return left - right
-
-        if operator == TokenType.SLASH.name:
-            self.check_operands(line_no, left, right)
-            self.check_zero_div(line_no, right)
-            return left / right
-
-        if operator == TokenType.STAR.name:
-            self.check_operands(line_no, left, right)
-            return left * right
-
-        if operator == TokenType.PERCENT.name:
-            self.check_operands(line_no, left, right)
-            return left % right
+        right = self.evaluate(logical_expr.right)
+        if is_truthy(right):
+            return left
 
-        if operator == TokenType.BANG_EQUAL.name:
-            self.check_operands(line_no, left, right)
-            return not self.is_equal(left, right)
+        return False
 
-        if operator == TokenType.EQUAL_EQUAL.name:
-            self.check_operands(line_no, left, right)
-            return self.is_equal(left, right)
-
-        if operator == TokenType.GREATER_THAN.name:
-            if self.both_float_or_str(line_no, left, right):
-                return left > right
-
-        if operator == TokenType.GREATER_THAN_EQUAL.name:
-            if self.both_float_or_str(line_no, left, right):
-                return left >= right
-
-        if operator == TokenType.LESS_THAN.name:
-            if self.both_float_or_str(line_no, left, right):
-                return left < right
-
-        if operator == TokenType.LESS_THAN_EQUAL.name:
-            if self.both_float_or_str(line_no, left, right):
-                return left <= right
-
-        if operator == TokenType.CARET.name:
-            return pow(left, right)
+    def visit_binary_expr(self, binary_expr):
+        """Evaluates AST nodes for binary expressions."""
+        handler = binary_expr.handler
+        if handler is None:
+            # resolved once per node, on its first evaluation.
+            handler = binary_expr.handler = BINARY_OPERATORS[binary_expr.operator.type]
+
+        return handler(
+            self.evaluate(binary_expr.left),
+            self.evaluate(binary_expr.right),
+            binary_expr.operator.line_no,
+        )
 
     def visit_group_expr(self, group_expr):
         """Evaluates AST nodes for group expressions."""
@@ -280,123 +309,47 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
 
     def visit_unary_expr(self, unary_expr):
         """Evaluates AST nodes for unary expressions."""
-        right = self.evaluate(unary_expr.right)
-        operator = unary_expr.operator.type
+        handler = unary_expr.handler
+        if handler is None:
+            # resolved once per node, on its first evaluation.
+            handler = unary_expr.handler = UNARY_OPERATORS[unary_expr.operator.type]
 
-        if operator == TokenType.BANG.name:
-            return not self.is_truthy(right)
-
-        if operator == TokenType.MINUS.name:
-            self.check_operands(right)
-            return -right
+        return handler(self.evaluate(unary_expr.right), unary_expr.operator.line_no)
 
     def visit_call_expr(self, call_expr):
         """Evaluates AST nodes for function call expressions."""
+        callee, arguments = self.evaluate_call(call_expr)
+
+        # we need some methods from the interpreter object in the function.
+        # we pass the interpreter as the first argument via self for this reason.
+        return callee.call(arguments, self)
+
+    def evaluate_call(self, call_expr):
+        """Evaluates the callee and arguments of a call and checks they can be called.
+        Each Call node caches the callee it checked last. The arity of a callable never
+        changes, so calling the same object again skips the checks. Rebinding the callee's
+        name to another object is a cache miss, which checks and caches the new one."""
         callee = self.evaluate(call_expr.callee)
+        evaluate = self.evaluate
+        if callee is call_expr.cached_callee and callee is not None:
+            return callee, [evaluate(argument) for argument in call_expr.arguments]
+
         is_callable = isinstance(callee, Callable)
         if not is_callable:
-            raise TypeError("Can't call object of type {}".format(type(callee)))
-
-        arguments = []
-        for argument in call_expr.arguments:
-            arguments.append(self.evaluate(argument))
+            raise TypeError("Can't call object of type {}".format(plox_type(callee)))
 
+        arguments = [evaluate(argument) for argument in call_expr.arguments]
         arity_pass = callee.arity() == len(arguments)
         if not arity_pass:
             raise ValueError(
                 "Parameters declared do not match arguments passed in {}".format(callee)
             )
 
-        # we need some methods from the interpreter object in the function.
-        # we pass the interpreter as the first argument via self for this reason.
-        return callee.call(arguments, self)
-
-    def check_operands(self, line_no, *operands):
-        """Checks the type of operand. Operands' types must be valid for the operator type."""
-        num_operands = len(operands)
-        is_binary = num_operands == 2
-        is_unary = num_operands == 1
-
-        if is_binary:
-            left, right = operands[0], operands[1]
-            both_floats = isinstance(left, float) and isinstance(right, float)
-            if not both_floats:
-                raise TypeError(
-                    "[Error on L{}]: Operands must be float".format(line_no)
-                )
-
-        if is_unary:
-            right = operands[0]
-            is_float = isinstance(right, float)
-            if not is_float:
-                raise TypeError(
-                    "[Error on L{}]: Operand must be float.".format(line_no)
-                )
-
-    def both_float_or_str(self, line_no, *operands):
-        """Checks that both operands are both float or both str."""
-        left, right = operands[0], operands[1]
-        both_floats = isinstance(left, float) and isinstance(right, float)
-        both_strings = isinstance(left, str) and isinstance(right, str)
-        same_type = both_floats or both_strings
-
-        if not same_type:
-            raise TypeError(
-                [
-                    "[Error on L{}]: Operands must be both float or both str.".format(
-                        line_no
-                    )
-                ]
-            )
-
-        return True
-
-    def either_float_or_str(self, *operands):
-        """Checks that 1 operand is float and the other str or vice versa."""
-        left, right = operands[0], operands[1]
-
-        return (isinstance(left, float) and isinstance(right, str)) or (
-            isinstance(left, str) and isinstance(right, float)
-        )
+        call_expr.cached_callee = callee
+        return callee, arguments
 
-    def cast_to_int(self, operand):
-        """Python converts str(<int>.0) to "<int>.0". This method drops the fractional part."""
-        if isinstance(operand, float) and operand % 1 == 0:
-            return int(operand)
-
-        return operand
-
-    def check_zero_div(self, line_no, right):
-        if right == 0:
-            raise ValueError("[Error on L{}]: Can't divide by zero".format(line_no))
-
-    def is_truthy(self, operand):
-        if operand == 0 or operand is None:
-            return False
-
-        if isinstance(operand, bool):
-            return operand
-
-        return True
-
-    def is_equal(self, left, right):
-        if left is None and right is None:
-            return True
-
-        if left is None:
-            return False
 
-        return left == right
-
-    def validate_keyword_location(self, stmt, exception):
-        keyword_exists = exception.keyword is not None
-        if keyword_exists:
-            if exception.keyword.lexeme == "break":
-                if isinstance(stmt, WhileStatement):
-                    pass
-                else:
-                    raise SyntaxError(
-                        "[Error on L{}]: Can't use break outside loop.".format(
-                            exception.keyword.line_no
-                        )
-                    )
+LOGICAL_OPERATORS = {
+    TokenType.OR: Interpreter.evaluate_or,
+    TokenType.AND: Interpreter.evaluate_and,
+}
@@ -0,0 +1,100 @@
+import math
+from collections import OrderedDict
+
+import _environment
+from _function import Function
+from _rope import Rope
+
+
+def memo_key(arguments):
+    """Returns the cache key of a call's arguments. Values python considers equal but plox
+    doesn't (true and 1, 0 and -0) get different keys."""
+    key = []
+    for argument in arguments:
+        if type(argument) is float and argument == 0.0:
+            argument = (argument, math.copysign(1.0, argument))
+        elif type(argument) is Rope:
+            argument = str(argument)
+
+        key.append((type(argument), argument))
+
+    return tuple(key)
+
+
+class Memoizer:
+    """Holds the cache size shared by every MemoizedFunction and their hits and misses.
+    Pure functions are only pure within the run that analyzed them: globals persist, so a
+    later run may declare or assign the globals they read. The Interpreter reports writes to
+    globals, and those to a name some MemoizedFunction reads clear every cache."""
+
+    def __init__(self, size):
+        self.size = size
+        self.stats = {}  # (name, line_no) -> [hits, misses]
+        self.watched = set()  # free names of every MemoizedFunction created.
+        # bumped whenever a watched global changes. caches older than it are stale.
+        self.generation = 0
+
+    def global_changed(self, name):
+        if name in self.watched:
+            self.generation += 1
+
+    def stats_for(self, function):
+        key = (function.name, function.line_no)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = [0, 0]
+
+        return stats
+
+    def report(self, stream):
+        """Writes the hits and misses of every memoized function, most called first."""
+        stream.write(
+            "{:<24} {:>6} {:>10} {:>10} {:>8}\n".format(
+                "function", "line", "hits", "misses", "hit %"
+            )
+        )
+        ranked = sorted(self.stats.items(), key=lambda item: sum(item[1]), reverse=True)
+        for (name, line_no), (hits, misses) in ranked:
+            stream.write(
+                "{:<24} {:>6} {:>10} {:>10} {:>8.1f}\n".format(
+                    name, line_no, hits, misses, hits / ((hits + misses) or 1) * 100
+                )
+            )
+
+
+class MemoizedFunction(Function):
+    """Plox function whose results are cached, keyed on its arguments. Only created for
+    functions the PurityAnalyzer found pure. The least recently used result is evicted
+    once the cache holds more than memoizer.size of them."""
+
+    def __init__(self, declaration, closure, memoizer):
+        super().__init__(declaration, closure)
+        self.cache = OrderedDict()
+        self.size = memoizer.size
+        self.stats = memoizer.stats_for(self)
+        self.memoizer = memoizer
+        memoizer.watched.update(declaration.free_names)
+        self.generation = memoizer.generation
+
+    def call(self, arguments, interpreter):
+        key = memo_key(arguments)
+        cache = self.cache
+        if self.generation != self.memoizer.generation:
+            cache.clear()
+            self.generation = self.memoizer.generation
+
+        if key in cache:
+            self.stats[0] += 1
+            cache.move_to_end(key)
+            return cache[key]
+
+        self.stats[1] += 1
+        warnings_reported = _environment.warnings_reported()
+        value = Function.call(self, arguments, interpreter)
+        # calls that print a warning (e.g. reading a nil argument) must print it every time.
+        if _environment.warnings_reported() == warnings_reported:
+            cache[key] = value
+            if len(cache) > self.size:
+                cache.popitem(last=False)
+
+        return value
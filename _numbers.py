@@ -0,0 +1,28 @@
+"""
+Representation of plox numbers. Numbers are python floats, except whole numbers that floats
+hold exactly, which are python ints. Arithmetic on ints skips float conversions and
+formatting, and falls back to floats wherever the results would differ.
+"""
+
+# every integer up to this magnitude is exactly representable as a float.
+MAX_EXACT_INT = 2**53
+
+
+def number_literal(lexeme):
+    """Returns the value of a number literal: an int if it's a whole number a float holds
+    exactly, the float it denotes otherwise."""
+    value = float(lexeme)
+    if value.is_integer() and -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+        return int(value)
+
+    return value
+
+
+class Bits(int):
+    """Result of a bitwise operator. Printed as an integer and, unlike a number, rejected
+    by every operator that checks its operands."""
+
+    __slots__ = ()
+
+    def __neg__(self):
+        return Bits(-int(self))
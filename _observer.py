@@ -0,0 +1,78 @@
+from _function import Function
+from _interpreter import Interpreter
+
+
+class Observer:
+    """Base class for objects notified of execution events by an ObservedInterpreter.
+    Subclasses override the events they need. The others do nothing."""
+
+    def statement_executed(self, stmt, completion):
+        """Called after a statement runs. completion is the Completion it returned, if any."""
+
+    def expression_evaluated(self, expr, value):
+        """Called after an expression is evaluated, with the value it evaluated to."""
+
+    def function_entered(self, function, arguments):
+        """Called when a plox function is called, before its body runs."""
+
+    def function_exited(self, function, value):
+        """Called when a plox function returns, with the value it returns.
+        Not called if the call raises."""
+
+    def environment_created(self, environment):
+        """Called when a block or a function call creates an environment."""
+
+
+class ObservedFunction(Function):
+    """Plox function that notifies the interpreter's observers when it's entered and exited."""
+
+    def call(self, arguments, interpreter):
+        for observer in interpreter.observers:
+            observer.function_entered(self, arguments)
+
+        value = Function.call(self, arguments, interpreter)
+        for observer in interpreter.observers:
+            observer.function_exited(self, value)
+
+        return value
+
+
+class ObservedInterpreter(Interpreter):
+    """Interpreter that notifies observers of every statement, expression, function call
+    and environment. Interpreter itself has no hooks, so running without observers costs nothing.
+    """
+
+    function_class = ObservedFunction
+    # every call is entered, exited and evaluated like any other.
+    eliminates_tail_calls = False
+
+    def __init__(self, observers=(), output=None):
+        super().__init__(output=output)
+        self.observers = list(observers)
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def execute(self, stmt):
+        completion = stmt.accept(self)
+        for observer in self.observers:
+            observer.statement_executed(stmt, completion)
+
+        return completion
+
+    def evaluate(self, expr):
+        value = expr.accept(self)
+        for observer in self.observers:
+            observer.expression_evaluated(expr, value)
+
+        return value
+
+    def execute_block(self, statements, enclosing):
+        # blocks and function calls both run in the environment they pass in.
+        for observer in self.observers:
+            observer.environment_created(enclosing)
+
+        return super().execute_block(statements, enclosing)
@@ -0,0 +1,44 @@
+from enum import Enum
+from enum import unique
+
+
+@unique
+class OpCode(Enum):
+    """Instructions understood by the VM. Operands follow their opcode in the flat code list."""
+
+    CONSTANT = 0  # const_idx
+    POP = 1
+    GET_GLOBAL = 2  # name_idx
+    SET_GLOBAL = 3  # name_idx
+    DEFINE_GLOBAL = 4  # name_idx
+    GET_LOCAL = 5  # depth slot name_idx
+    SET_LOCAL = 6  # depth slot
+    DEFINE_LOCAL = 7  # slot
+    ADD = 8  # line_no (for every binary operator)
+    SUBTRACT = 9
+    MULTIPLY = 10
+    DIVIDE = 11
+    MODULO = 12
+    POWER = 13
+    BITWISE_OR = 14
+    BITWISE_AND = 15
+    EQUAL = 16
+    NOT_EQUAL = 17
+    GREATER_THAN = 18
+    GREATER_THAN_EQUAL = 19
+    LESS_THAN = 20
+    LESS_THAN_EQUAL = 21
+    NOT = 22  # line_no (for every unary operator)
+    NEGATE = 23
+    JUMP = 24  # target
+    JUMP_IF_FALSE = 25  # target. pops the condition.
+    JUMP_IF_TRUE_OR_POP = 26  # target. logical or.
+    JUMP_IF_FALSE_OR_FALSE = 27  # target. logical and.
+    FALSE_IF_FALSY = 28  # logical or: the right operand becomes False unless truthy.
+    AND_RESULT = 29  # logical and: pops the right operand, keeps the left unless falsy.
+    PRINT = 30
+    PUSH_ENV = 31  # num_slots
+    POP_ENV = 32
+    MAKE_FUNCTION = 33  # const_idx
+    CALL = 34  # num_args
+    RETURN = 35
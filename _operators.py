@@ -0,0 +1,279 @@
+"""
+Runtime semantics of plox's operators, shared by every execution engine.
+Binary operators take (left, right, line_no). Unary operators take (right, line_no).
+Numbers are floats or ints (see _numbers). Operators whose int results could differ from
+the float ones (beyond MAX_EXACT_INT, or a negative zero) compute them as floats.
+"""
+
+from _numbers import Bits
+from _numbers import MAX_EXACT_INT
+from _rope import Rope
+from _rope import concat
+from _rope import STRINGS
+from _tokens._token_type import TokenType
+
+
+def is_number(operand):
+    # bools and Bits are ints too, but aren't numbers.
+    return type(operand) is float or type(operand) is int
+
+
+def check_operands(line_no, *operands):
+    """Checks the type of operand. Operands' types must be valid for the operator type."""
+    num_operands = len(operands)
+    is_binary = num_operands == 2
+    is_unary = num_operands == 1
+
+    if is_binary:
+        left, right = operands[0], operands[1]
+        both_numbers = is_number(left) and is_number(right)
+        if not both_numbers:
+            raise TypeError("[Error on L{}]: Operands must be float".format(line_no))
+
+    if is_unary:
+        right = operands[0]
+        if not is_number(right):
+            raise TypeError("[Error on L{}]: Operand must be float.".format(line_no))
+
+
+def both_float_or_str(line_no, *operands):
+    """Checks that both operands are both float or both str."""
+    left, right = operands[0], operands[1]
+    both_numbers = is_number(left) and is_number(right)
+    both_strings = isinstance(left, STRINGS) and isinstance(right, STRINGS)
+    same_type = both_numbers or both_strings
+
+    if not same_type:
+        raise TypeError(
+            ["[Error on L{}]: Operands must be both float or both str.".format(line_no)]
+        )
+
+    return True
+
+
+def either_float_or_str(*operands):
+    """Checks that 1 operand is float and the other str or vice versa."""
+    left, right = operands[0], operands[1]
+
+    return (is_number(left) and isinstance(right, STRINGS)) or (
+        isinstance(left, STRINGS) and is_number(right)
+    )
+
+
+def cast_to_int(operand):
+    """Python converts str(<int>.0) to "<int>.0". This method drops the fractional part."""
+    if isinstance(operand, float) and operand % 1 == 0:
+        return int(operand)
+
+    return operand
+
+
+def to_printable(operand):
+    """Returns what print shows for operand. Whole numbers print as floats, e.g. 3.0."""
+    return float(operand) if type(operand) is int else operand
+
+
+# the type reported in errors about plox values, where it differs from the python one.
+PLOX_TYPES = {int: float, Bits: int, Rope: str}
+
+
+def plox_type(operand):
+    """The type reported in errors about operand: ints are floats and Ropes are strs."""
+    return PLOX_TYPES.get(type(operand), type(operand))
+
+
+def check_zero_div(line_no, right):
+    if right == 0:
+        raise ValueError("[Error on L{}]: Can't divide by zero".format(line_no))
+
+
+def is_truthy(operand):
+    if operand == 0 or operand is None:
+        return False
+
+    if isinstance(operand, bool):
+        return operand
+
+    return True
+
+
+def is_equal(left, right):
+    if left is None and right is None:
+        return True
+
+    if left is None:
+        return False
+
+    return left == right
+
+
+def bitwise_or(left, right, line_no):
+    check_operands(line_no, left, right)
+    return Bits(int(left) | int(right))  # bitwise operators work on integers only.
+
+
+def bitwise_and(left, right, line_no):
+    check_operands(line_no, left, right)
+    return Bits(int(left) & int(right))  # bitwise operators work on integers only.
+
+
+def add(left, right, line_no):
+    """Adds numbers and concatenates strings. Long strings are concatenated into Ropes."""
+    if type(left) is int and type(right) is int:
+        value = left + right
+        if -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+            return value
+
+        return float(left) + float(right)
+
+    if either_float_or_str(left, right):
+        left = left if isinstance(left, STRINGS) else str(cast_to_int(left))
+        right = right if isinstance(right, STRINGS) else str(cast_to_int(right))
+        return concat(left, right)
+
+    if both_float_or_str(line_no, left, right):
+        if is_number(left):
+            return left + right
+
+        return concat(left, right)
+
+
+def subtract(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        value = left - right
+        if -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+            return value
+
+        return float(left) - float(right)
+
+    check_operands(line_no, left, right)
+    return left - right
+
+
+def divide(left, right, line_no):
+    check_operands(line_no, left, right)
+    check_zero_div(line_no, right)
+    return left / right
+
+
+def multiply(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        value = left * right
+        if value == 0:
+            # a float product of zero is negative when exactly one operand is.
+            return -0.0 if (left < 0) != (right < 0) else 0
+
+        if -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+            return value
+
+        return float(left) * float(right)
+
+    check_operands(line_no, left, right)
+    return left * right
+
+
+def modulo(left, right, line_no):
+    if type(left) is int and type(right) is int and right != 0:
+        value = left % right
+        # a float remainder of zero has the divisor's sign.
+        return -0.0 if value == 0 and right < 0 else value
+
+    check_operands(line_no, left, right)
+    if type(left) is int and type(right) is int:
+        return float(left) % float(right)  # raises the float modulo by zero error.
+
+    return left % right
+
+
+def not_equal(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        return left != right
+
+    check_operands(line_no, left, right)
+    return not is_equal(left, right)
+
+
+def equal(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        return left == right
+
+    check_operands(line_no, left, right)
+    return is_equal(left, right)
+
+
+def greater_than(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        return left > right
+
+    if both_float_or_str(line_no, left, right):
+        return left > right
+
+
+def greater_than_equal(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        return left >= right
+
+    if both_float_or_str(line_no, left, right):
+        return left >= right
+
+
+def less_than(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        return left < right
+
+    if both_float_or_str(line_no, left, right):
+        return left < right
+
+
+def less_than_equal(left, right, line_no):
+    if type(left) is int and type(right) is int:
+        return left <= right
+
+    if both_float_or_str(line_no, left, right):
+        return left <= right
+
+
+def power(left, right, line_no):
+    # powers of numbers are always computed as floats.
+    left = float(left) if type(left) is int else left
+    right = float(right) if type(right) is int else right
+    value = pow(left, right)
+    return Bits(value) if type(value) is int else value  # a power of Bits.
+
+
+def negate(right, line_no):
+    # unlike the other arithmetic operators, unary minus doesn't check its operand.
+    if type(right) is int:
+        return -right if right != 0 else -0.0
+
+    if type(right) is bool:
+        return Bits(-right)  # like the result of a bitwise operator, not a number.
+
+    return -right
+
+
+def logical_not(right, line_no):
+    return not is_truthy(right)
+
+
+BINARY_OPERATORS = {
+    TokenType.PIPE: bitwise_or,
+    TokenType.AMPERSAND: bitwise_and,
+    TokenType.PLUS: add,
+    TokenType.MINUS: subtract,
+    TokenType.SLASH: divide,
+    TokenType.STAR: multiply,
+    TokenType.PERCENT: modulo,
+    TokenType.BANG_EQUAL: not_equal,
+    TokenType.EQUAL_EQUAL: equal,
+    TokenType.GREATER_THAN: greater_than,
+    TokenType.GREATER_THAN_EQUAL: greater_than_equal,
+    TokenType.LESS_THAN: less_than,
+    TokenType.LESS_THAN_EQUAL: less_than_equal,
+    TokenType.CARET: power,
+}
+
+UNARY_OPERATORS = {
+    TokenType.BANG: logical_not,
+    TokenType.MINUS: negate,
+}
@@ -0,0 +1,304 @@
+from collections import Counter
+
+from _asts._expressions.literal_expr import Literal
+from _asts._statements.block import Block
+from _asts._statements.break_stmt import BreakStatement
+from _asts._statements.fun_stmt import FunctionStatement
+from _asts._statements.return_stmt import ReturnStatement
+from _asts._statements.var_stmt import VariableStatement
+from _operators import BINARY_OPERATORS
+from _operators import UNARY_OPERATORS
+from _operators import is_truthy
+from _rope import Rope
+from _tokens._token_type import TokenType
+from _visitors._expressions.expr_visitor import ExpressionVisitor
+from _visitors._statements.stmt_visitor import StatementVisitor
+
+
+class Optimizer(ExpressionVisitor, StatementVisitor):
+    """Rewrites AST nodes before they are resolved and executed.
+    Level 1 folds constant expressions, drops branches and loops whose condition is a literal
+    and drops statements that follow a return or break, except for their declarations.
+    Level 2 also propagates literals assigned to locals that are declared once and never reassigned.
+
+    Expression visitors return the (possibly new) expression. Statement visitors return the
+    (possibly new) statement, or None if the statement can be dropped. Operations that fail
+    on constant operands are left in place so they fail at runtime exactly like before.
+    """
+
+    def __init__(self, level=1):
+        self.level = level
+        self.propagate = False
+        # per local scope: name -> literal value it always holds, or None.
+        self.scopes = []
+        self.declaration_counts = Counter()
+        self.assigned_names = set()
+
+    def optimize(self, stmts):
+        """Optimizes every AST node representing a statement. Returns the new list of statements."""
+        stmts = self.optimize_stmts(stmts, is_top_level=True)
+
+        if self.level >= 2:
+            # the first pass counted declarations and assignments. the second one uses them.
+            self.propagate = True
+            stmts = self.optimize_stmts(stmts, is_top_level=True)
+
+        return stmts
+
+    def optimize_stmts(self, stmts, is_top_level=False):
+        optimized = []
+        is_reachable = True
+        for stmt in stmts:
+            if not is_reachable:
+                declaration = self.unreachable_declaration(stmt)
+                if declaration is not None:
+                    optimized.append(declaration)
+                continue
+
+            if stmt is None:
+                # the parser emits None for statements it failed to parse. the interpreter reports those.
+                optimized.append(stmt)
+                continue
+
+            stmt = stmt.accept(self)
+            if stmt is None:
+                continue
+
+            optimized.append(stmt)
+            is_exit = isinstance(stmt, (ReturnStatement, BreakStatement))
+            if is_exit and not is_top_level:
+                is_reachable = False  # everything after it in the same block is.
+
+        return optimized
+
+    def unreachable_declaration(self, stmt):
+        """Returns what's left of a statement that follows a return or break: only its
+        declaration, without the work. Functions declared earlier in the block are resolved
+        after it, so their reads of the name must still find the (uninitialized) local.
+        """
+        if isinstance(stmt, VariableStatement):
+            stmt.initializer = None
+            self.declare(stmt.identifier.lexeme)
+            return stmt
+
+        if isinstance(stmt, FunctionStatement):
+            stmt.body = []
+            self.declare(stmt.name)
+            return stmt
+
+        return None
+
+    def optimize_body(self, stmt):
+        """Optimizes a statement that must stay a statement, e.g. the body of a loop."""
+        if stmt is None:
+            return stmt
+
+        optimized = stmt.accept(self)
+        return Block([]) if optimized is None else optimized
+
+    def optimize_expr(self, expr):
+        return expr.accept(self)
+
+    def declare(self, name, value=None):
+        """Records a local declaration. value is the literal the local always holds, if any."""
+        if not self.propagate:
+            self.declaration_counts[name] += 1  # counted during the first pass only.
+
+        if self.scopes:
+            self.scopes[-1][name] = value
+
+    def is_constant(self, name, initializer):
+        return (
+            self.propagate
+            and len(self.scopes) > 0
+            and self.declaration_counts[name] == 1
+            and name not in self.assigned_names
+            and isinstance(initializer, Literal)
+            # reading an unset variable is reported at runtime, so nil is never propagated.
+            and initializer.value is not None
+        )
+
+    def visit_while_stmt(self, while_stmt):
+        while_stmt.condition = self.optimize_expr(while_stmt.condition)
+        condition = while_stmt.condition
+        if isinstance(condition, Literal) and not is_truthy(condition.value):
+            return None
+
+        while_stmt.body = self.optimize_body(while_stmt.body)
+        return while_stmt
+
+    def visit_for_stmt(self, for_stmt):
+        initializer = for_stmt.initializer
+        if initializer is not None:
+            initializer = initializer.accept(self)  # None if optimized away.
+
+        condition = self.optimize_expr(for_stmt.condition)
+        if isinstance(condition, Literal) and not is_truthy(condition.value):
+            # the loop never runs. only its initializer does.
+            return initializer
+
+        for_stmt.initializer, for_stmt.condition = initializer, condition
+        for_stmt.body = self.optimize_body(for_stmt.body)
+        if for_stmt.update is not None:
+            for_stmt.update = self.optimize_expr(for_stmt.update)
+        return for_stmt
+
+    def visit_if_stmt(self, if_stmt):
+        condition = self.optimize_expr(if_stmt.condition)
+        if isinstance(condition, Literal):
+            # only one branch can ever run.
+            branch = (
+                if_stmt.then_branch
+                if is_truthy(condition.value)
+                else if_stmt.else_branch
+            )
+            return None if branch is None else branch.accept(self)
+
+        if_stmt.condition = condition
+        if_stmt.then_branch = self.optimize_body(if_stmt.then_branch)
+        if_stmt.else_branch = self.optimize_body(if_stmt.else_branch)
+        return if_stmt
+
+    def visit_print_stmt(self, print_stmt):
+        print_stmt.expression = self.optimize_expr(print_stmt.expression)
+        return print_stmt
+
+    def visit_return_stmt(self, return_stmt):
+        if return_stmt.expression is not None:
+            return_stmt.expression = self.optimize_expr(return_stmt.expression)
+
+        return return_stmt
+
+    def visit_break_stmt(self, break_stmt):
+        return break_stmt
+
+    def visit_block(self, block):
+        self.scopes.append({})
+        block.statements = self.optimize_stmts(block.statements)
+        self.scopes.pop()
+        return block
+
+    def visit_variable_stmt(self, variable_stmt):
+        name = variable_stmt.identifier.lexeme
+        if variable_stmt.initializer is not None:
+            variable_stmt.initializer = self.optimize_expr(variable_stmt.initializer)
+
+        initializer = variable_stmt.initializer
+        value = initializer.value if self.is_constant(name, initializer) else None
+        self.declare(name, value)
+        return variable_stmt
+
+    def visit_function_stmt(self, function_stmt):
+        self.declare(function_stmt.name)
+
+        self.scopes.append({})
+        for param in function_stmt.params:
+            self.declare(param.name)
+
+        function_stmt.body = self.optimize_stmts(function_stmt.body)
+        self.scopes.pop()
+        return function_stmt
+
+    def visit_expression_stmt(self, expression_stmt):
+        expression_stmt.expression = self.optimize_expr(expression_stmt.expression)
+        if isinstance(expression_stmt.expression, Literal):
+            return None  # evaluating a literal has no effect.
+
+        return expression_stmt
+
+    def visit_ternary_expr(self, ternary_expr):
+        first = self.optimize_expr(ternary_expr.first)
+        if isinstance(first, Literal):
+            chosen = (
+                ternary_expr.second if is_truthy(first.value) else ternary_expr.third
+            )
+            return self.optimize_expr(chosen)
+
+        ternary_expr.first = first
+        ternary_expr.second = self.optimize_expr(ternary_expr.second)
+        ternary_expr.third = self.optimize_expr(ternary_expr.third)
+        return ternary_expr
+
+    def visit_assignment_expr(self, assignment_expr):
+        self.assigned_names.add(assignment_expr.name)
+        assignment_expr.value = self.optimize_expr(assignment_expr.value)
+        return assignment_expr
+
+    def visit_variable_expr(self, variable_expr):
+        for scope in reversed(self.scopes):
+            if variable_expr.name in scope:
+                value = scope[variable_expr.name]
+                return variable_expr if value is None else Literal(value)
+
+        return variable_expr
+
+    def visit_logical_expr(self, logical_expr):
+        left = self.optimize_expr(logical_expr.left)
+        right = self.optimize_expr(logical_expr.right)
+        logical_expr.left, logical_expr.right = left, right
+        if not isinstance(left, Literal):
+            return logical_expr
+
+        is_or = logical_expr.operator.type == TokenType.OR
+        if is_or and is_truthy(left.value):
+            return left
+
+        if not is_or and not is_truthy(left.value):
+            return Literal(False)
+
+        if not isinstance(right, Literal):
+            return logical_expr
+
+        if not is_truthy(right.value):
+            return Literal(False)
+
+        # a truthy right operand: or evaluates to it, and to the left one.
+        return right if is_or else left
+
+    def visit_binary_expr(self, binary_expr):
+        left = self.optimize_expr(binary_expr.left)
+        right = self.optimize_expr(binary_expr.right)
+        binary_expr.left, binary_expr.right = left, right
+        if not (isinstance(left, Literal) and isinstance(right, Literal)):
+            return binary_expr
+
+        operator = binary_expr.operator
+        try:
+            value = BINARY_OPERATORS[operator.type](
+                left.value, right.value, operator.line_no
+            )
+        except Exception:
+            return binary_expr  # fails again, and is reported, when executed.
+
+        if isinstance(value, Rope):
+            value = str(value)  # literals hold python values the engines can embed.
+
+        return Literal(value)
+
+    def visit_group_expr(self, group_expr):
+        # grouping only matters to the parser.
+        return self.optimize_expr(group_expr.expression)
+
+    def visit_literal_expr(self, literal_expr):
+        return literal_expr
+
+    def visit_unary_expr(self, unary_expr):
+        right = self.optimize_expr(unary_expr.right)
+        unary_expr.right = right
+        if not isinstance(right, Literal):
+            return unary_expr
+
+        operator = unary_expr.operator
+        try:
+            value = UNARY_OPERATORS[operator.type](right.value, operator.line_no)
+        except Exception:
+            return unary_expr  # fails again, and is reported, when executed.
+
+        return Literal(value)
+
+    def visit_call_expr(self, call_expr):
+        call_expr.callee = self.optimize_expr(call_expr.callee)
+        call_expr.arguments = [
+            self.optimize_expr(argument) for argument in call_expr.arguments
+        ]
+        return call_expr
@@ -0,0 +1,74 @@
+import io
+import sys
+import threading
+
+DEFAULT_BUFFER_SIZE = io.DEFAULT_BUFFER_SIZE
+# auto writes every line to terminals, like python's stdout, and buffers everything else.
+FLUSH_POLICIES = ["auto", "line", "full"]
+
+# the Outputs programs are running with, per thread, innermost last.
+_running = threading.local()
+
+
+def running_output():
+    """Returns the Output of the program running on this thread, or None."""
+    outputs = getattr(_running, "outputs", None)
+    return outputs[-1] if outputs else None
+
+
+class Output:
+    """Collects the lines printed by a plox program and writes them to a stream in batches.
+    stream is any object with write and flush methods, e.g. an open file or an io.StringIO.
+    By default it is sys.stdout, looked up on every write so redirecting it still works.
+    Lines are written once buffer_size characters are pending, after every line with the
+    line policy, and whenever the program stops running, including on errors. A program is
+    running inside the outermost with block using the Output, e.g. for the whole of Plox.run,
+    however many times the engine enters it again."""
+
+    def __init__(self, stream=None, buffer_size=DEFAULT_BUFFER_SIZE, flush="auto"):
+        if flush not in FLUSH_POLICIES:
+            raise ValueError("Unknown flush policy {}.".format(flush))
+
+        self.stream = stream
+        self.buffer_size = buffer_size
+        if flush == "auto":
+            target = self.target()
+            flush = "line" if hasattr(target, "isatty") and target.isatty() else "full"
+        self.flush_lines = flush == "line"
+        self.pending = []
+        self.pending_size = 0
+
+    def target(self):
+        return sys.stdout if self.stream is None else self.stream
+
+    def write_line(self, value):
+        """Prints value followed by a newline."""
+        text = str(value)
+        self.pending.append(text)
+        self.pending_size += len(text) + 1
+        if self.flush_lines or self.pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the pending lines to the stream and flushes it."""
+        target = self.target()
+        if self.pending:
+            self.pending.append("")
+            target.write("\n".join(self.pending))
+            self.pending = []
+            self.pending_size = 0
+
+        target.flush()
+
+    def __enter__(self):
+        """Marks the Output as the one programs running on this thread print warnings to."""
+        if not hasattr(_running, "outputs"):
+            _running.outputs = []
+
+        _running.outputs.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _running.outputs.pop()
+        if self not in _running.outputs:
+            self.flush()
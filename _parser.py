@@ -10,6 +10,7 @@ from _asts._expressions.variable_expr import Variable
 from _asts._statements.block import Block
 from _asts._statements.break_stmt import BreakStatement
 from _asts._statements.expr_stmt import ExpressionStatement
+from _asts._statements.for_stmt import ForStatement
 from _asts._statements.fun_stmt import FunctionStatement
 from _asts._statements.if_stmt import IfStatement
 from _asts._statements.print_stmt import PrintStatement
@@ -35,13 +36,22 @@ class Parser:
 
         return asts
 
+    def parse_iter(self):
+        """Creates AST nodes lazily, one top-level declaration at a time.
+        Expects a TokenStream: the tokens of each declaration are released once it's created.
+        """
+        while not self.at_end():
+            ast = self.declaration()
+            self.tokens.release(self.current)
+            yield ast
+
     def declaration(self):
         """Creates AST nodes for declarations and statements."""
         try:
-            if self.match(TokenType.VAR.name):
+            if self.match(TokenType.VAR):
                 return self.var_declaration()
 
-            if self.match(TokenType.FUN.name):
+            if self.match(TokenType.FUN):
                 return self.fun_declaration()
 
             return self.statement()
@@ -51,128 +61,117 @@ class Parser:
     def var_declaration(self):
         """Creates AST node for variable declarations/definitions."""
         identifier = self.consume(
-            TokenType.IDENTIFIER.name, "Missing variable name in variable statement."
+            TokenType.IDENTIFIER, "Missing variable name in variable statement."
         )
         initializer = None
-        if self.match(TokenType.EQUAL.name):
+        if self.match(TokenType.EQUAL):
             initializer = self.expression()
-        self.consume(TokenType.SEMI_COLON.name, "Missing ';' in variable statement.")
+        self.consume(TokenType.SEMI_COLON, "Missing ';' in variable statement.")
 
         return VariableStatement(identifier, initializer)
 
     def fun_declaration(self):
         name = self.consume(
-            TokenType.IDENTIFIER.name, "Missing function name in function declaration."
+            TokenType.IDENTIFIER, "Missing function name in function declaration."
         )
 
-        self.consume(
-            TokenType.LEFT_PAREN.name, "Missing opening '(' in function parameter."
-        )
+        self.consume(TokenType.LEFT_PAREN, "Missing opening '(' in function parameter.")
 
         params = []
 
-        if not self.match(TokenType.RIGHT_PAREN.name):
+        if not self.match(TokenType.RIGHT_PAREN):
             param = self.expression()
             params.append(param)
-            while self.match(TokenType.COMMA.name):
+            while self.match(TokenType.COMMA):
                 param = self.expression()
                 params.append(param)
 
             self.consume(
-                TokenType.RIGHT_PAREN.name, "Missing closing ')' in function parameter."
+                TokenType.RIGHT_PAREN, "Missing closing ')' in function parameter."
             )
 
-        self.consume(TokenType.LEFT_BRACE.name, "Missing opening '{' in function body.")
+        self.consume(TokenType.LEFT_BRACE, "Missing opening '{' in function body.")
         body = self.block()
 
-        declaration = {
-            "name": name.lexeme,
-            "params": params,
-            "body": body.statements,
-            "line_no": name.line_no,
-        }
-
-        return FunctionStatement(declaration)
+        return FunctionStatement(name.lexeme, params, body.statements, name.line_no)
 
     def statement(self):
-        """Creates AST nodes for all statement types: for, while, if, print, blocks, etc."""
-        if self.match(TokenType.FOR.name):
+        """Creates AST nodes for all statement types: for, while, if, print, blocks, etc.
+        Records the line each statement starts on."""
+        line_no = self.tokens[self.current].line_no
+        stmt = self.statement_node()
+        stmt.line_no = line_no
+        return stmt
+
+    def statement_node(self):
+        if self.match(TokenType.FOR):
             return self.for_statement()
 
-        if self.match(TokenType.WHILE.name):
+        if self.match(TokenType.WHILE):
             return self.while_statement()
 
-        if self.match(TokenType.IF.name):
+        if self.match(TokenType.IF):
             return self.if_statement()
 
-        if self.match(TokenType.PRINT.name):
+        if self.match(TokenType.PRINT):
             return self.print_statement()
 
-        if self.match(TokenType.RETURN.name):
+        if self.match(TokenType.RETURN):
             return self.return_statement()
 
-        if self.match(TokenType.BREAK.name):
+        if self.match(TokenType.BREAK):
             return self.break_statement()
 
-        if self.match(TokenType.LEFT_BRACE.name):
+        if self.match(TokenType.LEFT_BRACE):
             return self.block()
 
         return self.expression_statement()
 
     def for_statement(self):
-        """Desugars 'for statement' (which is syntactic sugar for a 'while statement') by converting
-        it to an AST node for a while statement."""
-        self.consume(TokenType.LEFT_PAREN.name, "Missing opening '(' in for statement.")
+        """Creates AST node for for statements."""
+        self.consume(TokenType.LEFT_PAREN, "Missing opening '(' in for statement.")
 
-        initializer = Literal(None)
+        initializer = None
         condition = Literal(True)  # means an infinite while loop
-        update = Literal(None)
+        update = None
 
-        if not self.match(TokenType.SEMI_COLON.name):
+        if not self.match(TokenType.SEMI_COLON):
             initializer = (
                 self.var_declaration()
-                if self.match(TokenType.VAR.name)
+                if self.match(TokenType.VAR)
                 else self.expression_statement()
             )
 
-        if not self.match(TokenType.SEMI_COLON.name):
+        if not self.match(TokenType.SEMI_COLON):
             condition = self.expression()
-            self.consume(TokenType.SEMI_COLON.name, "Missing ';' in for statement.")
+            self.consume(TokenType.SEMI_COLON, "Missing ';' in for statement.")
 
-        if not self.match(TokenType.RIGHT_PAREN.name):
+        if not self.match(TokenType.RIGHT_PAREN):
             update = self.expression()
-            self.consume(
-                TokenType.RIGHT_PAREN.name, "Missing closing ')' in for statement."
-            )
+            self.consume(TokenType.RIGHT_PAREN, "Missing closing ')' in for statement.")
 
         body = self.statement()
-        condition_list = [initializer, condition]
-        body_list = [body, update]
 
-        return WhileStatement(condition_list, body_list)
+        return ForStatement(initializer, condition, update, body)
 
     def while_statement(self):
         """Creates AST node for while statements."""
-        self.consume(
-            TokenType.LEFT_PAREN.name, "Missing opening '(' in while condition."
-        )
+        self.consume(TokenType.LEFT_PAREN, "Missing opening '(' in while condition.")
         condition = self.expression()
-        self.consume(
-            TokenType.RIGHT_PAREN.name, "Missing closing ')' in while condition."
-        )
+        self.consume(TokenType.RIGHT_PAREN, "Missing closing ')' in while condition.")
         body = self.statement()
 
         return WhileStatement(condition, body)
 
     def if_statement(self):
         """Creates AST node for if statements."""
-        self.consume(TokenType.LEFT_PAREN.name, "Missing opening '(' in if condition.")
+        self.consume(TokenType.LEFT_PAREN, "Missing opening '(' in if condition.")
         condition = self.expression()
-        self.consume(TokenType.RIGHT_PAREN.name, "Missing closing ')' in if condition.")
+        self.consume(TokenType.RIGHT_PAREN, "Missing closing ')' in if condition.")
 
         then_branch = self.statement()
         else_branch = None
-        if self.match(TokenType.ELSE.name):
+        if self.match(TokenType.ELSE):
             else_branch = self.statement()
 
         return IfStatement(condition, then_branch, else_branch)
@@ -180,40 +179,43 @@ class Parser:
     def print_statement(self):
         """Creates AST node for print statements."""
         expr = self.expression()
-        self.consume(TokenType.SEMI_COLON.name, "Missing ';' in print statement.")
+        self.consume(TokenType.SEMI_COLON, "Missing ';' in print statement.")
         return PrintStatement(expr)
 
     def return_statement(self):
         """Creates AST node for return statements."""
         expr = None
-        if not self.match(TokenType.SEMI_COLON.name):
+        if not self.match(TokenType.SEMI_COLON):
             expr = self.expression()
-            self.consume(TokenType.SEMI_COLON.name, "Missing ';' in print statement.")
+            self.consume(TokenType.SEMI_COLON, "Missing ';' in print statement.")
 
         return ReturnStatement(expr)
 
     def break_statement(self):
         keyword = self.previous()
-        self.consume(TokenType.SEMI_COLON.name, "Missing ';' in print statement.")
+        self.consume(TokenType.SEMI_COLON, "Missing ';' in print statement.")
         return BreakStatement(keyword)
 
     def block(self):
         """Creates AST node for blocks."""
         block_stmts = []
-        while not (self.at_end() or self.match(TokenType.RIGHT_BRACE.name)):
+        while not (self.at_end() or self.match(TokenType.RIGHT_BRACE)):
             block_stmt = self.declaration()
             block_stmts.append(block_stmt)
 
         self.current -= 1  # gives the closing } for the check below.
-        self.consume(TokenType.RIGHT_BRACE.name, "Missing closing '}' in block.")
+        self.consume(TokenType.RIGHT_BRACE, "Missing closing '}' in block.")
 
         return Block(block_stmts)
 
     def expression_statement(self):
         """Creates AST node for expression statements i.e. expressions followed by a semi colon."""
+        line_no = self.tokens[self.current].line_no
         expr = self.expression()
-        self.consume(TokenType.SEMI_COLON.name, "Missing ';' in expression statement.")
-        return ExpressionStatement(expr)
+        self.consume(TokenType.SEMI_COLON, "Missing ';' in expression statement.")
+        expression_stmt = ExpressionStatement(expr)
+        expression_stmt.line_no = line_no
+        return expression_stmt
 
     def expression(self):
         """Creates AST node for expressions."""
@@ -223,9 +225,9 @@ class Parser:
         """Creates AST node for ternary expressions."""
         expr = self.assignment()
 
-        while self.match(TokenType.QUESTION.name):
+        while self.match(TokenType.QUESTION):
             second = self.ternary()
-            self.consume(TokenType.COLON.name, "Missing ':' in ternary expression.")
+            self.consume(TokenType.COLON, "Missing ':' in ternary expression.")
             third = self.ternary()
             expr = Ternary(expr, second, third)
 
@@ -235,7 +237,7 @@ class Parser:
         """Creates AST node for assignment expressions."""
         expr = self.logical_or()
 
-        while self.match(TokenType.EQUAL.name):
+        while self.match(TokenType.EQUAL):
             operator = self.previous()
             # calling self.ternary to assign a ternary to a variable
             # or use a ternary as an expression statement.
@@ -254,7 +256,7 @@ class Parser:
         """Creates AST node for logical OR expressions."""
         expr = self.logical_and()
 
-        while self.match(TokenType.OR.name):
+        while self.match(TokenType.OR):
             operator = self.previous()
             right = self.logical_and()
             expr = Logical(expr, operator, right)
@@ -265,7 +267,7 @@ class Parser:
         """Creates AST node for logical AND expressions."""
         expr = self.bitwise_or()
 
-        while self.match(TokenType.AND.name):
+        while self.match(TokenType.AND):
             operator = self.previous()
             right = self.bitwise_or()
             expr = Logical(expr, operator, right)
@@ -276,7 +278,7 @@ class Parser:
         """Creates AST node for bitwise OR expressions."""
         expr = self.bitwise_and()
 
-        while self.match(TokenType.PIPE.name):
+        while self.match(TokenType.PIPE):
             operator = self.previous()
             right = self.bitwise_and()
             expr = Binary(expr, operator, right)
@@ -287,7 +289,7 @@ class Parser:
         """Creates AST node for bitwise AND expressions."""
         expr = self.equality()
 
-        while self.match(TokenType.AMPERSAND.name):
+        while self.match(TokenType.AMPERSAND):
             operator = self.previous()
             right = self.equality()
             expr = Binary(expr, operator, right)
@@ -298,7 +300,7 @@ class Parser:
         """Creates AST node for equality expressions."""
         expr = self.comparison()
 
-        while self.match(TokenType.BANG_EQUAL.name, TokenType.EQUAL_EQUAL.name):
+        while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
             operator = self.previous()
             right = self.comparison()
             expr = Binary(expr, operator, right)
@@ -310,10 +312,10 @@ class Parser:
         expr = self.term()
 
         while self.match(
-            TokenType.GREATER_THAN.name,
-            TokenType.GREATER_THAN_EQUAL.name,
-            TokenType.LESS_THAN.name,
-            TokenType.LESS_THAN_EQUAL.name,
+            TokenType.GREATER_THAN,
+            TokenType.GREATER_THAN_EQUAL,
+            TokenType.LESS_THAN,
+            TokenType.LESS_THAN_EQUAL,
         ):
             operator = self.previous()
             right = self.term()
@@ -325,7 +327,7 @@ class Parser:
         """Creates AST node for term expressions."""
         expr = self.factor()
 
-        while self.match(TokenType.PLUS.name, TokenType.MINUS.name):
+        while self.match(TokenType.PLUS, TokenType.MINUS):
             operator = self.previous()
             right = self.factor()
             expr = Binary(expr, operator, right)
@@ -336,9 +338,7 @@ class Parser:
         """Creates AST node for factor expressions."""
         expr = self.unary()
 
-        while self.match(
-            TokenType.SLASH.name, TokenType.STAR.name, TokenType.PERCENT.name
-        ):
+        while self.match(TokenType.SLASH, TokenType.STAR, TokenType.PERCENT):
             operator = self.previous()
             right = self.unary()
             expr = Binary(expr, operator, right)
@@ -347,7 +347,7 @@ class Parser:
 
     def unary(self):
         """Creates AST node for unary expressions."""
-        while self.match(TokenType.BANG.name, TokenType.MINUS.name):
+        while self.match(TokenType.BANG, TokenType.MINUS):
             operator = self.previous()
             right = self.unary()
             return Unary(operator, right)
@@ -358,7 +358,7 @@ class Parser:
         """Creates AST node for exponentiation/power expressions."""
         expr = self.call()
 
-        while self.match(TokenType.CARET.name):
+        while self.match(TokenType.CARET):
             operator = self.previous()
             right = self.power()
             return Binary(expr, operator, right)
@@ -369,17 +369,17 @@ class Parser:
         """Creates AST node for function call expressions."""
         expr = self.primary()
 
-        while self.match(TokenType.LEFT_PAREN.name):
+        while self.match(TokenType.LEFT_PAREN):
             args = []
-            if not self.match(TokenType.RIGHT_PAREN.name):
+            if not self.match(TokenType.RIGHT_PAREN):
                 arg = self.expression()
                 args.append(arg)
-                while self.match(TokenType.COMMA.name):
+                while self.match(TokenType.COMMA):
                     arg = self.expression()
                     args.append(arg)
 
                 self.consume(
-                    TokenType.RIGHT_PAREN.name, "Missing closing ')' in function call."
+                    TokenType.RIGHT_PAREN, "Missing closing ')' in function call."
                 )
 
             expr = Call(expr, args)
@@ -388,29 +388,29 @@ class Parser:
 
     def primary(self):
         """Creates AST node for primary expressions i.e. terminals."""
-        if self.match(TokenType.NUMBER.name):
+        if self.match(TokenType.NUMBER):
             return Literal(self.previous().literal)
 
-        if self.match(TokenType.STRING.name):
+        if self.match(TokenType.STRING):
             return Literal(self.previous().literal)
 
-        if self.match(TokenType.TRUE.name):
+        if self.match(TokenType.TRUE):
             return Literal(True)
 
-        if self.match(TokenType.FALSE.name):
+        if self.match(TokenType.FALSE):
             return Literal(False)
 
-        if self.match(TokenType.NIL.name):
+        if self.match(TokenType.NIL):
             return Literal(None)
 
-        if self.match(TokenType.LEFT_PAREN.name):
+        if self.match(TokenType.LEFT_PAREN):
             expr = self.expression()
             self.consume(
-                TokenType.RIGHT_PAREN.name, "Missing closing ')' in group expression."
+                TokenType.RIGHT_PAREN, "Missing closing ')' in group expression."
             )
             return Group(expr)
 
-        if self.match(TokenType.IDENTIFIER.name):
+        if self.match(TokenType.IDENTIFIER):
             name = self.previous().lexeme
             return Variable(name)
 
@@ -434,13 +434,12 @@ class Parser:
     def match(self, *token_types):
         """Validates if one/more tokens type match the current token's type.
         Advances to the next token there is a match."""
-        for token_type in token_types:
-            type_match = self.current_token_type() == token_type
-            if type_match:
-                self.advance()
-                return True
+        # token types are ints, so this is a handful of int comparisons.
+        type_match = self.tokens[self.current].type in token_types
+        if type_match:
+            self.advance()
 
-        return False
+        return type_match
 
     def consume(self, token_type, message):
         """Similar to self.match, except this checks a single token type and is used for syntax checks."""
@@ -452,23 +451,23 @@ class Parser:
 
     def at_end(self):
         """Validates if we've reached the end of token list."""
-        return self.tokens[self.current].type == TokenType.EOF.name
+        return self.tokens[self.current].type == TokenType.EOF
 
     def synchronize(self):
         self.advance()
 
         while not self.at_end():
-            if self.previous().type == TokenType.SEMI_COLON.name:
+            if self.previous().type == TokenType.SEMI_COLON:
                 return
 
             if self.tokens[self.current].type in [
-                TokenType.FOR.name,
-                TokenType.FUN.name,
-                TokenType.IF.name,
-                TokenType.PRINT.name,
-                TokenType.RETURN.name,
-                TokenType.VAR.name,
-                TokenType.WHILE.name,
+                TokenType.FOR,
+                TokenType.FUN,
+                TokenType.IF,
+                TokenType.PRINT,
+                TokenType.RETURN,
+                TokenType.VAR,
+                TokenType.WHILE,
             ]:
                 return
 
@@ -0,0 +1,205 @@
+import json
+import threading
+import time
+from collections import Counter
+
+from _completion import Completion
+from _environment import Environment
+from _function import Function
+from _interpreter import Interpreter
+
+TOP_LINES = 10  # number of most executed lines in the report.
+
+
+class Profiler:
+    """Records the call count, inclusive and exclusive time of every plox function
+    and how many times the statements on every source line are executed.
+    Functions are identified by their name and the line they're declared on."""
+
+    def __init__(self):
+        # (name, line_no) -> [calls, inclusive seconds, exclusive seconds]
+        self.stats = {}
+        self.line_counts = Counter()
+        # one [key, seconds spent in callees] per call in progress, innermost last.
+        self.frames = []
+        # calls in progress per function. inclusive time is only added by the outermost
+        # one so recursive calls aren't counted more than once.
+        self.active = Counter()
+
+    def enter(self, key):
+        self.frames.append([key, 0.0])
+        self.active[key] += 1
+
+    def exit(self, key, elapsed):
+        _, callees_elapsed = self.frames.pop()
+        self.active[key] -= 1
+
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = [0, 0.0, 0.0]
+
+        stats[0] += 1
+        stats[2] += elapsed - callees_elapsed
+        if self.active[key] == 0:
+            stats[1] += elapsed
+
+        if self.frames:
+            self.frames[-1][1] += elapsed
+
+    def report(self, stream):
+        """Writes the functions, slowest (exclusive time) first, and the most executed lines."""
+        total = sum(stats[2] for stats in self.stats.values()) or 1.0
+        stream.write(
+            "{:<24} {:>6} {:>10} {:>12} {:>12} {:>7}\n".format(
+                "function", "line", "calls", "incl (ms)", "excl (ms)", "excl %"
+            )
+        )
+        ranked = sorted(self.stats.items(), key=lambda item: item[1][2], reverse=True)
+        for (name, line_no), (calls, inclusive, exclusive) in ranked:
+            stream.write(
+                "{:<24} {:>6} {:>10} {:>12.3f} {:>12.3f} {:>7.1f}\n".format(
+                    name,
+                    line_no,
+                    calls,
+                    inclusive * 1e3,
+                    exclusive * 1e3,
+                    exclusive / total * 100,
+                )
+            )
+
+        stream.write("\n{:<6} {:>12}\n".format("line", "executions"))
+        for line_no, count in self.line_counts.most_common(TOP_LINES):
+            stream.write("{:<6} {:>12}\n".format(line_no, count))
+
+    def dump(self, path):
+        """Writes everything recorded to a JSON file."""
+        data = {
+            "functions": [
+                {
+                    "name": name,
+                    "line_no": line_no,
+                    "calls": calls,
+                    "inclusive_s": inclusive,
+                    "exclusive_s": exclusive,
+                }
+                for (name, line_no), (calls, inclusive, exclusive) in self.stats.items()
+            ],
+            "lines": [
+                {"line_no": line_no, "executions": count}
+                for line_no, count in sorted(self.line_counts.items())
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+class ProfiledFunction(Function):
+    """Plox function that times every call with the interpreter's profiler.
+    Only created while profiling, so Function.call itself is never instrumented."""
+
+    def call(self, arguments, interpreter):
+        profiler = interpreter.profiler
+        key = (self.name, self.line_no)
+        profiler.enter(key)
+        start = time.perf_counter()
+        try:
+            return Function.call(self, arguments, interpreter)
+        finally:
+            profiler.exit(key, time.perf_counter() - start)
+
+
+class ProfilingInterpreter(Interpreter):
+    """Interpreter that creates ProfiledFunctions and counts the statements executed per line."""
+
+    function_class = ProfiledFunction
+
+    def __init__(self, profiler, output=None):
+        super().__init__(output=output)
+        self.profiler = profiler
+        self.line_counts = profiler.line_counts
+
+    def execute(self, stmt):
+        line_no = stmt.line_no
+        if line_no is not None:
+            self.line_counts[line_no] += 1
+
+        return stmt.accept(self)
+
+
+class Sampler:
+    """Samples the plox call stack from a background thread, rate times per second.
+    Functions only push and pop their frame, so the overhead stays low even on tight
+    recursive code. Samples are written in the collapsed stack format read by flamegraph tools.
+    """
+
+    ROOT = "<main>"  # frame at the bottom of every stack: top-level code.
+
+    def __init__(self, rate=100):
+        self.interval = 1.0 / rate
+        # "name:line_no" of every plox call in progress, innermost last.
+        self.stack = []
+        self.samples = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def sample(self):
+        stack = self.stack
+        while not self.stopped.wait(self.interval):
+            # copying the list is atomic, so it never sees a half pushed or popped frame.
+            self.samples[tuple(stack)] += 1
+
+    def dump(self, path):
+        """Writes one "frame;frame;... count" line per distinct stack, outermost frame first."""
+        with open(path, "w") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write("{} {}\n".format(";".join((Sampler.ROOT,) + stack), count))
+
+    def report(self, stream, path):
+        stream.write(
+            "{} samples of {} distinct stacks written to {}\n".format(
+                sum(self.samples.values()), len(self.samples), path
+            )
+        )
+
+
+class SampledFunction(Function):
+    """Plox function that keeps the sampler's call stack up to date."""
+
+    def __init__(self, declaration, closure):
+        super().__init__(declaration, closure)
+        self.frame = "{}:{}".format(self.name, self.line_no)
+
+    def call(self, arguments, interpreter):
+        # Function.call, inlined to keep the cost of sampling to a push and a pop.
+        environment = Environment(self.closure, self.num_slots)
+        for slot, arg in zip(self.param_slots, arguments):
+            environment.define_at(slot, arg)
+
+        stack = interpreter.call_stack
+        stack.append(self.frame)
+        try:
+            completion = interpreter.execute_block(self.body, environment)
+        finally:
+            stack.pop()
+
+        if completion is Completion.RETURN:
+            return interpreter.return_value
+
+        return None
+
+
+class SamplingInterpreter(Interpreter):
+    """Interpreter that creates SampledFunctions."""
+
+    function_class = SampledFunction
+
+    def __init__(self, sampler, output=None):
+        super().__init__(output=output)
+        self.call_stack = sampler.stack
@@ -0,0 +1,39 @@
+from _budget import BudgetedInterpreter
+from _environment import Environment
+
+
+class Program:
+    """A plox program that Plox.compile scanned, parsed, resolved and analyzed once, ready
+    to be executed any number of times. code is what its engine runs: the resolved ASTs for
+    the tree engine, a Chunk for the vm engine or a python code object for the python engine.
+    """
+
+    def __init__(self, engine, code, runner):
+        self.engine = engine
+        self.code = code
+        # the Interpreter, VM or PyRuntime of the Plox that compiled the program.
+        self.runner = runner
+
+    def execute(self, globals=None, interpreter=None):
+        """Runs the program with globals, a dict of names to plox values, as its global
+        bindings. The program's declarations and assignments update the dict in place.
+        A new empty dict is used if globals is None, so every run starts from scratch.
+        Runs on interpreter (an Interpreter, VM or PyRuntime, matching the program's engine)
+        if given, else on the compiling Plox's. Their own globals are left untouched.
+        An engine runs one program at a time: threads running programs at once need one each.
+        A budgeted Interpreter's budget is restarted for every run.
+        Returns the global bindings after the run."""
+        globals_env = Environment()
+        if globals is not None:
+            globals_env.bindings = globals
+
+        runner = self.runner if interpreter is None else interpreter
+        if isinstance(runner, BudgetedInterpreter):
+            runner.budget.start()  # every run gets the whole budget.
+
+        if self.engine == "tree":
+            runner.interpret(self.code, globals_env)
+        else:
+            runner.run(self.code, globals_env)
+
+        return globals_env.bindings
@@ -0,0 +1,204 @@
+from collections import Counter
+
+from _asts._expressions.variable_expr import Variable
+from _visitors._expressions.expr_visitor import ExpressionVisitor
+from _visitors._statements.stmt_visitor import StatementVisitor
+
+
+class FunctionFacts:
+    """What a function's body does that decides whether the function is pure."""
+
+    def __init__(self, function_stmt):
+        self.function_stmt = function_stmt
+        # scopes opened by the function: its own, plus the blocks enclosing the node visited.
+        self.scope_depth = 1
+        self.has_side_effects = False
+        self.free_reads = set()  # names read from outside the function.
+        self.callees = set()  # names of the functions it calls, all from outside it.
+
+
+class PurityAnalyzer(ExpressionVisitor, StatementVisitor):
+    """Marks the FunctionStatements whose calls always evaluate to the same value for the
+    same arguments and have no side effects, so their results can be memoized.
+    A function is pure if it doesn't print, assign free variables, declare closures or make
+    calls other than to pure functions declared by name, and if every free variable it reads
+    is declared once, with a value, and never assigned.
+    Runs after the Resolver, whose (depth, slot)s tell locals and free variables apart.
+    Only the ASTs passed to analyze are considered: globals changed by later runs are
+    handled by the Memoizer, which watches the free_names of pure functions."""
+
+    def __init__(self):
+        self.declarations = Counter()
+        self.uninitialized = set()  # names declared without a value.
+        self.assigned = set()
+        self.functions = {}  # name -> FunctionStatement.
+        self.facts = []
+        self.enclosing = []  # facts of the functions being visited, innermost last.
+
+    def analyze(self, stmts):
+        """Sets is_pure, makes_tail_calls and free_names on every FunctionStatement in stmts."""
+        self.visit_all(stmts)
+
+        pure = set()
+        for facts in self.facts:
+            reads_constants = all(self.is_constant(name) for name in facts.free_reads)
+            calls_functions = all(
+                self.is_constant(name) and name in self.functions
+                for name in facts.callees
+            )
+            if not facts.has_side_effects and reads_constants and calls_functions:
+                pure.add(facts.function_stmt)
+
+        # a function calling an impure one is impure. repeated until nothing changes
+        # so mutually recursive functions are handled.
+        changed = True
+        while changed:
+            changed = False
+            for facts in self.facts:
+                function_stmt = facts.function_stmt
+                if function_stmt not in pure:
+                    continue
+
+                if any(self.functions[name] not in pure for name in facts.callees):
+                    pure.discard(function_stmt)
+                    changed = True
+
+        for facts in self.facts:
+            facts.function_stmt.is_pure = facts.function_stmt in pure
+            facts.function_stmt.free_names = facts.free_reads | facts.callees
+
+    def is_constant(self, name):
+        return (
+            self.declarations[name] == 1
+            and name not in self.assigned
+            and name not in self.uninitialized
+        )
+
+    def is_free(self, expr):
+        """Whether a resolved variable or assignment expression refers to a binding outside
+        the function being visited."""
+        return expr.depth is None or expr.depth >= self.enclosing[-1].scope_depth
+
+    def visit_all(self, stmts):
+        for stmt in stmts:
+            self.visit(stmt)
+
+    def visit(self, node):
+        # the parser emits None for statements it failed to parse. the interpreter reports those.
+        if node is not None:
+            node.accept(self)
+
+    def mark_side_effect(self):
+        if self.enclosing:
+            self.enclosing[-1].has_side_effects = True
+
+    def visit_while_stmt(self, while_stmt):
+        self.visit(while_stmt.condition)
+        self.visit(while_stmt.body)
+
+    def visit_for_stmt(self, for_stmt):
+        self.visit(for_stmt.initializer)
+        self.visit(for_stmt.condition)
+        self.visit(for_stmt.body)
+        self.visit(for_stmt.update)
+
+    def visit_if_stmt(self, if_stmt):
+        self.visit(if_stmt.condition)
+        self.visit(if_stmt.then_branch)
+        self.visit(if_stmt.else_branch)
+
+    def visit_print_stmt(self, print_stmt):
+        self.mark_side_effect()
+        self.visit(print_stmt.expression)
+
+    def visit_return_stmt(self, return_stmt):
+        if return_stmt.is_tail_call:
+            self.enclosing[-1].function_stmt.makes_tail_calls = True
+
+        self.visit(return_stmt.expression)
+
+    def visit_break_stmt(self, break_stmt):
+        pass
+
+    def visit_block(self, block):
+        if self.enclosing:
+            self.enclosing[-1].scope_depth += 1
+
+        self.visit_all(block.statements)
+        if self.enclosing:
+            self.enclosing[-1].scope_depth -= 1
+
+    def visit_variable_stmt(self, variable_stmt):
+        name = variable_stmt.identifier.lexeme
+        self.declarations[name] += 1
+        if variable_stmt.initializer is None:
+            self.uninitialized.add(name)
+
+        self.visit(variable_stmt.initializer)
+
+    def visit_function_stmt(self, function_stmt):
+        # every call of the enclosing function would create a new closure.
+        self.mark_side_effect()
+        self.declarations[function_stmt.name] += 1
+        self.functions[function_stmt.name] = function_stmt
+        for param in function_stmt.params:
+            self.declarations[param.name] += 1
+
+        function_stmt.makes_tail_calls = False
+        facts = FunctionFacts(function_stmt)
+        self.facts.append(facts)
+        self.enclosing.append(facts)
+        self.visit_all(function_stmt.body)
+        self.enclosing.pop()
+
+    def visit_expression_stmt(self, expression_stmt):
+        self.visit(expression_stmt.expression)
+
+    def visit_ternary_expr(self, ternary_expr):
+        self.visit(ternary_expr.first)
+        self.visit(ternary_expr.second)
+        self.visit(ternary_expr.third)
+
+    def visit_assignment_expr(self, assignment_expr):
+        self.assigned.add(assignment_expr.name)
+        if self.enclosing and self.is_free(assignment_expr):
+            self.mark_side_effect()
+
+        self.visit(assignment_expr.value)
+
+    def visit_variable_expr(self, variable_expr):
+        if self.enclosing and self.is_free(variable_expr):
+            self.enclosing[-1].free_reads.add(variable_expr.name)
+
+    def visit_logical_expr(self, logical_expr):
+        self.visit(logical_expr.left)
+        self.visit(logical_expr.right)
+
+    def visit_binary_expr(self, binary_expr):
+        self.visit(binary_expr.left)
+        self.visit(binary_expr.right)
+
+    def visit_group_expr(self, group_expr):
+        self.visit(group_expr.expression)
+
+    def visit_literal_expr(self, literal_expr):
+        pass
+
+    def visit_unary_expr(self, unary_expr):
+        self.visit(unary_expr.right)
+
+    def visit_call_expr(self, call_expr):
+        callee = call_expr.callee
+        if self.enclosing:
+            is_named = isinstance(callee, Variable) and self.is_free(callee)
+            if is_named:
+                self.enclosing[-1].callees.add(callee.name)
+            else:
+                # locals and computed callees could hold any function.
+                self.mark_side_effect()
+
+        if not isinstance(callee, Variable):
+            self.visit(callee)
+
+        for argument in call_expr.arguments:
+            self.visit(argument)
@@ -0,0 +1,122 @@
+from _callable import Callable
+from _environment import Environment
+from _environment import report_uninitialized
+from _numbers import Bits
+from _operators import BINARY_OPERATORS
+from _operators import UNARY_OPERATORS
+from _operators import plox_type
+from _operators import to_printable
+from _output import Output
+
+
+class TranspiledFunction(Callable):
+    """Creates the runtime object for a plox function transpiled to a python function."""
+
+    def __init__(self, function, name, num_params, line_no):
+        self.function = function
+        self.name = name
+        self.num_params = num_params
+        self.line_no = line_no
+
+    def arity(self):
+        """Computes the number of params in a function declaration."""
+        return self.num_params
+
+    def call(self, arguments, interpreter=None):
+        """Calls the python function the plox function was transpiled to."""
+        return self.function(*arguments)
+
+    def __str__(self):
+        """String representation of a plox function."""
+        return "<fn {} declared on {}>".format(self.name, self.line_no)
+
+
+def call(callee, *arguments):
+    """Evaluates plox function calls in transpiled code."""
+    if type(callee) is TranspiledFunction and callee.num_params == len(arguments):
+        return callee.function(*arguments)
+
+    if not isinstance(callee, Callable):
+        raise TypeError("Can't call object of type {}".format(plox_type(callee)))
+
+    if callee.arity() != len(arguments):
+        raise ValueError(
+            "Parameters declared do not match arguments passed in {}".format(callee)
+        )
+
+    return callee.call(list(arguments))
+
+
+def set_cell(cell, value):
+    """Assigns to a local captured by a closure. Returns value, like any assignment."""
+    cell[0] = value
+    return value
+
+
+def uninitialized(name):
+    """Reports reading an unset local. Evaluates to None, the value that was read."""
+    report_uninitialized(name)
+
+
+class PyRuntime:
+    """Runs the python code objects created by the Transpiler."""
+
+    def __init__(self, output=None):
+        # persists across every program run in batch or interactive mode.
+        self.globals = Environment()
+        # where print statements write to.
+        self.output = Output() if output is None else output
+
+    def namespace(self):
+        """Creates the globals of a transpiled program: plox's runtime helpers
+        and the plox globals, which live in a dict named _G."""
+        globals_env = self.globals
+        bindings = globals_env.bindings
+
+        def assign_global(name, value):
+            if name in bindings:
+                bindings[name] = value
+            else:
+                globals_env.assign(name, value)  # reports the undefined variable.
+
+            return value
+
+        write_line = self.output.write_line
+
+        def print_value(value):
+            # transpiled code only makes floats, but globals passed in may hold ints.
+            write_line(to_printable(value))
+
+        namespace = {
+            "_G": bindings,
+            "_get": bindings.get,
+            "_get_global": globals_env.get,
+            "_assign_global": assign_global,
+            "_call": call,
+            "_set_cell": set_cell,
+            "_uninitialized": uninitialized,
+            "_Function": TranspiledFunction,
+            "_print": print_value,
+            "_Bits": Bits,
+        }
+        for operator in list(BINARY_OPERATORS.values()) + list(
+            UNARY_OPERATORS.values()
+        ):
+            namespace["_" + operator.__name__] = operator
+
+        return namespace
+
+    def run(self, code, globals_env=None):
+        """Executes a code object compiled from a whole program.
+        If globals_env is given, it holds the globals instead of the instance's own."""
+        if globals_env is not None:
+            own_globals, self.globals = self.globals, globals_env
+            try:
+                return self.run(code)
+            finally:
+                self.globals = own_globals
+
+        namespace = self.namespace()
+        exec(code, namespace)
+        with self.output:
+            namespace["_main"]()
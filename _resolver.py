@@ -0,0 +1,210 @@
+from _asts._expressions.call_expr import Call
+from _visitors._expressions.expr_visitor import ExpressionVisitor
+from _visitors._statements.stmt_visitor import StatementVisitor
+
+
+class Resolver(ExpressionVisitor, StatementVisitor):
+    """Statically resolves every variable reference to the (depth, slot) of its binding.
+    depth is the number of environments between the reference and the environment
+    holding the binding. slot is the binding's index in that environment.
+    Function bodies are resolved once the top-level statement declaring them is, so they see
+    every local of their enclosing scopes, including those declared after the function:
+    local functions can call each other in any order, as with globals.
+    Runs once between parsing and interpreting."""
+
+    def __init__(self):
+        # innermost scope is last. each scope maps a name to its slot.
+        # the global scope isn't tracked: unresolved names are looked up by name at runtime.
+        self.scopes = []
+        # per scope: slot -> name of the locals referenced from functions nested in the
+        # scope's own function.
+        self.captured = []
+        # indices of the scopes opened by function declarations.
+        self.function_scopes = []
+        # loops enclosing the statement being resolved, in its own function.
+        self.loop_depth = 0
+
+        # (function_stmt, scopes, captured, function_scopes) of the functions whose bodies are
+        # still to be resolved, with the scopes enclosing their declaration.
+        self.deferred = []
+
+    def resolve(self, stmts):
+        """Resolves every AST node representing a statement."""
+        for stmt in stmts:
+            self.resolve_node(stmt)
+            if not self.scopes:
+                # every scope the deferred bodies can see is complete.
+                self.resolve_deferred()
+
+    def resolve_deferred(self):
+        while self.deferred:
+            function_stmt, scopes, captured, function_scopes = self.deferred.pop(0)
+            self.scopes, self.captured = scopes, captured
+            self.function_scopes = function_scopes
+            self.resolve_function(function_stmt)
+
+        self.scopes, self.captured, self.function_scopes = [], [], []
+
+    def resolve_node(self, node):
+        """Resolves a single statement or expression."""
+        # the parser emits None for statements it failed to parse. the interpreter reports those.
+        if node is not None:
+            node.accept(self)
+
+    def begin_scope(self, is_function=False):
+        if is_function:
+            self.function_scopes.append(len(self.scopes))
+
+        self.scopes.append({})
+        self.captured.append({})
+
+    def end_scope(self):
+        """Discards the innermost scope. Returns the number of slots it needs
+        and the slots captured by closures."""
+        if self.function_scopes and self.function_scopes[-1] == len(self.scopes) - 1:
+            self.function_scopes.pop()
+
+        return len(self.scopes.pop()), self.captured.pop()
+
+    def declare(self, name):
+        """Adds name to the innermost scope. Returns its slot, or None for globals."""
+        is_global = len(self.scopes) == 0
+        if is_global:
+            return None
+
+        scope = self.scopes[-1]
+        if name not in scope:
+            # re-declaring a name in the same scope reuses its slot.
+            scope[name] = len(scope)
+
+        return scope[name]
+
+    def resolve_local(self, expr, name):
+        """Records where the binding of name lives. Names not found in any scope are globals."""
+        for depth, scope in enumerate(reversed(self.scopes)):
+            if name in scope:
+                expr.depth = depth
+                expr.slot = scope[name]
+
+                scope_idx = len(self.scopes) - 1 - depth
+                is_captured = (
+                    len(self.function_scopes) > 0
+                    and self.function_scopes[-1] > scope_idx
+                )
+                if is_captured:
+                    self.captured[scope_idx][expr.slot] = name
+                return
+
+        expr.depth = None
+        expr.slot = None
+
+    def visit_while_stmt(self, while_stmt):
+        self.loop_depth += 1
+        self.resolve_node(while_stmt.condition)
+        self.resolve_node(while_stmt.body)
+        self.loop_depth -= 1
+
+    def visit_for_stmt(self, for_stmt):
+        # for statements don't open a scope: the initializer lives in the enclosing one.
+        self.resolve_node(for_stmt.initializer)
+        self.loop_depth += 1
+        self.resolve_node(for_stmt.condition)
+        self.resolve_node(for_stmt.body)
+        self.resolve_node(for_stmt.update)
+        self.loop_depth -= 1
+
+    def visit_if_stmt(self, if_stmt):
+        self.resolve_node(if_stmt.condition)
+        self.resolve_node(if_stmt.then_branch)
+        self.resolve_node(if_stmt.else_branch)
+
+    def visit_print_stmt(self, print_stmt):
+        self.resolve_node(print_stmt.expression)
+
+    def visit_return_stmt(self, return_stmt):
+        # checked here so a return never has to be caught outside a function at runtime.
+        if not self.function_scopes:
+            raise SyntaxError("Can't use return outside function.")
+
+        # nothing runs in the function after the call, so it can reuse the caller's python frame.
+        return_stmt.is_tail_call = isinstance(return_stmt.expression, Call)
+        self.resolve_node(return_stmt.expression)
+
+    def visit_break_stmt(self, break_stmt):
+        if self.loop_depth == 0:
+            raise SyntaxError(
+                "[Error on L{}]: Can't use break outside loop.".format(
+                    break_stmt.keyword.line_no
+                )
+            )
+
+    def visit_block(self, block):
+        self.begin_scope()
+        self.resolve(block.statements)
+        block.num_slots, block.captured_slots = self.end_scope()
+
+    def visit_variable_stmt(self, variable_stmt):
+        # the initializer is resolved first so var a = a; reads the enclosing a.
+        self.resolve_node(variable_stmt.initializer)
+        variable_stmt.slot = self.declare(variable_stmt.identifier.lexeme)
+
+    def visit_function_stmt(self, function_stmt):
+        # declared before the body is resolved so functions can call themselves.
+        function_stmt.slot = self.declare(function_stmt.name)
+        self.deferred.append(
+            (
+                function_stmt,
+                list(self.scopes),
+                list(self.captured),
+                list(self.function_scopes),
+            )
+        )
+
+    def resolve_function(self, function_stmt):
+        # params and the body share the environment created on every call.
+        self.begin_scope(is_function=True)
+        function_stmt.param_slots = [
+            self.declare(param.name) for param in function_stmt.params
+        ]
+        # loops around the declaration can't be broken out of from its body.
+        enclosing_loop_depth, self.loop_depth = self.loop_depth, 0
+        self.resolve(function_stmt.body)
+        self.loop_depth = enclosing_loop_depth
+        function_stmt.num_slots, function_stmt.captured_slots = self.end_scope()
+
+    def visit_expression_stmt(self, expression_stmt):
+        self.resolve_node(expression_stmt.expression)
+
+    def visit_ternary_expr(self, ternary_expr):
+        self.resolve_node(ternary_expr.first)
+        self.resolve_node(ternary_expr.second)
+        self.resolve_node(ternary_expr.third)
+
+    def visit_assignment_expr(self, assignment_expr):
+        self.resolve_node(assignment_expr.value)
+        self.resolve_local(assignment_expr, assignment_expr.name)
+
+    def visit_variable_expr(self, variable_expr):
+        self.resolve_local(variable_expr, variable_expr.name)
+
+    def visit_logical_expr(self, logical_expr):
+        self.resolve_node(logical_expr.left)
+        self.resolve_node(logical_expr.right)
+
+    def visit_binary_expr(self, binary_expr):
+        self.resolve_node(binary_expr.left)
+        self.resolve_node(binary_expr.right)
+
+    def visit_group_expr(self, group_expr):
+        self.resolve_node(group_expr.expression)
+
+    def visit_literal_expr(self, literal_expr):
+        pass
+
+    def visit_unary_expr(self, unary_expr):
+        self.resolve_node(unary_expr.right)
+
+    def visit_call_expr(self, call_expr):
+        self.resolve_node(call_expr.callee)
+        for argument in call_expr.arguments:
+            self.resolve_node(argument)
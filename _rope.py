@@ -0,0 +1,91 @@
+import threading
+
+# results of + shorter than this stay python strs: copying them is cheaper than a Rope.
+MIN_LENGTH = 256
+
+# guards the shared lists. a Rope can reach several threads, e.g. as a constant of a Program
+# they all execute, and checking whether a list is still free to append to must be atomic
+# with the append.
+_lock = threading.Lock()
+
+
+class Rope:
+    """A plox string built by concatenation, stored as the list of its parts and only joined
+    into a python str (flattened) when it's printed, compared or measured. Appending to the
+    Rope created last from a list adds to the same list, so building a string piece by piece
+    costs O(n) rather than O(n^2).
+    Several Ropes can share one list: each one is its first count parts. Ropes can be used
+    from several threads at once."""
+
+    __slots__ = ("parts", "count", "length", "flat")
+
+    def __init__(self, parts, length):
+        self.parts = parts
+        self.count = len(parts)
+        self.length = length
+        self.flat = None
+
+    def append(self, string):
+        """Returns a new Rope holding this one followed by string (a str or a Rope)."""
+        string = str(string)  # outside the lock: flattening a Rope takes it.
+        with _lock:
+            parts = self.parts
+            if self.count != len(parts):
+                # another Rope has already been built from this one. it keeps the shared list.
+                parts = parts[: self.count]
+
+            parts.append(string)
+
+        return Rope(parts, self.length + len(string))
+
+    def __str__(self):
+        if self.flat is None:
+            with _lock:
+                flat = "".join(self.parts[: self.count])
+                # Ropes built from this one from now on start from the flattened str.
+                self.parts, self.count = [flat], 1
+                self.flat = flat
+
+        return self.flat
+
+    def __len__(self):
+        return self.length
+
+    # comparisons and errors behave exactly as they would on the flattened str.
+
+    def __lt__(self, other):
+        return str(self) < str(other)
+
+    def __le__(self, other):
+        return str(self) <= str(other)
+
+    def __gt__(self, other):
+        return str(self) > str(other)
+
+    def __ge__(self, other):
+        return str(self) >= str(other)
+
+    def __neg__(self):
+        return -str(self)
+
+    def __pow__(self, other):
+        return pow(str(self), other)
+
+    def __rpow__(self, other):
+        return pow(other, str(self))
+
+
+# the python types of plox strings.
+STRINGS = (str, Rope)
+
+
+def concat(left, right):
+    """Concatenates two plox strings, each a str or a Rope."""
+    length = len(left) + len(right)
+    if length < MIN_LENGTH:
+        return left + right  # neither can be a Rope: Ropes are never this short.
+
+    if type(left) is Rope:
+        return left.append(right)
+
+    return Rope([left], len(left)).append(right)
@@ -1,4 +1,5 @@
 from _keywords import KEYWORDS
+from _numbers import number_literal
 from _tokens._token import Token
 from _tokens._token_type import TokenType
 
@@ -15,91 +16,98 @@ class Scanner:
         self.tokens = []
         self.comments = []
 
+    @classmethod
+    def from_file(cls, f):
+        """Creates a scanner for the source code in an open file.
+        Scanner indexes into the whole source, so the file is read at once."""
+        return cls(f.read())
+
     def scan(self):
         """Creates tokens by combining 1 or more characters."""
+        self.tokens.extend(self.scan_iter())
+        return self.tokens
+
+    def scan_iter(self):
+        """Creates tokens lazily: each one is yielded as soon as its last character is read."""
         while not self.at_end():
             c = self.advance()
 
             if c == "+":
-                self.add_token(TokenType.PLUS.name)
+                yield self.add_token(TokenType.PLUS)
 
             elif c == "-":
-                self.add_token(TokenType.MINUS.name)
+                yield self.add_token(TokenType.MINUS)
 
             elif c == "/":
-                self.add_token(TokenType.SLASH.name)
+                yield self.add_token(TokenType.SLASH)
 
             elif c == "*":
-                self.add_token(TokenType.STAR.name)
+                yield self.add_token(TokenType.STAR)
 
             elif c == "%":
-                self.add_token(TokenType.PERCENT.name)
+                yield self.add_token(TokenType.PERCENT)
 
             elif c == "^":
-                self.add_token(TokenType.CARET.name)
+                yield self.add_token(TokenType.CARET)
 
             elif c == ">":
-                self.add_token(
-                    TokenType.GREATER_THAN_EQUAL.name
+                yield self.add_token(
+                    TokenType.GREATER_THAN_EQUAL
                     if self.match("=")
-                    else TokenType.GREATER_THAN.name
+                    else TokenType.GREATER_THAN
                 )
 
             elif c == "<":
-                self.add_token(
-                    TokenType.LESS_THAN_EQUAL.name
+                yield self.add_token(
+                    TokenType.LESS_THAN_EQUAL
                     if self.match("=")
-                    else TokenType.LESS_THAN.name
+                    else TokenType.LESS_THAN
                 )
 
             elif c == "=":
-                self.add_token(
-                    TokenType.EQUAL_EQUAL.name
-                    if self.match("=")
-                    else TokenType.EQUAL.name
+                yield self.add_token(
+                    TokenType.EQUAL_EQUAL if self.match("=") else TokenType.EQUAL
                 )
 
             elif c == "!":
-                self.add_token(
-                    TokenType.BANG_EQUAL.name
-                    if self.match("=")
-                    else TokenType.BANG.name
+                yield self.add_token(
+                    TokenType.BANG_EQUAL if self.match("=") else TokenType.BANG
                 )
 
             elif c == "(":
-                self.add_token(TokenType.LEFT_PAREN.name)
+                yield self.add_token(TokenType.LEFT_PAREN)
 
             elif c == ")":
-                self.add_token(TokenType.RIGHT_PAREN.name)
+                yield self.add_token(TokenType.RIGHT_PAREN)
 
             elif c == "{":
-                self.add_token(TokenType.LEFT_BRACE.name)
+                yield self.add_token(TokenType.LEFT_BRACE)
 
             elif c == "}":
-                self.add_token(TokenType.RIGHT_BRACE.name)
+                yield self.add_token(TokenType.RIGHT_BRACE)
 
             elif c == ";":
-                self.add_token(TokenType.SEMI_COLON.name)
+                yield self.add_token(TokenType.SEMI_COLON)
 
             elif c == ",":
-                self.add_token(TokenType.COMMA.name)
+                yield self.add_token(TokenType.COMMA)
 
             elif c == "?":
-                self.add_token(TokenType.QUESTION.name)
+                yield self.add_token(TokenType.QUESTION)
 
             elif c == ":":
-                self.add_token(TokenType.COLON.name)
+                yield self.add_token(TokenType.COLON)
 
             elif self.is_alpha(c):
                 keyword = KEYWORDS.get(self.extract_identifier())
                 is_keyword = keyword is not None
-                self.add_token(keyword if is_keyword else TokenType.IDENTIFIER.name)
+                yield self.add_token(keyword if is_keyword else TokenType.IDENTIFIER)
 
             elif c in ["'", '"']:  # allow single/double-quoted strings
                 string = self.extract_string()
                 str_len = len(string) - 1
-                self.add_token(
-                    TokenType.STRING.name,
+                yield self.add_token(
+                    TokenType.STRING,
                     literal=str(
                         string[1:str_len]
                     ),  # dropping quotes so they don't show up when concating strings with +
@@ -107,7 +115,7 @@ class Scanner:
 
             elif self.is_digit(c):
                 digit = self.extract_digit()
-                self.add_token(TokenType.NUMBER.name, literal=float(digit))
+                yield self.add_token(TokenType.NUMBER, literal=number_literal(digit))
 
             elif c == "\n":
                 self.line_no += 1
@@ -117,14 +125,14 @@ class Scanner:
                 self.proceed()
 
             elif c == "&":
-                self.add_token(TokenType.AMPERSAND.name)
+                yield self.add_token(TokenType.AMPERSAND)
 
             elif c == "|":
-                self.add_token(TokenType.PIPE.name)
+                yield self.add_token(TokenType.PIPE)
 
             elif c == "`":
                 comment = self.extract_comment()
-                self.add_comment(TokenType.BACKTICK.name, comment)
+                self.add_comment(TokenType.BACKTICK, comment)
                 self.proceed()
 
             else:
@@ -132,8 +140,7 @@ class Scanner:
                     "[Error on L{}]: Unexpected character {}".format(self.line_no, c),
                 )
 
-        self.add_token(TokenType.EOF.name)
-        return self.tokens
+        yield self.add_token(TokenType.EOF)
 
     def advance(self):
         """Moves the index to the next character. Returns the previous character."""
@@ -157,12 +164,11 @@ class Scanner:
         type,
         literal=None,
     ):
-        """Creates a Token object and appends it to the list of valid Tokens."""
+        """Creates a Token object for the characters read since the previous token."""
         lexeme = self.src[self.start : self.current]
         self.start = self.current  # starting position of the next token.
 
-        token = Token(type, lexeme, literal, self.line_no)
-        self.tokens.append(token)
+        return Token(type, lexeme, literal, self.line_no)
 
     def add_comment(self, type, literal):
         """Creates Token object and appends it to the list of comments.
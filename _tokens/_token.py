@@ -1,5 +1,12 @@
+from _tokens._token_type import TokenType
+
+
 class Token:
-    """Defines a Token: a combination of a lexeme and literal and it's type. line_no indicates the token's position and will be used for error reporting."""
+    """Defines a Token: a combination of a lexeme and literal and it's type. line_no indicates the token's position and will be used for error reporting.
+    type is the int value of a TokenType. Large sources create millions of tokens, so they're slotted.
+    """
+
+    __slots__ = ("type", "lexeme", "literal", "line_no")
 
     def __init__(self, type, lexeme, literal, line_no):
         self.type = type
@@ -10,7 +17,7 @@ class Token:
     def __str__(self):
         """(Re-formats) printed tokens."""
         token = "{} {} {} L{}".format(
-            self.type,
+            TokenType(self.type).name,
             self.lexeme,
             self.literal,
             self.line_no,
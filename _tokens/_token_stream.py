@@ -0,0 +1,31 @@
+class TokenStream:
+    """Indexable view of the tokens a scanner creates lazily. Tokens are pulled from the
+    scanner as the Parser reaches them and dropped once the Parser releases them, so only
+    the tokens of the declaration being parsed are held in memory."""
+
+    # the Parser looks back at most this many tokens: Parser.block steps back over the
+    # closing } and Parser.consume reports errors on the line of the token before it.
+    KEEP_BEHIND = 2
+
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.window = []
+        self.start = 0  # index of window[0] among all the tokens.
+
+    def __getitem__(self, idx):
+        """Returns the token at idx, scanning up to it if needed."""
+        window_idx = idx - self.start
+        if window_idx < 0:
+            raise IndexError("Token {} was already released.".format(idx))
+
+        while window_idx >= len(self.window):
+            self.window.append(next(self.tokens))
+
+        return self.window[window_idx]
+
+    def release(self, idx):
+        """Drops the tokens before idx that the Parser can no longer look back at."""
+        num_released = idx - self.KEEP_BEHIND - self.start
+        if num_released > 0:
+            del self.window[:num_released]
+            self.start += num_released
@@ -1,10 +1,11 @@
-from enum import Enum
+from enum import IntEnum
 from enum import unique
 
 
 @unique
-class TokenType(Enum):
-    """Valid types for tokens. Any token whose type isn't listed here is invalid."""
+class TokenType(IntEnum):
+    """Valid types for tokens. Any token whose type isn't listed here is invalid.
+    Members are ints, so token types are compared and hashed as ints."""
 
     PLUS = 0  # binary
     MINUS = 1
@@ -0,0 +1,406 @@
+import math
+
+from _asts._expressions.assign_expr import Assignment
+from _asts._expressions.binary_expr import Binary
+from _asts._expressions.literal_expr import Literal
+from _asts._expressions.unary_expr import Unary
+from _asts._statements.if_stmt import IfStatement
+from _function import Function
+from _numbers import Bits
+from _operators import BINARY_OPERATORS
+from _operators import is_truthy
+from _tokens._token_type import TokenType
+from _visitors._expressions.expr_visitor import ExpressionVisitor
+from _visitors._statements.stmt_visitor import StatementVisitor
+
+# operators whose float-float case is emitted inline as the equivalent python operator.
+INLINE_FLOAT_OPERATORS = {
+    TokenType.PLUS: "+",
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+    TokenType.PERCENT: "%",
+    TokenType.EQUAL_EQUAL: "==",
+    TokenType.BANG_EQUAL: "!=",
+    TokenType.GREATER_THAN: ">",
+    TokenType.GREATER_THAN_EQUAL: ">=",
+    TokenType.LESS_THAN: "<",
+    TokenType.LESS_THAN_EQUAL: "<=",
+}
+
+# operators that always evaluate to a bool, so their result needs no truthiness check.
+BOOL_OPERATORS = {
+    TokenType.EQUAL_EQUAL,
+    TokenType.BANG_EQUAL,
+    TokenType.GREATER_THAN,
+    TokenType.GREATER_THAN_EQUAL,
+    TokenType.LESS_THAN,
+    TokenType.LESS_THAN_EQUAL,
+    TokenType.BANG,
+}
+
+
+class Transpiler(ExpressionVisitor, StatementVisitor):
+    """Translates resolved AST nodes into the source of a python function named _main.
+    Statement visitors emit lines of python. Expression visitors return python expressions.
+
+    Plox globals live in the dict _G. Plox locals become python locals. Locals captured
+    by closures become single-item lists (cells) which nested functions receive as
+    keyword defaults, so every environment keeps its own binding like in the Interpreter.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.indent = 0
+        # per Resolver scope: python name per slot, captured slots and the function owning it.
+        self.scopes = []
+        # per function being transpiled: cells it reads from enclosing functions.
+        self.free_cells = []
+        # loops enclosing the current statement, within the current function.
+        self.num_loops = 0
+        self.num_names = 0
+
+    def transpile(self, stmts):
+        """Translates every AST node representing a statement into python source."""
+        self.free_cells.append(set())
+        self.emit("def _main():")
+        self.indent += 1
+        for stmt in stmts:
+            self.transpile_stmt(stmt)
+
+        self.emit("return None")
+        return "\n".join(self.lines) + "\n"
+
+    def transpile_stmt(self, stmt):
+        if stmt is None:
+            # the parser emits None for statements it failed to parse.
+            raise SyntaxError("Can't transpile a statement that failed to parse.")
+
+        stmt.accept(self)
+
+    def transpile_expr(self, expr):
+        return expr.accept(self)
+
+    def transpile_body(self, stmt):
+        """Emits the indented body of a compound python statement."""
+        self.indent += 1
+        num_lines = len(self.lines)
+        self.transpile_stmt(stmt)
+        if len(self.lines) == num_lines:
+            self.emit("pass")
+        self.indent -= 1
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def unique_name(self, name):
+        """Creates a python identifier that can't clash with any other."""
+        self.num_names += 1
+        return "{}_{}".format(name, self.num_names)
+
+    def temp(self):
+        """Creates a python local holding an intermediate value."""
+        self.num_names += 1
+        return "_t{}".format(self.num_names)
+
+    def begin_scope(self, captured_slots, param_slots=()):
+        function_idx = len(self.free_cells) - 1
+        names = {}
+        self.scopes.append((names, captured_slots, function_idx))
+        # closures declared in the scope can capture locals declared after them, so every
+        # captured local's cell exists before any of them. params are wrapped once declared.
+        for slot, name in sorted(captured_slots.items()):
+            if slot not in param_slots:
+                names[slot] = self.unique_name(name)
+                self.emit("{} = [None]".format(names[slot]))
+
+    def end_scope(self):
+        self.scopes.pop()
+
+    def declare(self, name, slot):
+        """Returns the python name of a local and whether closures capture it."""
+        names, captured_slots, _ = self.scopes[-1]
+        if slot not in names:
+            names[slot] = self.unique_name(name)
+
+        return names[slot], slot in captured_slots
+
+    def lookup(self, depth, slot):
+        """Returns the python name of a resolved local and whether closures capture it."""
+        names, captured_slots, function_idx = self.scopes[len(self.scopes) - 1 - depth]
+        name = names[slot]
+        is_captured = slot in captured_slots
+        if is_captured:
+            # every function between the reference and the binding passes the cell down.
+            for idx in range(function_idx + 1, len(self.free_cells)):
+                self.free_cells[idx].add(name)
+
+        return name, is_captured
+
+    def truthy(self, expr):
+        """Returns a python expression that is True when expr is truthy in plox."""
+        code = self.transpile_expr(expr)
+        if isinstance(expr, Literal):
+            return repr(is_truthy(expr.value))
+
+        is_bool = (
+            isinstance(expr, (Binary, Unary)) and expr.operator.type in BOOL_OPERATORS
+        )
+        if is_bool:
+            return code
+
+        value = self.temp()
+        return "not (({0} := {1}) is None or {0} == 0)".format(value, code)
+
+    def visit_while_stmt(self, while_stmt):
+        self.transpile_loop(while_stmt.condition, while_stmt.body)
+
+    def visit_for_stmt(self, for_stmt):
+        if for_stmt.initializer is not None:
+            self.transpile_stmt(for_stmt.initializer)
+
+        self.transpile_loop(for_stmt.condition, for_stmt.body, for_stmt.update)
+
+    def transpile_loop(self, condition, body, update=None):
+        """Emits a python while loop. update is evaluated at the end of every iteration."""
+        self.emit("while {}:".format(self.truthy(condition)))
+        self.num_loops += 1
+        self.transpile_body(body)
+        if update is not None:
+            self.indent += 1
+            self.emit_expression(update)
+            self.indent -= 1
+        self.num_loops -= 1
+
+    def visit_if_stmt(self, if_stmt, keyword="if"):
+        self.emit("{} {}:".format(keyword, self.truthy(if_stmt.condition)))
+        self.transpile_body(if_stmt.then_branch)
+
+        else_branch = if_stmt.else_branch
+        if isinstance(else_branch, IfStatement):
+            # else if chains become elif so they don't nest python blocks.
+            self.visit_if_stmt(else_branch, keyword="elif")
+        elif else_branch is not None:
+            self.emit("else:")
+            self.transpile_body(else_branch)
+
+    def visit_print_stmt(self, print_stmt):
+        self.emit("_print({})".format(self.transpile_expr(print_stmt.expression)))
+
+    def visit_return_stmt(self, return_stmt):
+        if len(self.free_cells) == 1:
+            raise SyntaxError("Can't use return outside function.")
+
+        value = return_stmt.expression
+        self.emit(
+            "return {}".format("None" if value is None else self.transpile_expr(value))
+        )
+
+    def visit_break_stmt(self, break_stmt):
+        if self.num_loops == 0:
+            raise SyntaxError(
+                "[Error on L{}]: Can't use break outside loop.".format(
+                    break_stmt.keyword.line_no
+                )
+            )
+
+        self.emit("break")
+
+    def visit_block(self, block):
+        self.begin_scope(block.captured_slots)
+        for stmt in block.statements:
+            self.transpile_stmt(stmt)
+        self.end_scope()
+
+    def visit_variable_stmt(self, variable_stmt):
+        initializer = variable_stmt.initializer
+        value = "None" if initializer is None else self.transpile_expr(initializer)
+        self.define(variable_stmt.identifier.lexeme, variable_stmt.slot, value)
+
+    def define(self, name, slot, value):
+        """Emits the binding of a declared variable or function."""
+        if slot is None:
+            self.emit("_G[{!r}] = {}".format(name, value))
+            return
+
+        py_name, is_captured = self.declare(name, slot)
+        if is_captured:
+            self.emit("{}[0] = {}".format(py_name, value))
+        else:
+            self.emit("{} = {}".format(py_name, value))
+
+    def visit_function_stmt(self, function_stmt):
+        name, params = function_stmt.name, function_stmt.params
+        max_params = Function.MAX_PARAMS
+        if len(params) > max_params:
+            raise ValueError(
+                "Too many params in the {} function. Max params: {}.".format(
+                    name, max_params
+                )
+            )
+
+        enclosing_lines, enclosing_num_loops = self.lines, self.num_loops
+        self.lines, self.num_loops = [], 0
+        self.indent += 1
+        self.free_cells.append(set())
+        param_slots = function_stmt.param_slots
+        self.begin_scope(function_stmt.captured_slots, param_slots)
+
+        for param, slot in zip(params, param_slots):
+            self.declare(param.name, slot)
+
+        names, captured_slots, _ = self.scopes[-1]
+        has_duplicates = len(set(param_slots)) != len(param_slots)
+        if has_duplicates:
+            # the last of the duplicated params wins, like in the Interpreter.
+            param_names = ["_p{}".format(idx) for idx in range(len(param_slots))]
+            for param_name, slot in zip(param_names, param_slots):
+                self.emit("{} = {}".format(names[slot], param_name))
+        else:
+            param_names = [names[slot] for slot in param_slots]
+
+        for slot in sorted(set(param_slots) & captured_slots.keys()):
+            self.emit("{0} = [{0}]".format(names[slot]))
+
+        for stmt in function_stmt.body:
+            self.transpile_stmt(stmt)
+        self.emit("return None")  # default return for functions w/o a return statement
+
+        self.end_scope()
+        free_cells = sorted(self.free_cells.pop())
+        self.indent -= 1
+        body_lines, self.lines = self.lines, enclosing_lines
+        self.num_loops = enclosing_num_loops
+
+        def_name = self.unique_name("_" + name)
+        signature = param_names + (
+            ["*"] + ["{0}={0}".format(cell) for cell in free_cells]
+            if free_cells
+            else []
+        )
+        self.emit("def {}({}):".format(def_name, ", ".join(signature)))
+        self.lines.extend(body_lines)
+
+        function = "_Function({}, {!r}, {}, {})".format(
+            def_name, name, len(params), function_stmt.line_no
+        )
+        self.define(name, function_stmt.slot, function)
+
+    def visit_expression_stmt(self, expression_stmt):
+        self.emit_expression(expression_stmt.expression)
+
+    def emit_expression(self, expression):
+        """Emits an expression evaluated for its side effects."""
+        is_local_assignment = (
+            isinstance(expression, Assignment) and expression.depth is not None
+        )
+        if is_local_assignment:
+            # a plain python assignment statement. cheaper than an assignment expression.
+            name, is_captured = self.lookup(expression.depth, expression.slot)
+            target = "{}[0]".format(name) if is_captured else name
+            self.emit("{} = {}".format(target, self.transpile_expr(expression.value)))
+            return
+
+        self.emit(self.transpile_expr(expression))
+
+    def visit_ternary_expr(self, ternary_expr):
+        return "({} if {} else {})".format(
+            self.transpile_expr(ternary_expr.second),
+            self.truthy(ternary_expr.first),
+            self.transpile_expr(ternary_expr.third),
+        )
+
+    def visit_assignment_expr(self, assignment_expr):
+        value = self.transpile_expr(assignment_expr.value)
+        if assignment_expr.depth is None:
+            return "_assign_global({!r}, {})".format(assignment_expr.name, value)
+
+        name, is_captured = self.lookup(assignment_expr.depth, assignment_expr.slot)
+        if is_captured:
+            return "_set_cell({}, {})".format(name, value)
+
+        return "({} := {})".format(name, value)
+
+    def visit_variable_expr(self, variable_expr):
+        value = self.temp()
+        if variable_expr.depth is None:
+            return "({0} if ({0} := _get({1!r})) is not None else _get_global({1!r}))".format(
+                value, variable_expr.name
+            )
+
+        name, is_captured = self.lookup(variable_expr.depth, variable_expr.slot)
+        if is_captured:
+            name = "{}[0]".format(name)
+
+        return "({0} if ({0} := {1}) is not None else _uninitialized({2!r}))".format(
+            value, name, variable_expr.name
+        )
+
+    def visit_logical_expr(self, logical_expr):
+        left, right = self.temp(), self.temp()
+        left_code = self.transpile_expr(logical_expr.left)
+        right_code = self.transpile_expr(logical_expr.right)
+        left_falsy = "(({0} := {1}) is None or {0} == 0)".format(left, left_code)
+        right_falsy = "(({0} := {1}) is None or {0} == 0)".format(right, right_code)
+
+        if logical_expr.operator.type == TokenType.OR:
+            return "({} if not {} else ({} if not {} else False))".format(
+                left, left_falsy, right, right_falsy
+            )
+
+        return "(False if {} else ({} if not {} else False))".format(
+            left_falsy, left, right_falsy
+        )
+
+    def visit_binary_expr(self, binary_expr):
+        operator = binary_expr.operator
+        left_code = self.transpile_expr(binary_expr.left)
+        right_code = self.transpile_expr(binary_expr.right)
+        function = "_" + BINARY_OPERATORS[operator.type].__name__
+
+        if operator.type in INLINE_FLOAT_OPERATORS:
+            left, right = self.temp(), self.temp()
+            return "({0} {1} {2} if type({0} := {3}) is type({2} := {4}) is float else {5}({0}, {2}, {6}))".format(
+                left,
+                INLINE_FLOAT_OPERATORS[operator.type],
+                right,
+                left_code,
+                right_code,
+                function,
+                operator.line_no,
+            )
+
+        return "{}({}, {}, {})".format(
+            function, left_code, right_code, operator.line_no
+        )
+
+    def visit_group_expr(self, group_expr):
+        return "({})".format(self.transpile_expr(group_expr.expression))
+
+    def visit_literal_expr(self, literal_expr):
+        value = literal_expr.value
+        if type(value) is int:
+            # transpiled code only works with float numbers: its float operators are inlined.
+            return repr(float(value))
+
+        if type(value) is Bits:
+            return "_Bits({!r})".format(int(value))
+
+        if isinstance(value, float) and not math.isfinite(value):
+            return "float({!r})".format(repr(value))
+
+        return repr(value)
+
+    def visit_unary_expr(self, unary_expr):
+        if unary_expr.operator.type == TokenType.BANG:
+            return "(not {})".format(self.truthy(unary_expr.right))
+
+        # unary minus doesn't check its operand, but bools are negated by _negate.
+        right = self.temp()
+        return "(-{0} if type({0} := {1}) is float else _negate({0}, {2}))".format(
+            right, self.transpile_expr(unary_expr.right), unary_expr.operator.line_no
+        )
+
+    def visit_call_expr(self, call_expr):
+        callee = self.transpile_expr(call_expr.callee)
+        arguments = [self.transpile_expr(argument) for argument in call_expr.arguments]
+        return "_call({})".format(", ".join([callee] + arguments))
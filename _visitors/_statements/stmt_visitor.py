@@ -7,6 +7,10 @@ class StatementVisitor(ABC):
     def visit_while_stmt(self, while_stmt):
         raise NotImplementedError
 
+    @abstractmethod
+    def visit_for_stmt(self, for_stmt):
+        raise NotImplementedError
+
     @abstractmethod
     def visit_if_stmt(self, if_stmt):
         raise NotImplementedError
@@ -0,0 +1,338 @@
+import sys
+
+from _callable import Callable
+from _environment import Environment
+from _opcodes import OpCode
+import _operators
+from _output import Output
+
+# opcodes are compared as plain ints in the dispatch loop.
+CONSTANT = OpCode.CONSTANT.value
+POP = OpCode.POP.value
+GET_GLOBAL = OpCode.GET_GLOBAL.value
+SET_GLOBAL = OpCode.SET_GLOBAL.value
+DEFINE_GLOBAL = OpCode.DEFINE_GLOBAL.value
+GET_LOCAL = OpCode.GET_LOCAL.value
+SET_LOCAL = OpCode.SET_LOCAL.value
+DEFINE_LOCAL = OpCode.DEFINE_LOCAL.value
+ADD = OpCode.ADD.value
+SUBTRACT = OpCode.SUBTRACT.value
+MULTIPLY = OpCode.MULTIPLY.value
+DIVIDE = OpCode.DIVIDE.value
+MODULO = OpCode.MODULO.value
+POWER = OpCode.POWER.value
+BITWISE_OR = OpCode.BITWISE_OR.value
+BITWISE_AND = OpCode.BITWISE_AND.value
+EQUAL = OpCode.EQUAL.value
+NOT_EQUAL = OpCode.NOT_EQUAL.value
+GREATER_THAN = OpCode.GREATER_THAN.value
+GREATER_THAN_EQUAL = OpCode.GREATER_THAN_EQUAL.value
+LESS_THAN = OpCode.LESS_THAN.value
+LESS_THAN_EQUAL = OpCode.LESS_THAN_EQUAL.value
+NOT = OpCode.NOT.value
+NEGATE = OpCode.NEGATE.value
+JUMP = OpCode.JUMP.value
+JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+JUMP_IF_TRUE_OR_POP = OpCode.JUMP_IF_TRUE_OR_POP.value
+JUMP_IF_FALSE_OR_FALSE = OpCode.JUMP_IF_FALSE_OR_FALSE.value
+FALSE_IF_FALSY = OpCode.FALSE_IF_FALSY.value
+AND_RESULT = OpCode.AND_RESULT.value
+PRINT = OpCode.PRINT.value
+PUSH_ENV = OpCode.PUSH_ENV.value
+POP_ENV = OpCode.POP_ENV.value
+MAKE_FUNCTION = OpCode.MAKE_FUNCTION.value
+CALL = OpCode.CALL.value
+RETURN = OpCode.RETURN.value
+
+# binary operators without a fast path for float operands.
+SLOW_BINARY_OPERATORS = {
+    DIVIDE: _operators.divide,
+    MODULO: _operators.modulo,
+    POWER: _operators.power,
+    BITWISE_OR: _operators.bitwise_or,
+    BITWISE_AND: _operators.bitwise_and,
+    NOT_EQUAL: _operators.not_equal,
+    GREATER_THAN: _operators.greater_than,
+    GREATER_THAN_EQUAL: _operators.greater_than_equal,
+    LESS_THAN_EQUAL: _operators.less_than_equal,
+}
+
+
+class VMFunction(Callable):
+    """Creates the runtime object for a plox function compiled to bytecode."""
+
+    def __init__(self, prototype, closure):
+        self.prototype = prototype
+        self.closure = closure
+
+    def arity(self):
+        """Computes the number of params in a function declaration."""
+        return len(self.prototype.param_slots)
+
+    def call(self, arguments, vm):
+        """Calls the function from outside of bytecode e.g. when embedding the VM."""
+        return vm.execute(self.prototype.chunk, self.bind(arguments))
+
+    def bind(self, arguments):
+        """Creates the environment for a call. Functions without locals run in their closure."""
+        prototype = self.prototype
+        if not prototype.num_slots:
+            return self.closure
+
+        environment = Environment(self.closure, prototype.num_slots)
+        slots = environment.slots
+        for slot, arg in zip(prototype.param_slots, arguments):
+            slots[slot] = arg
+
+        return environment
+
+    def __str__(self):
+        """String representation of a plox function."""
+        return str(self.prototype)
+
+
+class VM:
+    """Executes bytecode emitted by the Compiler on a value stack.
+    Calls between plox functions push frames onto a list rather than the python stack,
+    at most as many as python's recursion limit, like the tree interpreter.
+    """
+
+    def __init__(self, output=None):
+        # persists across every chunk run in batch or interactive mode.
+        self.globals = Environment()
+        # where print instructions write to.
+        self.output = Output() if output is None else output
+
+    def run(self, chunk, globals_env=None):
+        """Executes a chunk compiled from a whole program.
+        If globals_env is given, it holds the globals instead of the instance's own."""
+        if globals_env is not None:
+            own_globals, self.globals = self.globals, globals_env
+            try:
+                return self.run(chunk)
+            finally:
+                self.globals = own_globals
+
+        with self.output:
+            self.execute(chunk, self.globals)
+
+    def execute(self, chunk, environment):
+        """Runs chunk until it returns from its outermost frame. Returns the returned value."""
+        globals_env = self.globals
+        bindings = globals_env.bindings
+        is_truthy = _operators.is_truthy
+        to_printable = _operators.to_printable
+        write_line = self.output.write_line
+        max_frames = sys.getrecursionlimit()
+
+        code, constants, ip, env = chunk.code, chunk.constants, 0, environment
+        frames = []
+        stack = []
+        push, pop = stack.append, stack.pop
+
+        while True:
+            op = code[ip]
+
+            if op == GET_LOCAL:
+                hops = code[ip + 1]
+                target = env
+                while hops:
+                    target = target.enclosing
+                    hops -= 1
+
+                value = target.slots[code[ip + 2]]
+                if value is None:
+                    # reports the uninitialized variable.
+                    target.get_at(0, code[ip + 2], constants[code[ip + 3]])
+
+                push(value)
+                ip += 4
+
+            elif op == CONSTANT:
+                push(constants[code[ip + 1]])
+                ip += 2
+
+            elif op == GET_GLOBAL:
+                value = bindings.get(constants[code[ip + 1]])
+                if value is None:
+                    # reports the undefined/uninitialized variable.
+                    value = globals_env.get(constants[code[ip + 1]])
+
+                push(value)
+                ip += 2
+
+            elif op == JUMP_IF_FALSE:
+                value = pop()
+                if value is None or value == 0:  # inlined is_truthy
+                    ip = code[ip + 1]
+                else:
+                    ip += 2
+
+            elif op == ADD:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left + right
+                else:
+                    stack[-1] = _operators.add(left, right, code[ip + 1])
+                ip += 2
+
+            elif op == SUBTRACT:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left - right
+                else:
+                    stack[-1] = _operators.subtract(left, right, code[ip + 1])
+                ip += 2
+
+            elif op == MULTIPLY:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left * right
+                else:
+                    stack[-1] = _operators.multiply(left, right, code[ip + 1])
+                ip += 2
+
+            elif op == LESS_THAN:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left < right
+                else:
+                    stack[-1] = _operators.less_than(left, right, code[ip + 1])
+                ip += 2
+
+            elif op == EQUAL:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left == right
+                else:
+                    stack[-1] = _operators.equal(left, right, code[ip + 1])
+                ip += 2
+
+            elif op in SLOW_BINARY_OPERATORS:
+                right = pop()
+                stack[-1] = SLOW_BINARY_OPERATORS[op](stack[-1], right, code[ip + 1])
+                ip += 2
+
+            elif op == SET_LOCAL:
+                hops = code[ip + 1]
+                target = env
+                while hops:
+                    target = target.enclosing
+                    hops -= 1
+
+                target.slots[code[ip + 2]] = stack[-1]
+                ip += 3
+
+            elif op == POP:
+                pop()
+                ip += 1
+
+            elif op == JUMP:
+                ip = code[ip + 1]
+
+            elif op == CALL:
+                num_args = code[ip + 1]
+                callee = stack[-num_args - 1]
+                if type(callee) is not VMFunction:
+                    raise TypeError(
+                        "Can't call object of type {}".format(
+                            _operators.plox_type(callee)
+                        )
+                    )
+
+                if len(callee.prototype.param_slots) != num_args:
+                    raise ValueError(
+                        "Parameters declared do not match arguments passed in {}".format(
+                            callee
+                        )
+                    )
+
+                if len(frames) >= max_frames:
+                    raise RecursionError("maximum recursion depth exceeded")
+
+                arguments = stack[len(stack) - num_args :]
+                del stack[-num_args - 1 :]
+                frames.append((code, constants, ip + 2, env))
+                env = callee.bind(arguments)
+                chunk = callee.prototype.chunk
+                code, constants, ip = chunk.code, chunk.constants, 0
+
+            elif op == RETURN:
+                if not frames:
+                    return pop()
+
+                # the return value stays on the stack for the caller.
+                code, constants, ip, env = frames.pop()
+
+            elif op == SET_GLOBAL:
+                name = constants[code[ip + 1]]
+                if name in bindings:
+                    bindings[name] = stack[-1]
+                else:
+                    # reports the undefined variable.
+                    globals_env.assign(name, stack[-1])
+                ip += 2
+
+            elif op == DEFINE_LOCAL:
+                env.slots[code[ip + 1]] = pop()
+                ip += 2
+
+            elif op == DEFINE_GLOBAL:
+                bindings[constants[code[ip + 1]]] = pop()
+                ip += 2
+
+            elif op == PUSH_ENV:
+                env = Environment(env, code[ip + 1])
+                ip += 2
+
+            elif op == POP_ENV:
+                env = env.enclosing
+                ip += 1
+
+            elif op == PRINT:
+                write_line(to_printable(pop()))
+                ip += 1
+
+            elif op == NOT:
+                stack[-1] = not is_truthy(stack[-1])
+                ip += 2
+
+            elif op == NEGATE:
+                stack[-1] = _operators.negate(stack[-1], code[ip + 1])
+                ip += 2
+
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if is_truthy(stack[-1]):
+                    ip = code[ip + 1]
+                else:
+                    pop()
+                    ip += 2
+
+            elif op == FALSE_IF_FALSY:
+                if not is_truthy(stack[-1]):
+                    stack[-1] = False
+                ip += 1
+
+            elif op == JUMP_IF_FALSE_OR_FALSE:
+                if not is_truthy(stack[-1]):
+                    stack[-1] = False
+                    ip = code[ip + 1]
+                else:
+                    ip += 2
+
+            elif op == AND_RESULT:
+                if not is_truthy(pop()):
+                    stack[-1] = False
+                ip += 1
+
+            elif op == MAKE_FUNCTION:
+                push(VMFunction(constants[code[ip + 1]], env))
+                ip += 2
+
+            else:
+                raise RuntimeError("Unknown opcode {}".format(op))
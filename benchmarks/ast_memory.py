@@ -0,0 +1,56 @@
+"""
+Benchmark: memory taken by the AST of a large program, in total and per node.
+Only the nodes are measured: the tokens they point to are created before tracing starts.
+
+usage: python benchmarks/ast_memory.py [--size KB]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _asts.visitor_interface import VisitorInterface
+from _fast_scanner import FastScanner
+from _parser import Parser
+from scanner import synthetic_source
+
+
+def count_nodes(value):
+    """Counts the AST nodes reachable from value: a node, or a list of them."""
+    if isinstance(value, list):
+        return sum(count_nodes(item) for item in value)
+
+    if not isinstance(value, VisitorInterface):
+        return 0
+
+    fields = [getattr(value, name) for name in type(value).__slots__]
+    return 1 + sum(count_nodes(field) for field in fields)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--size", type=int, default=1024)
+    size_kb = arg_parser.parse_args().size
+
+    src = synthetic_source(size_kb)
+    tokens = FastScanner(src).scan()
+
+    tracemalloc.start()
+    stmts = Parser(tokens).parse()
+    ast_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    num_nodes = count_nodes(stmts)
+    print("source: {:.1f} MB".format(len(src) / 1024 / 1024))
+    print(
+        "AST: {} nodes, {:.1f} MB, {:.0f} bytes/node".format(
+            num_nodes, ast_size / 1024 / 1024, ast_size / num_nodes
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: running many small plox scripts, one python process per script versus
+a batch of them on a pool of worker processes (plox.py --jobs).
+
+usage: python benchmarks/batch.py [--scripts N] [--jobs N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLOX = os.path.join(ROOT, "plox.py")
+
+SCRIPT = """
+fun fib(n) {{
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}}
+print fib({});
+"""
+
+
+def time_command(command):
+    start = time.perf_counter()
+    subprocess.run(command, check=False, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--scripts", type=int, default=100)
+    arg_parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        paths = []
+        for i in range(args.scripts):
+            path = os.path.join(dir_path, "script{}.plox".format(i))
+            with open(path, "w") as f:
+                f.write(SCRIPT.format(10 + i % 5))
+            paths.append(path)
+
+        runs = [
+            (
+                "processes",
+                lambda: sum(
+                    time_command([sys.executable, PLOX, "-s", path, "--no-cache"])
+                    for path in paths
+                ),
+            ),
+            (
+                "--jobs 1",
+                lambda: time_command(
+                    [sys.executable, PLOX, "-s", dir_path, "--jobs", "1", "--no-cache"]
+                ),
+            ),
+            (
+                "--jobs {}".format(args.jobs),
+                lambda: time_command(
+                    [
+                        sys.executable,
+                        PLOX,
+                        "-s",
+                        dir_path,
+                        "--jobs",
+                        str(args.jobs),
+                        "--no-cache",
+                    ]
+                ),
+            ),
+        ]
+
+        print("{} scripts".format(args.scripts))
+        print("{:<12} {:>10} {:>12}".format("run", "seconds", "scripts/s"))
+        for name, run in runs:
+            seconds = run()
+            print(
+                "{:<12} {:>10.3f} {:>12.1f}".format(
+                    name, seconds, args.scripts / seconds
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
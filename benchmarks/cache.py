@@ -0,0 +1,59 @@
+"""
+Benchmark: cold vs warm start of a large script with the on-disk program cache.
+Cold runs scan, parse and resolve the script and write the cache. Warm runs load the cache.
+Only getting the ASTs is timed: the script isn't executed.
+
+usage: python benchmarks/cache.py [--size KB] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _cache import ProgramCache
+from plox import Plox
+from scanner import synthetic_source
+
+
+def time_start(plox, src_fp, src, is_cold):
+    """Times getting the resolved ASTs of src the way Plox.run_file does."""
+    cache = ProgramCache(src_fp)
+    if is_cold:
+        cache.clear()
+
+    start = time.perf_counter()
+    asts = cache.load(src)
+    if asts is None:
+        asts = plox.analyze(src)
+        cache.store(src, asts)
+
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--size", type=int, default=1024)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    src = synthetic_source(args.size)
+    plox = Plox(fast_scan=True)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_fp = os.path.join(tmp_dir, "large.plox")
+        with open(src_fp, "w") as f:
+            f.write(src)
+
+        print("source: {:.1f} MB".format(len(src) / 1024 / 1024))
+        for label, is_cold in [("cold", True), ("warm", False)]:
+            timings = [
+                time_start(plox, src_fp, src, is_cold) for _ in range(args.repeat)
+            ]
+            print("{}: {:.3f}s (best)".format(label, min(timings)))
+
+
+if __name__ == "__main__":
+    main()
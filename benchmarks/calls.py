@@ -0,0 +1,80 @@
+"""
+Benchmark: calls inside loops in the tree-walking Interpreter.
+monomorphic call sites always call the same function, so after their first call
+their inline cache skips the callable and arity checks. polymorphic alternates
+between two functions at one call site, so every call misses the cache.
+
+usage: python benchmarks/calls.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _interpreter import Interpreter
+from _parser import Parser
+from _resolver import Resolver
+from _scanner import Scanner
+
+PROGRAMS = {
+    "global": """
+fun add(a, b) { return a + b; }
+var total = 0;
+for (var i = 0; i < 20000; i = i + 1) total = add(total, i);
+""",
+    "local": """
+fun run() {
+    fun add(a, b) { return a + b; }
+    var total = 0;
+    for (var i = 0; i < 20000; i = i + 1) total = add(total, i);
+}
+run();
+""",
+    "no_args": """
+fun tick() { return 1; }
+for (var i = 0; i < 20000; i = i + 1) tick();
+""",
+    "polymorphic": """
+fun inc(a) { return a + 1; }
+fun dec(a) { return a - 1; }
+var total = 0;
+var f = inc;
+for (var i = 0; i < 20000; i = i + 1) {
+    total = f(total);
+    f = i % 2 == 0 ? dec : inc;
+}
+""",
+}
+
+
+def parse(src):
+    """Returns the resolved ASTs of a program."""
+    stmts = Parser(Scanner(src).scan()).parse()
+    Resolver().resolve(stmts)
+    return stmts
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    repeat = arg_parser.parse_args().repeat
+
+    interpreter = Interpreter()
+    print("{:<16} {:>10} {:>12}".format("program", "ms (best)", "us per call"))
+    for name, src in PROGRAMS.items():
+        stmts = parse(src)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            interpreter.interpret(stmts)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print("{:<16} {:>10.1f} {:>12.2f}".format(name, best * 1e3, best / 20000 * 1e6))
+
+
+if __name__ == "__main__":
+    main()
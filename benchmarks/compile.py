@@ -0,0 +1,66 @@
+"""
+Benchmark: running a small rule many times with different inputs, through Plox.run, which
+scans, parses and resolves the source on every run, versus a Program compiled once by
+Plox.compile and executed with the inputs as its globals.
+
+usage: python benchmarks/compile.py [--runs N] [--engine tree|vm|python]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _output import Output
+from plox import Plox
+
+RULE = """
+fun risk(amount, country) {
+    var score = 0;
+    if (amount > 1000) score = score + 10;
+    if (amount > 10000) score = score + 40;
+    if (country == 7) score = score + 25;
+    return score;
+}
+var score = risk(amount, country);
+if (score > 30) print "review";
+"""
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=20000)
+    arg_parser.add_argument("--engine", choices=Plox.ENGINES, default="tree")
+    args = arg_parser.parse_args()
+
+    inputs = [(float(i * 37 % 20000), float(i % 10)) for i in range(args.runs)]
+    plox = Plox(engine=args.engine, output=Output(io.StringIO()))
+
+    start = time.perf_counter()
+    for amount, country in inputs:
+        plox.run(
+            "var amount = {!r}; var country = {!r};".format(amount, country) + RULE
+        )
+    run_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = plox.compile(RULE)
+    for amount, country in inputs:
+        program.execute(globals={"amount": amount, "country": country})
+    execute_seconds = time.perf_counter() - start
+
+    print("{} runs, {} engine".format(args.runs, args.engine))
+    print("{:<10} {:>10} {:>10}".format("api", "seconds", "us/run"))
+    for name, seconds in [("run", run_seconds), ("execute", execute_seconds)]:
+        print(
+            "{:<10} {:>10.3f} {:>10.1f}".format(
+                name, seconds, seconds / args.runs * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
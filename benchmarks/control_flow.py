@@ -0,0 +1,83 @@
+"""
+Benchmark: cost of return and break in the tree-walking Interpreter.
+fib is dominated by calls and returns, breaks by loops that end in a break
+and tail_calls by returns of calls, which don't nest python frames.
+
+usage: python benchmarks/control_flow.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _interpreter import Interpreter
+from _parser import Parser
+from _resolver import Resolver
+from _scanner import Scanner
+
+PROGRAMS = {
+    "fib": """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}
+fib(20);
+""",
+    "breaks": """
+var total = 0;
+for (var i = 0; i < 20000; i = i + 1) {
+    while (true) {
+        total = total + 1;
+        break;
+    }
+}
+""",
+    "early_return": """
+fun find(n) {
+    for (var i = 0; i < 100; i = i + 1) {
+        if (i == n) return i;
+    }
+    return -1;
+}
+for (var j = 0; j < 2000; j = j + 1) find(5);
+""",
+    "tail_calls": """
+fun count(n, acc) {
+    if (n == 0) return acc;
+    return count(n - 1, acc + 1);
+}
+for (var j = 0; j < 50; j = j + 1) count(200, 0);
+""",
+}
+
+
+def parse(src):
+    """Returns the resolved ASTs of a program."""
+    stmts = Parser(Scanner(src).scan()).parse()
+    Resolver().resolve(stmts)
+    return stmts
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    repeat = arg_parser.parse_args().repeat
+
+    interpreter = Interpreter()
+    print("{:<16} {:>10}".format("program", "ms (best)"))
+    for name, src in PROGRAMS.items():
+        stmts = parse(src)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            interpreter.interpret(stmts)
+            timings.append(time.perf_counter() - start)
+
+        print("{:<16} {:>10.1f}".format(name, min(timings) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
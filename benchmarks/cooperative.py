@@ -0,0 +1,96 @@
+"""
+Benchmark: the cost of running under a Budget, and how long the event loop waits for plox
+programs sharing it through Plox.run_async, per slice size.
+
+usage: python benchmarks/cooperative.py [--tasks N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _budget import Budget
+from _output import Output
+from plox import Plox
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs")
+PROGRAMS = ["fib.plox", "nested_loops.plox", "closures.plox"]
+
+TASK = """
+var total = 0;
+for (var i = 0; i < 30000; i = i + 1) {
+    total = total + i % 7;
+}
+print total;
+"""
+
+
+def time_run(src, budget, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        plox = Plox(output=Output(io.StringIO()), budget=budget)
+        start = time.perf_counter()
+        plox.run(src)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+async def heartbeat(gaps, done):
+    """Measures how long the event loop goes without running this task."""
+    last = time.perf_counter()
+    while not done.is_set():
+        await asyncio.sleep(0)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def run_tasks(tasks, slice_steps):
+    gaps, done = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(gaps, done))
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            Plox(
+                output=Output(io.StringIO()), budget=Budget(slice_steps=slice_steps)
+            ).run_async(TASK)
+            for _ in range(tasks)
+        )
+    )
+    seconds = time.perf_counter() - start
+    done.set()
+    await beat
+    return seconds, max(gaps)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--tasks", type=int, default=8)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print("{:<20} {:>10} {:>10}".format("program", "plain", "budget"))
+    for name in PROGRAMS:
+        with open(os.path.join(PROGRAMS_DIR, name)) as f:
+            src = f.read()
+
+        plain = time_run(src, None, args.repeat)
+        budgeted = time_run(src, Budget(), args.repeat)
+        print("{:<20} {:>9.3f}s {:>9.3f}s".format(name, plain, budgeted))
+
+    print()
+    print("{} tasks on one event loop".format(args.tasks))
+    print("{:<12} {:>10} {:>14}".format("slice", "seconds", "max wait ms"))
+    for slice_steps in [100, 1000, 10000]:
+        seconds, max_gap = asyncio.run(run_tasks(args.tasks, slice_steps))
+        print("{:<12} {:>10.3f} {:>14.2f}".format(slice_steps, seconds, max_gap * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: memoization of pure plox functions in the tree-walking Interpreter.
+Every program runs without memoization and with a Memoizer of the given size.
+
+usage: python benchmarks/memo.py [--repeat N] [--size N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _interpreter import Interpreter
+from _memo import Memoizer
+from _parser import Parser
+from _purity import PurityAnalyzer
+from _resolver import Resolver
+from _scanner import Scanner
+
+PROGRAMS = {
+    "fib": """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}
+fib(20);
+""",
+    "is_even": """
+fun is_even(n) {
+    return (n % 2) == 0;
+}
+for (var i = 0; i < 20000; i = i + 1) is_even(i % 10);
+""",
+    "no_repeats": """
+fun square(n) {
+    return n * n;
+}
+for (var i = 0; i < 20000; i = i + 1) square(i);
+""",
+}
+
+
+def parse(src):
+    """Returns the resolved and analyzed ASTs of a program."""
+    stmts = Parser(Scanner(src).scan()).parse()
+    Resolver().resolve(stmts)
+    PurityAnalyzer().analyze(stmts)
+    return stmts
+
+
+def time_run(interpreter, stmts):
+    start = time.perf_counter()
+    interpreter.interpret(stmts)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--size", type=int, default=256)
+    args = arg_parser.parse_args()
+
+    print(
+        "{:<12} {:>10} {:>10} {:>9}".format(
+            "program", "off (ms)", "memo (ms)", "speedup"
+        )
+    )
+    for name, src in PROGRAMS.items():
+        stmts = parse(src)
+        off, memo = [], []
+        for _ in range(args.repeat):
+            off.append(time_run(Interpreter(), stmts))
+            # a new Memoizer (and new functions) per run so no run starts with a warm cache.
+            memo.append(time_run(Interpreter(Memoizer(args.size)), stmts))
+
+        print(
+            "{:<12} {:>10.1f} {:>10.1f} {:>8.1f}x".format(
+                name, min(off) * 1e3, min(memo) * 1e3, min(off) / min(memo)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
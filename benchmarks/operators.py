@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: per-operator evaluation cost in the tree-walking Interpreter.
+Every operator is evaluated on literal operands so the cost measured is the
+operator dispatch and the operation itself.
+
+usage: python benchmarks/operators.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _interpreter import Interpreter
+from _parser import Parser
+from _resolver import Resolver
+from _scanner import Scanner
+
+EXPRESSIONS = [
+    "7 | 8",
+    "6 & 3",
+    "1 + 2",
+    '"a" + "b"',
+    '1 + "b"',
+    "3 - 2",
+    "3 / 2",
+    "3 * 2",
+    "7 % 3",
+    "1 != 2",
+    "1 == 2",
+    "1 > 2",
+    "1 >= 2",
+    "1 < 2",
+    "1 <= 2",
+    "2 ^ 3",
+    "-2",
+    "!true",
+    "true and false",
+    "false or true",
+]
+
+
+def parse_expression(src):
+    """Returns the resolved AST node of a single expression."""
+    tokens = Scanner(src + ";").scan()
+    stmts = Parser(tokens).parse()
+    Resolver().resolve(stmts)
+    return stmts[0].expression
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--number", type=int, default=200000)
+    number = arg_parser.parse_args().number
+
+    interpreter = Interpreter()
+    print("{:<16} {:>10}".format("expression", "ns/eval"))
+    for src in EXPRESSIONS:
+        expr = parse_expression(src)
+        evaluate = interpreter.evaluate
+        seconds = min(timeit.repeat(lambda: evaluate(expr), number=number, repeat=3))
+        print("{:<16} {:>10.1f}".format(src, seconds / number * 1e9))
+
+
+if __name__ == "__main__":
+    main()
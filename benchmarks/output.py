@@ -0,0 +1,72 @@
+"""
+Benchmark: printing many lines, one builtin print() per line versus the buffered Output
+with each flush policy.
+
+usage: python benchmarks/output.py [--lines N] [--engine tree|vm|python] [--sink devnull|memory]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _output import Output
+from plox import Plox
+
+PROGRAM = """
+for (var i = 1; i <= {}; i = i + 1) {{
+    if (i % 15 == 0) print "fizzbuzz";
+    else if (i % 3 == 0) print "fizz";
+    else if (i % 5 == 0) print "buzz";
+    else print i;
+}}
+"""
+
+
+class PrintOutput(Output):
+    """Writes every line with the builtin print, as plox did before Output existed."""
+
+    def write_line(self, value):
+        print(value, file=self.target())
+
+
+def time_run(engine, src, output):
+    start = time.perf_counter()
+    Plox(engine=engine, output=output).run(src)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--lines", type=int, default=300000)
+    arg_parser.add_argument("--engine", choices=Plox.ENGINES, default="tree")
+    arg_parser.add_argument("--sink", choices=["devnull", "memory"], default="devnull")
+    args = arg_parser.parse_args()
+
+    src = PROGRAM.format(args.lines)
+    outputs = [
+        ("print", lambda stream: PrintOutput(stream, flush="full")),
+        ("line", lambda stream: Output(stream, flush="line")),
+        ("full 8K", lambda stream: Output(stream, flush="full")),
+        ("full 64K", lambda stream: Output(stream, 64 * 1024, flush="full")),
+    ]
+
+    print("{} lines, {} engine, {} sink".format(args.lines, args.engine, args.sink))
+    print("{:<10} {:>10}".format("output", "seconds"))
+    for name, create_output in outputs:
+        if args.sink == "devnull":
+            stream = open(os.devnull, "w")
+        else:
+            stream = io.StringIO()
+
+        with stream:
+            seconds = time_run(args.engine, src, create_output(stream))
+
+        print("{:<10} {:>10.3f}".format(name, seconds))
+
+
+if __name__ == "__main__":
+    main()
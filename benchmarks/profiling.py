@@ -0,0 +1,92 @@
+"""
+Benchmark: overhead of --profile and --sample on call heavy code.
+Every program runs without profiling, with the instrumenting Profiler
+and with the Sampler, interleaved so all three see the same machine load.
+
+usage: python benchmarks/profiling.py [--repeat N] [--rate HZ]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _interpreter import Interpreter
+from _parser import Parser
+from _profiler import Profiler
+from _profiler import ProfilingInterpreter
+from _profiler import Sampler
+from _profiler import SamplingInterpreter
+from _resolver import Resolver
+from _scanner import Scanner
+
+PROGRAMS = {
+    "fib": """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}
+fib(20);
+""",
+    "calls": """
+fun add(a, b) { return a + b; }
+var total = 0;
+for (var i = 0; i < 20000; i = i + 1) total = add(total, i);
+""",
+}
+
+
+def parse(src):
+    """Returns the resolved ASTs of a program."""
+    stmts = Parser(Scanner(src).scan()).parse()
+    Resolver().resolve(stmts)
+    return stmts
+
+
+def time_run(interpreter, stmts):
+    start = time.perf_counter()
+    interpreter.interpret(stmts)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--rate", type=int, default=100)
+    args = arg_parser.parse_args()
+
+    print(
+        "{:<10} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+            "program", "off (ms)", "profile", "overhead", "sample", "overhead"
+        )
+    )
+    for name, src in PROGRAMS.items():
+        timings = {"off": [], "profile": [], "sample": []}
+        for _ in range(args.repeat):
+            # the functions are declared by the program, so each interpreter runs its own ASTs.
+            timings["off"].append(time_run(Interpreter(), parse(src)))
+            profiler = ProfilingInterpreter(Profiler())
+            timings["profile"].append(time_run(profiler, parse(src)))
+
+            sampler = Sampler(args.rate)
+            sampler.start()
+            timings["sample"].append(time_run(SamplingInterpreter(sampler), parse(src)))
+            sampler.stop()
+
+        off, profile, sample = (min(timings[mode]) for mode in timings)
+        print(
+            "{:<10} {:>10.1f} {:>10.1f} {:>9.1f}% {:>10.1f} {:>9.1f}%".format(
+                name,
+                off * 1e3,
+                profile * 1e3,
+                (profile / off - 1) * 100,
+                sample * 1e3,
+                (sample / off - 1) * 100,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Regression checks: runs plox programs whose behaviour changed by mistake at some point on
+every engine and optimization level, and compares what they print with what they should.
+
+usage: python benchmarks/regressions.py [case ...]
+exits with status 1 if any case prints something else.
+"""
+
+import argparse
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _budget import Budget
+from _memo import Memoizer
+from _output import Output
+from plox import Plox
+
+# name -> (source, expected output). errors are printed as "ErrorType: message".
+CASES = {
+    "mutually_recursive_local_functions": (
+        """
+        {
+            fun a(n) { if (n < 1) return "a"; return b(n - 1); }
+            fun b(n) { return a(n); }
+            print a(3);
+        }
+        fun outer() {
+            fun c(n) { if (n < 1) return "c"; return d(n - 1); }
+            fun d(n) { return c(n); }
+            return c(4);
+        }
+        print outer();
+        """,
+        "a\nc\n",
+    ),
+    "local_read_by_closure_declared_before_it": (
+        """
+        {
+            fun f() { return x; }
+            var x = 5;
+            print f();
+        }
+        """,
+        "5.0\n",
+    ),
+    "negated_bools_are_not_numbers": (
+        """
+        print -true;
+        print -false;
+        print -true + 1;
+        """,
+        "-1\n0\nTypeError: ['[Error on L4]: Operands must be both float or both str.']\n",
+    ),
+    "zero_constants_keep_their_sign": (
+        """
+        print -0;
+        print -0 * -1;
+        print 0.5 - 0.5;
+        """,
+        "-0.0\n0.0\n0.0\n",
+    ),
+    "closure_reads_local_declared_after_return": (
+        """
+        var x = "global";
+        fun outer() {
+            fun read() { return x; }
+            return read;
+            var x = "local";
+        }
+        print outer()();
+        """,
+        "Can't access uninitialized/unassigned variable x. "
+        "Initialize thus: x = <value>\nNone\n",
+    ),
+}
+
+
+def run_case(src, engine, opt_level, **options):
+    """Returns what src prints, followed by the error it raised if any."""
+    sink = io.StringIO()
+    try:
+        Plox(engine=engine, opt_level=opt_level, output=Output(sink), **options).run(
+            src
+        )
+    except Exception as e:
+        sink.write("{}: {}\n".format(type(e).__name__, e))
+
+    return sink.getvalue()
+
+
+def check_unbounded_recursion():
+    """Infinite recursion raises RecursionError on every engine instead of exhausting memory."""
+    src = "fun f(n) { return f(n + 1) + 1; } print f(0);"
+    failures = []
+    for engine in Plox.ENGINES:
+        for opt_level in Plox.OPT_LEVELS:
+            actual = run_case(src, engine, opt_level)
+            if not actual.startswith("RecursionError: "):
+                failures.append(
+                    "{} engine, opt level {}: got {!r}".format(
+                        engine, opt_level, actual
+                    )
+                )
+
+    return failures
+
+
+def check_budgeted_program_reruns():
+    """Every run of a compiled program gets the whole budget, not what earlier runs left."""
+    plox = Plox(output=Output(io.StringIO()), budget=Budget(max_steps=150))
+    program = plox.compile("for (var i = 0; i < 100; i = i + 1) {}")
+    failures = []
+    for run in range(5):
+        try:
+            program.execute()
+        except Exception as e:
+            failures.append("run {}: {}: {}".format(run + 1, type(e).__name__, e))
+
+    return failures
+
+
+def check_memoized_globals_across_runs():
+    """Memoized results are dropped once a later run assigns or redeclares a global the
+    function reads, like in the REPL."""
+    runs = [
+        "var x = 1; fun f(n) { return n + x; } print f(1);",
+        "x = 100; print f(1);",
+        "var x = 2; print f(1);",
+        "print f(1); x = 7; print f(1);",
+    ]
+    expected = "2.0\n101.0\n3.0\n3.0\n8.0\n"
+    sink = io.StringIO()
+    plox = Plox(memoizer=Memoizer(64), output=Output(sink))
+    for src in runs:
+        plox.run(src)
+
+    actual = sink.getvalue()
+    if actual != expected:
+        return ["expected {!r}, got {!r}".format(expected, actual)]
+
+    return []
+
+
+def check_int_globals_print_as_floats():
+    """Whole numbers passed in as globals print like the ones plox computes, on every engine."""
+    failures = []
+    for engine in Plox.ENGINES:
+        sink = io.StringIO()
+        plox = Plox(engine=engine, output=Output(sink))
+        plox.compile("print n; print -n;").execute({"n": 3})
+        if sink.getvalue() != "3.0\n-3.0\n":
+            failures.append("{} engine: got {!r}".format(engine, sink.getvalue()))
+
+    return failures
+
+
+# name -> function checking what CASES can't express. returns a description of each failure.
+CHECKS = {
+    "unbounded_recursion": check_unbounded_recursion,
+    "budgeted_program_reruns": check_budgeted_program_reruns,
+    "memoized_globals_across_runs": check_memoized_globals_across_runs,
+    "int_globals_print_as_floats": check_int_globals_print_as_floats,
+}
+
+
+def run_checked_case(name):
+    """Returns a description of each engine and optimization level the case fails on."""
+    src, expected = CASES[name]
+    failures = []
+    for engine in Plox.ENGINES:
+        for opt_level in Plox.OPT_LEVELS:
+            actual = run_case(src, engine, opt_level)
+            if actual != expected:
+                failures.append(
+                    "{} engine, opt level {}: expected {!r}, got {!r}".format(
+                        engine, opt_level, expected, actual
+                    )
+                )
+
+    return failures
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("cases", nargs="*", default=list(CASES) + list(CHECKS))
+    args = arg_parser.parse_args()
+
+    failed = 0
+    for name in args.cases:
+        failures = CHECKS[name]() if name in CHECKS else run_checked_case(name)
+        for failure in failures:
+            print("FAIL {} ({})".format(name, failure))
+
+        failed += bool(failures)
+
+    print("{} cases, {} failed".format(len(args.cases), failed))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
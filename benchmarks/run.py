@@ -0,0 +1,196 @@
+"""
+Benchmark suite runner: times the scan, parse, resolve and interpret phases of every program
+in benchmarks/programs separately, through Scanner, Parser, Resolver and Interpreter.
+Reports the median and the 10th/90th percentiles of every phase, optionally writes them to
+a JSON file and compares them against a previously written one to flag regressions.
+
+usage: python benchmarks/run.py [--repeat N] [--json results.json]
+                                [--baseline baseline.json] [--threshold 0.1] [program ...]
+exits with status 1 if any phase regressed.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _interpreter import Interpreter
+from _parser import Parser
+from _resolver import Resolver
+from _scanner import Scanner
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs")
+PHASES = ["scan", "parse", "resolve", "interpret"]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def time_phases(src):
+    """Runs src once. Returns the seconds each phase took."""
+    timings = {}
+
+    start = time.perf_counter()
+    tokens = Scanner(src).scan()
+    timings["scan"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stmts = Parser(tokens).parse()
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Resolver().resolve(stmts)
+    timings["resolve"] = time.perf_counter() - start
+
+    # programs print their results. only the time it takes matters here.
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        Interpreter().interpret(stmts)
+        timings["interpret"] = time.perf_counter() - start
+
+    return timings
+
+
+def run_program(src_fp, repeat):
+    """Returns the summary of every phase of a program, over repeat runs. Times are in ms."""
+    with open(src_fp) as f:
+        src = f.read()
+
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        for phase, seconds in time_phases(src).items():
+            samples[phase].append(seconds * 1e3)
+
+    return {
+        phase: {
+            "median": statistics.median(phase_samples),
+            "p10": percentile(phase_samples, 10),
+            "p90": percentile(phase_samples, 90),
+            "samples": phase_samples,
+        }
+        for phase, phase_samples in samples.items()
+    }
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Prints the change of every median against the baseline. Returns the regressions."""
+    regressions = []
+    print()
+    print(
+        "{:<16} {:<10} {:>12} {:>12} {:>8}".format(
+            "program", "phase", "baseline ms", "current ms", "change"
+        )
+    )
+    for name, phases in results.items():
+        baseline_phases = baseline.get(name)
+        if baseline_phases is None:
+            continue
+
+        for phase, summary in phases.items():
+            before = baseline_phases[phase]["median"]
+            after = summary["median"]
+            change = (after - before) / before if before else 0.0
+            is_regression = change > threshold and after - before > min_delta
+            if is_regression:
+                regressions.append((name, phase))
+
+            print(
+                "{:<16} {:<10} {:>12.2f} {:>12.2f} {:>+7.1%}{}".format(
+                    name,
+                    phase,
+                    before,
+                    after,
+                    change,
+                    "  REGRESSION" if is_regression else "",
+                )
+            )
+
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "programs",
+        nargs="*",
+        help="names of the programs to run (default: all of benchmarks/programs).",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    arg_parser.add_argument("--json", help="path to write the results to.")
+    arg_parser.add_argument(
+        "--baseline", help="path of results written by an earlier --json run."
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown of a median that counts as a regression.",
+    )
+    arg_parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.5,
+        help="slowdowns smaller than this many ms are never regressions.",
+    )
+    args = arg_parser.parse_args()
+
+    src_fps = sorted(glob.glob(os.path.join(PROGRAMS_DIR, "*.plox")))
+    if args.programs:
+        src_fps = [
+            src_fp
+            for src_fp in src_fps
+            if os.path.splitext(os.path.basename(src_fp))[0] in args.programs
+        ]
+
+    results = {}
+    print(
+        "{:<16} {:<10} {:>10} {:>10} {:>10}".format(
+            "program", "phase", "median ms", "p10 ms", "p90 ms"
+        )
+    )
+    for src_fp in src_fps:
+        name = os.path.splitext(os.path.basename(src_fp))[0]
+        results[name] = run_program(src_fp, args.repeat)
+        for phase, summary in results[name].items():
+            print(
+                "{:<16} {:<10} {:>10.2f} {:>10.2f} {:>10.2f}".format(
+                    name, phase, summary["median"], summary["p10"], summary["p90"]
+                )
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print("\n{} regression(s).".format(len(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
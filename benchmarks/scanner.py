@@ -0,0 +1,66 @@
+"""
+Benchmark: tokens per second of Scanner and FastScanner on synthetic plox source.
+The source repeats a snippet covering every kind of lexeme until it reaches --size KB.
+
+usage: python benchmarks/scanner.py [--size KB] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _fast_scanner import FastScanner
+from _scanner import Scanner
+
+SNIPPET = """
+` computes a running total. comments are scanned too.
+fun accumulate(total, step) {
+    var next_total = total + step * 2 - (step / 4) % 3;
+    if (next_total >= 1000.5 and step != 0 or !false) {
+        print "total: " + next_total;
+    }
+    return next_total > 10 ? next_total ^ 2 : 'small';
+}
+for (var i = 0; i <= 100; i = i + 1) { accumulate(i, 7 | 1 & 3); }
+"""
+
+
+def synthetic_source(size_kb):
+    """Returns plox source of (at least) size_kb kilobytes."""
+    copies = size_kb * 1024 // len(SNIPPET) + 1
+    return SNIPPET * copies
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--size", type=int, default=2048)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    src = synthetic_source(args.size)
+    print("source: {:.1f} MB".format(len(src) / 1024 / 1024))
+    print(
+        "{:<12} {:>10} {:>10} {:>14}".format(
+            "scanner", "tokens", "s (best)", "tokens/s"
+        )
+    )
+    for scanner in [Scanner, FastScanner]:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            num_tokens = len(scanner(src).scan())
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print(
+            "{:<12} {:>10} {:>10.3f} {:>14,.0f}".format(
+                scanner.__name__, num_tokens, best, num_tokens / best
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: building a long string with + in a loop, with and without Ropes.
+Without Ropes every concatenation copies the whole string built so far, so the
+loop is quadratic in the string's length.
+
+usage: python benchmarks/strings.py [--size-kb N] [--engine tree|vm|python]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import _rope
+from plox import Plox
+
+PIECE = "0123456789abcdef"
+
+PROGRAM = """
+var s = "start";
+for (var i = 0; i < {}; i = i + 1) {{
+    s = s + "{}";
+}}
+s > "a";
+"""
+
+
+def time_run(engine, src):
+    start = time.perf_counter()
+    Plox(engine=engine).run(src)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--size-kb", type=int, default=1024)
+    arg_parser.add_argument("--engine", choices=Plox.ENGINES, default="tree")
+    args = arg_parser.parse_args()
+
+    iterations = args.size_kb * 1024 // len(PIECE)
+    src = PROGRAM.format(iterations, PIECE)
+
+    rope_seconds = time_run(args.engine, src)
+    # no result is ever long enough to become a Rope.
+    min_length, _rope.MIN_LENGTH = _rope.MIN_LENGTH, float("inf")
+    str_seconds = time_run(args.engine, src)
+    _rope.MIN_LENGTH = min_length
+
+    print("{} KB string, {} concatenations".format(args.size_kb, iterations))
+    print("{:<8} {:>10.3f}s".format("str", str_seconds))
+    print("{:<8} {:>10.3f}s".format("rope", rope_seconds))
+
+
+if __name__ == "__main__":
+    main()
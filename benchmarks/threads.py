@@ -0,0 +1,97 @@
+"""
+Stress test: runs many plox interpreters at once on a thread pool and checks that every one
+printed exactly what it prints when run alone. Each program declares the same global names
+with different values, so interpreters sharing any state would print each other's values.
+
+usage: python benchmarks/threads.py [--programs N] [--threads N] [--engine tree|vm|python]
+exits with status 1 if any program's output differs.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _memo import Memoizer
+from _output import Output
+from plox import Plox
+
+PROGRAM = """
+var id = {id};
+var total = 0;
+var unset;
+fun fib(n) {{
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}}
+fun counter() {{
+    var count = id;
+    fun increment() {{
+        count = count + 1;
+        return count;
+    }}
+    return increment;
+}}
+var next = counter();
+for (var i = 0; i < {loops}; i = i + 1) {{
+    total = total + next() + fib(id % 12);
+    if (i % 100 == 0) print total;
+}}
+print unset;
+print "program " + "{id}";
+print id;
+print total;
+"""
+
+
+def run(engine, src, memoize):
+    """Returns what src prints when run on a new Plox, followed by the error it raised if any."""
+    sink = io.StringIO()
+    memoizer = Memoizer(64) if memoize else None
+    plox = Plox(engine=engine, memoizer=memoizer, output=Output(sink))
+    try:
+        plox.run(src)
+    except Exception as e:
+        sink.write("{}: {}\n".format(type(e).__name__, e))
+
+    return sink.getvalue()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--programs", type=int, default=64)
+    arg_parser.add_argument("--threads", type=int, default=8)
+    arg_parser.add_argument("--loops", type=int, default=500)
+    arg_parser.add_argument("--engine", choices=Plox.ENGINES, default="tree")
+    args = arg_parser.parse_args()
+
+    memoize = args.engine == "tree"
+    srcs = [PROGRAM.format(id=i, loops=args.loops) for i in range(args.programs)]
+    expected = [run(args.engine, src, memoize) for src in srcs]
+
+    # switch threads as often as possible so interpreters interleave mid-statement.
+    sys.setswitchinterval(1e-6)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        actual = list(pool.map(lambda src: run(args.engine, src, memoize), srcs))
+    seconds = time.perf_counter() - start
+
+    mismatches = [i for i in range(args.programs) if actual[i] != expected[i]]
+    print(
+        "{} programs on {} threads, {} engine: {} mismatched in {:.3f}s".format(
+            args.programs, args.threads, args.engine, len(mismatches), seconds
+        )
+    )
+    for i in mismatches:
+        print("program {} printed:\n{}".format(i, actual[i]))
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
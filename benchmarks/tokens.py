@@ -0,0 +1,51 @@
+"""
+Benchmark: memory held by the tokens of a large program and the time it takes to parse them.
+Uses the synthetic source of benchmarks/scanner.py.
+
+usage: python benchmarks/tokens.py [--size KB] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _fast_scanner import FastScanner
+from _parser import Parser
+from scanner import synthetic_source
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--size", type=int, default=1024)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    src = synthetic_source(args.size)
+    print("source: {:.1f} MB".format(len(src) / 1024 / 1024))
+
+    tracemalloc.start()
+    tokens = FastScanner(src).scan()
+    tokens_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        "tokens: {} ({:.1f} MB, {:.0f} bytes/token)".format(
+            len(tokens), tokens_size / 1024 / 1024, tokens_size / len(tokens)
+        )
+    )
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        Parser(tokens).parse()
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print("parse: {:.3f}s (best), {:,.0f} tokens/s".format(best, len(tokens) / best))
+
+
+if __name__ == "__main__":
+    main()
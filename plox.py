@@ -1,30 +1,210 @@
+from _batch import BatchRunner
+from _budget import Budget
+from _budget import BudgetedInterpreter
+from _budget import run_cooperatively
+from _cache import ProgramCache
+from _compiler import Compiler
+from _fast_scanner import FastScanner
 from _interpreter import Interpreter
+from _memo import Memoizer
+from _observer import ObservedInterpreter
+from _optimizer import Optimizer
+from _output import DEFAULT_BUFFER_SIZE
+from _output import FLUSH_POLICIES
+from _output import Output
 from _parser import Parser
+from _profiler import Profiler
+from _profiler import ProfilingInterpreter
+from _profiler import Sampler
+from _profiler import SamplingInterpreter
+from _program import Program
+from _purity import PurityAnalyzer
+from _pyruntime import PyRuntime
+from _resolver import Resolver
 from _scanner import Scanner
+from _tokens._token_stream import TokenStream
+from _transpiler import Transpiler
+from _vm import VM
 import argparse
+import hashlib
+import os
 import sys
 
 
 class Plox:
     """Entry point for plox interpreter."""
 
-    def __init__(self):
-        # same interpreter for all ASTS in batch or interactive mode.
-        self.interpreter = Interpreter()
+    ENGINES = ["tree", "vm", "python"]
+
+    # python code objects compiled by the python engine, keyed by the hash of their plox source
+    # and the optimization level.
+    # shared by all instances so rerunning a script skips every step up to execution.
+    code_cache = {}
+
+    OPT_LEVELS = [0, 1, 2]
+
+    def __init__(
+        self,
+        engine="tree",
+        opt_level=0,
+        fast_scan=False,
+        profiler=None,
+        sampler=None,
+        observers=None,
+        memoizer=None,
+        output=None,
+        budget=None,
+    ):
+        # same interpreter (or vm, or python runtime) for all ASTS in batch or interactive mode.
+        self.engine = engine
+        self.opt_level = opt_level
+        # both scanners create the same tokens. FastScanner matches whole lexemes with a regex.
+        self.scanner = FastScanner if fast_scan else Scanner
+        # every engine prints through the same Output. by default it buffers lines for sys.stdout.
+        self.output = Output() if output is None else output
+        # profiling, sampling, observers, memoization and budgets are only supported by the
+        # tree engine, and each needs its own kind of Interpreter, so only one can be used.
+        options = {
+            "observers": observers,
+            "profiler": profiler,
+            "sampler": sampler,
+            "budget": budget,
+            "memoizer": memoizer,
+        }
+        given = [name for name, value in options.items() if value is not None]
+        if len(given) > 1:
+            raise ValueError(
+                "Only one of {} can be used at a time.".format(", ".join(given))
+            )
+
+        if given and engine != "tree":
+            raise ValueError(
+                "{} is only supported by the tree engine.".format(given[0])
+            )
+
+        # limits every run when set. see Budget.
+        self.budget = budget
+        if observers is not None:
+            self.interpreter = ObservedInterpreter(observers, self.output)
+        elif profiler is not None:
+            self.interpreter = ProfilingInterpreter(profiler, self.output)
+        elif sampler is not None:
+            self.interpreter = SamplingInterpreter(sampler, self.output)
+        elif budget is not None:
+            self.interpreter = BudgetedInterpreter(budget, self.output)
+        else:
+            self.interpreter = Interpreter(memoizer, self.output)
+        self.vm = VM(self.output)
+        self.py_runtime = PyRuntime(self.output)
 
     def run(self, src):
-        """Runs source code."""
-        tokens = Scanner(src).scan()
-        asts = Parser(tokens).parse()
-        self.interpreter.interpret(asts)
-
-    def run_file(self, src_fp):
-        """Runs code (top to bottom) in batch mode directly from a file."""
-        try:
-            with open(src_fp) as f:
-                self.run(f.read())
-        except Exception:
-            raise
+        """Runs source code. What it prints is flushed once it stops."""
+        if self.budget is not None:
+            self.budget.start()
+
+        with self.output:
+            if self.engine == "python":
+                self.py_runtime.run(self.transpile(src))
+                return
+
+            self.execute(self.analyze(src))
+
+    async def run_async(self, src):
+        """Runs source code without blocking the event loop for longer than a slice of the
+        budget: between slices, the loop runs its other tasks. Needs a budget.
+        Cancelling the awaiting task stops the program."""
+        if self.budget is None:
+            raise ValueError("run_async needs a Plox created with a Budget.")
+
+        await run_cooperatively(lambda: self.run(src), self.budget)
+
+    def compile(self, src):
+        """Does all the work of running src that doesn't depend on its globals once.
+        Returns a Program whose execute method runs it."""
+        if self.engine == "python":
+            return Program(self.engine, self.transpile(src), self.py_runtime)
+
+        asts = self.analyze(src)
+        if self.engine == "vm":
+            return Program(self.engine, Compiler().compile(asts), self.vm)
+
+        return Program(self.engine, asts, self.interpreter)
+
+    def run_stream(self, f):
+        """Runs source code from an open file, executing every top-level declaration as soon
+        as it's parsed. Only the tokens and ASTs of one declaration are held at a time.
+        """
+        scanner = self.scanner.from_file(f)
+        # flushed once at the end rather than after every declaration.
+        with self.output:
+            for ast in Parser(TokenStream(scanner.scan_iter())).parse_iter():
+                scanner.comments.clear()  # nothing reads them, and they'd grow with the file.
+                self.execute(self.prepare([ast]))
+
+    def analyze(self, src):
+        """Creates resolved (and optionally optimized) ASTs from source code."""
+        tokens = self.scanner(src).scan()
+        return self.prepare(Parser(tokens).parse())
+
+    def prepare(self, asts):
+        """Optimizes (if enabled) and resolves ASTs."""
+        if self.opt_level > 0:
+            asts = Optimizer(self.opt_level).optimize(asts)
+
+        Resolver().resolve(asts)
+        PurityAnalyzer().analyze(asts)
+        return asts
+
+    def execute(self, asts):
+        """Runs resolved ASTs on the engine."""
+        if self.engine == "vm":
+            self.vm.run(Compiler().compile(asts))
+        elif self.engine == "python":
+            py_src = Transpiler().transpile(asts)
+            self.py_runtime.run(compile(py_src, "<plox>", "exec"))
+        else:
+            self.interpreter.interpret(asts)
+
+    def transpile(self, src):
+        """Returns the python code object for source code. Compiled once per distinct source."""
+        key = (hashlib.sha256(src.encode()).hexdigest(), self.opt_level)
+        code = Plox.code_cache.get(key)
+        if code is None:
+            py_src = Transpiler().transpile(self.analyze(src))
+            code = compile(py_src, "<plox>", "exec")
+            Plox.code_cache[key] = code
+
+        return code
+
+    def run_file(self, src_fp, stream=False, use_cache=True):
+        """Runs code (top to bottom) in batch mode directly from a file.
+        Unless streaming, the resolved ASTs are cached on disk and reused while the file is unchanged.
+        """
+        if self.budget is not None:
+            self.budget.start()
+
+        with self.output:
+            try:
+                with open(src_fp) as f:
+                    if stream:
+                        self.run_stream(f)
+                        return
+
+                    src = f.read()
+
+                if not use_cache:
+                    self.run(src)
+                    return
+
+                cache = ProgramCache(src_fp, self.opt_level)
+                asts = cache.load(src)
+                if asts is None:
+                    asts = self.analyze(src)
+                    cache.store(src, asts)
+
+                self.execute(asts)
+            except Exception:
+                raise
 
     def start_repl(self):
         """Starts REPL to run code in interactive mode."""
@@ -51,11 +231,277 @@ if __name__ == "__main__":
     arg_parser.add_argument(
         "-s",
         type=str,
+        nargs="+",
         required=False,
-        help="path to file containing the source code you want to interpret.",
+        help="path to file containing the source code you want to interpret. "
+        "several files or directories of .plox files run as a batch.",
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="run the scripts as a batch on N worker processes, each script on a fresh "
+        "interpreter. default: one per cpu.",
+    )
+    arg_parser.add_argument(
+        "--engine",
+        choices=Plox.ENGINES,
+        default="tree",
+        help="tree walks the ASTs. vm compiles them to bytecode and runs it on a stack VM. "
+        "python transpiles them to python and runs the compiled code object.",
+    )
+
+    arg_parser.add_argument(
+        "--opt-level",
+        type=int,
+        choices=Plox.OPT_LEVELS,
+        default=0,
+        help="1 folds constants and drops dead code before execution. "
+        "2 also propagates literals held by locals that are never reassigned.",
+    )
+
+    arg_parser.add_argument(
+        "--fast-scan",
+        action="store_true",
+        help="tokenize with a compiled regex instead of character by character.",
+    )
+
+    arg_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="run every top-level declaration as soon as it's parsed, instead of parsing "
+        "the whole file first. with --fast-scan, the file is also read in chunks.",
+    )
+
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="don't read or write the compiled program cache (__ploxcache__).",
+    )
+
+    arg_parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="remove the cached versions of the file before running it.",
+    )
+
+    arg_parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="plox_profile.json",
+        default=None,
+        metavar="PATH",
+        help="time every plox function and count the statements run per line. "
+        "prints a summary to stderr and writes the data as JSON to PATH "
+        "(default: plox_profile.json). tree engine only.",
+    )
+
+    arg_parser.add_argument(
+        "--sample",
+        nargs="?",
+        const="plox_profile.folded",
+        default=None,
+        metavar="PATH",
+        help="sample the plox call stack from a background thread and write the samples "
+        "in collapsed stack format, for flamegraph tools, to PATH "
+        "(default: plox_profile.folded). tree engine only.",
+    )
+
+    arg_parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=100,
+        metavar="HZ",
+        help="samples taken per second with --sample. default: 100.",
+    )
+
+    arg_parser.add_argument(
+        "--memo-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help="cache the results of pure plox functions, keeping the N most recently used "
+        "per function. default: 0 (off). tree engine only.",
+    )
+
+    arg_parser.add_argument(
+        "--memo-stats",
+        action="store_true",
+        help="print the cache hits and misses of every memoized function to stderr.",
+    )
+
+    arg_parser.add_argument(
+        "--output",
+        type=str,
+        metavar="PATH",
+        help="write what the program prints to PATH instead of stdout.",
+    )
+
+    arg_parser.add_argument(
+        "--output-buffer",
+        type=int,
+        default=DEFAULT_BUFFER_SIZE,
+        metavar="N",
+        help="characters printed before they are written out. default: {}.".format(
+            DEFAULT_BUFFER_SIZE
+        ),
+    )
+
+    arg_parser.add_argument(
+        "--flush",
+        choices=FLUSH_POLICIES,
+        default="auto",
+        help="when printed lines are written out: after every line, once the buffer is "
+        "full, or auto: after every line to a terminal, else once the buffer is full. "
+        "default: auto.",
+    )
+
+    arg_parser.add_argument(
+        "--max-steps",
+        type=int,
+        metavar="N",
+        help="stop the program after N loop iterations and function calls. tree engine only.",
+    )
+
+    arg_parser.add_argument(
+        "--time-limit",
+        type=float,
+        metavar="SECONDS",
+        help="stop the program after it ran for SECONDS. tree engine only.",
     )
 
     namespace_dict = vars(arg_parser.parse_args())
-    src_file_path = namespace_dict.get("s")
-    plox = Plox()
-    plox.start_repl() if src_file_path is None else plox.run_file(src_file_path)
+    src_file_paths = namespace_dict.get("s")
+    profile_path = namespace_dict.get("profile")
+    sample_path = namespace_dict.get("sample")
+    if profile_path is not None and sample_path is not None:
+        arg_parser.error("--profile and --sample can't be used together.")
+
+    is_profiled = profile_path is not None or sample_path is not None
+    if is_profiled and namespace_dict.get("engine") != "tree":
+        arg_parser.error(
+            "--profile and --sample are only supported by the tree engine."
+        )
+
+    if namespace_dict.get("sample_rate") <= 0:
+        arg_parser.error("--sample-rate must be positive.")
+
+    memo_size = namespace_dict.get("memo_size")
+    if memo_size < 0:
+        arg_parser.error("--memo-size can't be negative.")
+
+    if memo_size > 0 and (is_profiled or namespace_dict.get("engine") != "tree"):
+        arg_parser.error(
+            "--memo-size is only supported by the tree engine, without --profile or --sample."
+        )
+
+    max_steps = namespace_dict.get("max_steps")
+    time_limit = namespace_dict.get("time_limit")
+    is_budgeted = max_steps is not None or time_limit is not None
+    if (max_steps is not None and max_steps < 0) or (
+        time_limit is not None and time_limit <= 0
+    ):
+        arg_parser.error(
+            "--max-steps can't be negative and --time-limit must be positive."
+        )
+
+    if is_budgeted and (
+        is_profiled or memo_size > 0 or namespace_dict.get("engine") != "tree"
+    ):
+        arg_parser.error(
+            "--max-steps and --time-limit are only supported by the tree engine, "
+            "without --profile, --sample or --memo-size."
+        )
+
+    if namespace_dict.get("memo_stats") and memo_size == 0:
+        arg_parser.error("--memo-stats needs --memo-size.")
+
+    jobs = namespace_dict.get("jobs")
+    if jobs is not None and jobs <= 0:
+        arg_parser.error("--jobs must be positive.")
+
+    is_batch = src_file_paths is not None and (
+        jobs is not None
+        or len(src_file_paths) > 1
+        or any(os.path.isdir(path) for path in src_file_paths)
+    )
+    if is_batch and (is_profiled or namespace_dict.get("memo_stats")):
+        arg_parser.error(
+            "--profile, --sample and --memo-stats can't be used with a batch of scripts."
+        )
+
+    if namespace_dict.get("output_buffer") < 0:
+        arg_parser.error("--output-buffer can't be negative.")
+
+    output_path = namespace_dict.get("output")
+    output_file = None if output_path is None else open(output_path, "w")
+    output = Output(
+        output_file,
+        buffer_size=namespace_dict.get("output_buffer"),
+        flush=namespace_dict.get("flush"),
+    )
+    profiler = None if profile_path is None else Profiler()
+    sampler = (
+        None if sample_path is None else Sampler(namespace_dict.get("sample_rate"))
+    )
+    memoizer = Memoizer(memo_size) if memo_size > 0 else None
+    plox = Plox(
+        engine=namespace_dict.get("engine"),
+        opt_level=namespace_dict.get("opt_level"),
+        fast_scan=namespace_dict.get("fast_scan"),
+        profiler=profiler,
+        sampler=sampler,
+        memoizer=memoizer,
+        output=output,
+        budget=(
+            Budget(max_steps=max_steps, time_limit=time_limit) if is_budgeted else None
+        ),
+    )
+    if sampler is not None:
+        sampler.start()
+
+    try:
+        if src_file_paths is None:
+            plox.start_repl()
+        elif is_batch:
+            runner = BatchRunner(
+                jobs,
+                engine=namespace_dict.get("engine"),
+                opt_level=namespace_dict.get("opt_level"),
+                fast_scan=namespace_dict.get("fast_scan"),
+                stream=namespace_dict.get("stream"),
+                use_cache=not namespace_dict.get("no_cache"),
+                clear_cache=namespace_dict.get("clear_cache"),
+                memo_size=memo_size,
+                max_steps=max_steps,
+                time_limit=time_limit,
+            )
+            results = runner.run(src_file_paths, output.target(), sys.stderr)
+            if any(result.status != 0 for result in results):
+                sys.exit(1)
+        else:
+            src_file_path = src_file_paths[0]
+            if namespace_dict.get("clear_cache"):
+                ProgramCache(src_file_path).clear()
+
+            plox.run_file(
+                src_file_path,
+                stream=namespace_dict.get("stream"),
+                use_cache=not namespace_dict.get("no_cache"),
+            )
+    finally:
+        output.flush()
+        if output_file is not None:
+            output_file.close()
+
+        if profiler is not None:
+            profiler.report(sys.stderr)
+            profiler.dump(profile_path)
+
+        if sampler is not None:
+            sampler.stop()
+            sampler.dump(sample_path)
+            sampler.report(sys.stderr, sample_path)
+
+        if namespace_dict.get("memo_stats"):
+            memoizer.report(sys.stderr)